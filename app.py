@@ -1,8 +1,18 @@
+import threading
 from typing import Any
 
 import streamlit as st
 
+from fin_streamlit import metrics
+from fin_streamlit.lazy import lazy_import
+from fin_streamlit.mvc import views
 from fin_streamlit.mvc.controller import DashboardController
+from fin_streamlit.settings import Settings
+
+# imports every model, so only once prefetching is used
+prefetch = lazy_import("fin_streamlit.mvc.prefetch")
+alpha_vantage = lazy_import("fin_streamlit.clients.alpha_vantage")
+movers = lazy_import("fin_streamlit.movers")
 
 _PAGES_VIEWS_MAP = {
     "Home": DashboardController.load_home_page,
@@ -12,6 +22,10 @@ _PAGES_VIEWS_MAP = {
     "Cash Flow": DashboardController.load_cashflow,
     "Stock Quotes": DashboardController.load_quotes,
     "KPI": DashboardController.load_kpis,
+    "Earnings": DashboardController.load_earnings,
+    "Screener": DashboardController.load_screener,
+    "News": DashboardController.load_news,
+    "Market Movers": DashboardController.load_market_movers,
 }
 
 
@@ -29,9 +43,35 @@ def dispatch_view(page: str, controller: DashboardController, **kwargs: Any) ->
     return getattr(controller, _PAGES_VIEWS_MAP[page].__name__)(**kwargs)
 
 
+def _start_movers_feed() -> None:
+    movers.get_movers_feed().start(alpha_vantage.get_client())
+
+
+@st.cache_resource
+def preload_movers() -> threading.Thread:
+    """Starts fetching the first market movers snapshot, once per process.
+
+    The feed is started from its own thread, so importing the client and
+    pandas doesn't delay the first page.
+
+    Returns:
+        The thread starting the feed.
+    """
+    thread = threading.Thread(
+        target=_start_movers_feed, name="movers-preload", daemon=True
+    )
+    thread.start()
+    return thread
+
+
 def app():
     """The main function of the Streamlit app."""
 
+    if Settings.METRICS_PORT:
+        metrics.start_metrics_server(Settings.METRICS_PORT)
+    if Settings.MOVERS_PRELOAD:
+        preload_movers()
+
     st.title("Stock Analyzer")
     st.empty()
     symbol = st.sidebar.text_input("Enter company ticker (default: AMZN)", value="AMZN")
@@ -40,7 +80,17 @@ def app():
     if symbol:
         st.sidebar.text(f"{symbol.upper()} provided\nYou can switch between pages!")
         controller = DashboardController(symbol)
+        if Settings.PREFETCH_ENABLED:
+            prefetch.get_prefetcher().submit(controller.client, symbol)
         dispatch_view(stock_element, controller)
+        if Settings.SHOW_DIAGNOSTICS:
+            page = _PAGES_VIEWS_MAP[stock_element].__name__
+            views.diagnostics_view(
+                stock_element,
+                metrics.last_phases(page),
+                metrics.endpoint_summary(),
+                metrics.recent_requests(),
+            )
 
     if stock_element != "Home" and not symbol:
         st.write("You didn't enter correct symbol in the search box on left")
@@ -0,0 +1,52 @@
+"""Realistically sized payloads built out of the recorded fixtures of tests/data."""
+import copy
+import json
+import os
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "data")
+FULL_HISTORY_DAYS = 252 * 22
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str) -> dict:
+    """Loads one of the recorded responses of tests/data, e.g. `balance_sheet`."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json")) as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def full_daily_history(days: int = FULL_HISTORY_DAYS, seed: int = 7) -> dict:
+    """Builds a TIME_SERIES_DAILY payload covering `days` business days (22+ years by default).
+
+    Prices follow a random walk seeded for reproducibility, formatted like the API does.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2023-10-20", periods=days)[::-1]
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, days)))
+    spread = np.abs(rng.normal(0, 0.01, days)) * close
+    open_ = close + rng.normal(0, 0.005, days) * close
+    volume = rng.integers(1_000_000, 90_000_000, days)
+    series = {
+        date.strftime("%Y-%m-%d"): {
+            "1. open": f"{o:.4f}",
+            "2. high": f"{max(o, c) + s:.4f}",
+            "3. low": f"{min(o, c) - s:.4f}",
+            "4. close": f"{c:.4f}",
+            "5. volume": str(v),
+        }
+        for date, o, c, s, v in zip(dates, open_, close, spread, volume)
+    }
+    meta = copy.deepcopy(load_fixture("time_series_daily")["Meta Data"])
+    meta["4. Output Size"] = "Full size"
+    return {"Meta Data": meta, "Time Series (Daily)": series}
+
+
+def statement_payloads(name: str, symbols: int) -> List[dict]:
+    """Returns `symbols` copies of a statement fixture with distinct symbols."""
+    payload = load_fixture(name)
+    return [{**payload, "symbol": f"SYM{i}"} for i in range(symbols)]
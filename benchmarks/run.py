@@ -0,0 +1,253 @@
+"""Benchmarks of the model, parsing and chart hot paths of a Streamlit rerun.
+
+    python -m benchmarks.run                 # run all and compare with the previous run
+    python -m benchmarks.run -k statement    # run the benchmarks matching a pattern
+
+Every run is appended to benchmarks/results/history.jsonl; a benchmark slower
+than the previous run of the same machine by more than --tolerance fails the run.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import streamlit as st
+
+from benchmarks.fixtures import (
+    full_daily_history,
+    load_fixture,
+    statement_payloads,
+)
+from fin_streamlit.charts import get_barchart, get_candle_chart
+from fin_streamlit.earnings import earnings_reactions
+from fin_streamlit.figure_cache import FigureCache, frame_version
+from fin_streamlit.indicators import INDICATORS, compute_indicator
+from fin_streamlit.parsers import (
+    parse_time_series,
+    records_to_frame,
+    time_series_records,
+)
+from fin_streamlit.ratios import compute_ratios
+from fin_streamlit.statements import StatementSet
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+HISTORY_FILE = os.path.join(RESULTS_DIR, "history.jsonl")
+
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Registers a benchmark; the decorated function returns the callable to time."""
+
+    def register(setup: Callable[[], Callable[[], object]]):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@benchmark("statement.parse[balance_sheet]")
+def _statement_parse():
+    payload = load_fixture("balance_sheet")
+    return lambda: StatementSet.from_payload(payload)
+
+
+@benchmark("statement.parse[watchlist of 100 symbols]")
+def _statement_parse_watchlist():
+    payloads = statement_payloads("balance_sheet", 100)
+    return lambda: [StatementSet.from_payload(payload) for payload in payloads]
+
+
+@benchmark("statement.chart_frame[balance_sheet]")
+def _statement_chart_frame():
+    payload = load_fixture("balance_sheet")
+
+    def run():
+        return StatementSet.from_payload(payload).annual.chart_frame
+
+    return run
+
+
+@benchmark("quotes.parse[compact]")
+def _quotes_parse_compact():
+    payload = load_fixture("time_series_daily")
+    return lambda: parse_time_series(payload)
+
+
+@benchmark("quotes.parse[22y daily]")
+def _quotes_parse_full():
+    payload = full_daily_history()
+    return lambda: parse_time_series(payload)
+
+
+@benchmark("quotes.frame[22y daily from store]")
+def _quotes_frame_from_store():
+    records = time_series_records(full_daily_history()["Time Series (Daily)"])
+    return lambda: records_to_frame(records)
+
+
+@benchmark("charts.candle[22y daily, build+serialize]")
+def _candle_chart_full():
+    data = parse_time_series(full_daily_history())
+    return lambda: get_candle_chart(data).to_json()
+
+
+@benchmark("charts.candle[compact, build+serialize]")
+def _candle_chart_compact():
+    data = parse_time_series(load_fixture("time_series_daily"))
+    return lambda: get_candle_chart(data).to_json()
+
+
+@benchmark("charts.candle[22y daily, st.plotly_chart]")
+def _candle_chart_plotly_chart():
+    data = parse_time_series(full_daily_history())
+    return lambda: st.plotly_chart(get_candle_chart(data))
+
+
+@benchmark("charts.candle[22y daily, cached, st.plotly_chart]")
+def _candle_chart_cached():
+    data = parse_time_series(full_daily_history())
+    cache = FigureCache()
+
+    def cached() -> None:
+        key = ("BENCH", frame_version(data), "candle")
+        st.plotly_chart(cache.figure(key, lambda: get_candle_chart(data)))
+
+    cached()
+    return cached
+
+
+@benchmark("indicators.compute[22y daily, all]")
+def _indicators_full():
+    data = parse_time_series(full_daily_history())
+    return lambda: [compute_indicator(data, name) for name in INDICATORS]
+
+
+@benchmark("ratios.compute[3 statements, quarterly]")
+def _ratios():
+    statements = [
+        StatementSet.from_payload(load_fixture(name)).quarterly
+        for name in ("balance_sheet", "income_statement", "cash_flow")
+    ]
+    return lambda: compute_ratios(*statements)
+
+
+@benchmark("earnings.reactions[110 quarters, 22y daily]")
+def _earnings_reactions():
+    quarterly = StatementSet.from_payload(
+        load_fixture("earnings"), "annualEarnings", "quarterlyEarnings"
+    ).quarterly
+    data = parse_time_series(full_daily_history())
+    return lambda: earnings_reactions(quarterly, data)
+
+
+@benchmark("charts.bar[balance_sheet, build+serialize]")
+def _barchart():
+    data = StatementSet.from_payload(load_fixture("balance_sheet")).annual.chart_frame
+    return lambda: get_barchart(data, "totalAssets").to_json()
+
+
+def measure(fn: Callable[[], object], min_time: float, repeat: int) -> Dict[str, float]:
+    """Times fn, calling it enough times per round to run at least `min_time` seconds."""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    rounds = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - started) / number)
+    return {"min": min(rounds), "median": statistics.median(rounds), "number": number}
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous_run(machine: str) -> Dict[str, dict]:
+    if not os.path.exists(HISTORY_FILE):
+        return {}
+    previous = {}
+    with open(HISTORY_FILE) as f:
+        for line in f:
+            run = json.loads(line)
+            if run.get("machine") == machine:
+                previous = run["results"]
+    return previous
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+    # st.plotly_chart runs without a Streamlit server here, which it warns about
+    for logger in (
+        "streamlit",
+        "streamlit.runtime.scriptrunner_utils.script_run_context",
+    ):
+        logging.getLogger(logger).addFilter(lambda record: False)
+
+    machine = f"{platform.node()}-{platform.machine()}-py{platform.python_version()}"
+    previous = _previous_run(machine)
+    results, regressions = {}, []
+    for name, setup in BENCHMARKS.items():
+        if args.pattern not in name:
+            continue
+        result = measure(setup(), args.min_time, args.repeat)
+        results[name] = result
+        line = f"{name:<48} {result['min'] * 1e3:10.3f} ms"
+        baseline = previous.get(name)
+        if baseline:
+            change = result["min"] / baseline["min"] - 1
+            line += f"  {change:+.1%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(HISTORY_FILE, "a") as f:
+            run = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "revision": _git_revision(),
+                "machine": machine,
+                "results": results,
+            }
+            f.write(json.dumps(run) + "\n")
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
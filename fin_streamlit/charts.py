@@ -1,32 +1,172 @@
+from typing import Optional, Sequence
+
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from fin_streamlit.indicators import IndicatorResult
+
+MAX_CANDLES = 400
+
+# bar periods from the finest to the coarsest, with their chart labels
+RESOLUTIONS = {
+    "D": "daily",
+    "W": "weekly",
+    "M": "monthly",
+    "Q": "quarterly",
+    "Y": "yearly",
+}
+OHLC_AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+
+def choose_resolution(index: pd.DatetimeIndex, max_points: int = MAX_CANDLES) -> str:
+    """Picks the finest bar period that keeps the chart within max_points candles.
+
+    Args:
+        index: The dates of the daily bars.
+        max_points: The maximum number of candles to draw.
+
+    Returns:
+        One of the RESOLUTIONS keys, the coarsest one if none fits.
+    """
+    if len(index) <= max_points:
+        return "D"
+    for freq in list(RESOLUTIONS)[1:]:
+        if index.to_period(freq).nunique() <= max_points:
+            return freq
+    return list(RESOLUTIONS)[-1]
+
+
+def downsample_ohlc(data: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Aggregates daily OHLCV bars into bars of a longer period.
+
+    Each bar is labeled with the first trading day of its period, columns
+    without a known aggregation (e.g. `Adjusted Close`) keep their last value.
+
+    Args:
+        data: A Pandas DataFrame of daily OHLC columns indexed by an ascending date.
+        freq: The period of the bars, one of the RESOLUTIONS keys.
+
+    Returns:
+        A Pandas DataFrame of the aggregated bars, the data itself for "D".
+    """
+    if freq == "D" or data.empty:
+        return data
+    periods = data.index.to_period(freq)
+    bars = data.groupby(periods, sort=False).agg(
+        {column: OHLC_AGGREGATIONS.get(column, "last") for column in data.columns}
+    )
+    bars.index = _first_dates(data.index, periods)
+    return bars
+
+
+def _first_dates(index: pd.DatetimeIndex, periods: pd.PeriodIndex) -> pd.DatetimeIndex:
+    """Returns the first date of every period, in order of appearance."""
+    return pd.DatetimeIndex(
+        index.to_series().groupby(periods, sort=False).first(), name=index.name
+    )
+
+
+def _downsample_indicator(frame: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Samples indicator lines at the close of every bar of the given period."""
+    if freq == "D" or frame.empty:
+        return frame
+    periods = frame.index.to_period(freq)
+    sampled = frame.groupby(periods, sort=False).last()
+    sampled.index = _first_dates(frame.index, periods)
+    return sampled
+
+
+def _indicator_traces(frame: pd.DataFrame) -> list:
+    """Builds a line per indicator column, MACD histograms as bars."""
+    traces = []
+    for column in frame.columns:
+        if column.endswith("Histogram"):
+            traces.append(go.Bar(x=frame.index, y=frame[column], name=column))
+        else:
+            traces.append(
+                go.Scatter(
+                    x=frame.index,
+                    y=frame[column],
+                    name=column,
+                    mode="lines",
+                    line={"width": 1},
+                )
+            )
+    return traces
 
 
-def get_candle_chart(data: pd.DataFrame) -> go.Figure:
+def get_candle_chart(
+    data: pd.DataFrame,
+    max_points: Optional[int] = MAX_CANDLES,
+    indicators: Sequence[IndicatorResult] = (),
+) -> go.Figure:
     """
     Generates a candlestick chart from a Pandas DataFrame.
 
+    Long histories are aggregated into weekly, monthly, ... bars so the
+    figure never holds more than max_points candles, zooming into a shorter
+    window of the data brings back the daily bars.
+
     Args:
-        data: A Pandas DataFrame containing the data to be plotted.
+        data: A Pandas DataFrame of daily OHLC columns indexed by an ascending date.
+        max_points: The maximum number of candles to draw, None to draw every bar.
+        indicators: Indicators of the quotes, overlays are drawn over the
+            candles and the others in panels below them.
 
     Returns:
         A Plotly Figure object representing the candlestick chart.
     """
-    fig = go.Figure(
-        data=[
-            go.Candlestick(
-                x=data["Date"],
-                open=data["Open"],
-                high=data["High"],
-                low=data["Low"],
-                close=data["Close"],
-                increasing_line_color="green",
-                decreasing_line_color="red",
-            )
-        ]
+    freq = "D" if max_points is None else choose_resolution(data.index, max_points)
+    panels = [result for result in indicators if not result.overlay]
+    if panels:
+        fig = make_subplots(
+            rows=1 + len(panels),
+            cols=1,
+            shared_xaxes=True,
+            vertical_spacing=0.03,
+            row_heights=[3] + [1] * len(panels),
+        )
+    else:
+        fig = go.Figure()
+
+    def add_trace(trace, row: int) -> None:
+        if panels:
+            fig.add_trace(trace, row=row, col=1)
+        else:
+            fig.add_trace(trace)
+
+    bars = downsample_ohlc(data, freq)
+    add_trace(
+        go.Candlestick(
+            x=bars.index,
+            open=bars["Open"],
+            high=bars["High"],
+            low=bars["Low"],
+            close=bars["Close"],
+            increasing_line_color="green",
+            decreasing_line_color="red",
+            name="Quotes",
+        ),
+        row=1,
     )
-    fig.update_layout(title="Stock Quotes")
+    for result in indicators:
+        row = 1 if result.overlay else 2 + panels.index(result)
+        frame = _downsample_indicator(result.frame.reindex(data.index), freq)
+        for trace in _indicator_traces(frame):
+            add_trace(trace, row=row)
+
+    title = "Stock Quotes" if freq == "D" else f"Stock Quotes ({RESOLUTIONS[freq]})"
+    fig.update_layout(title=title, xaxis_rangeslider_visible=False)
+    if panels:
+        fig.update_layout(height=450 + 150 * len(panels))
     return fig
 
 
@@ -64,3 +204,48 @@ def get_barchart(data: pd.DataFrame, category: str) -> go.Figure:
         )
     )
     return fig
+
+
+def get_eps_chart(data: pd.DataFrame) -> go.Figure:
+    """Generates a chart of the reported and estimated EPS per fiscal quarter.
+
+    Args:
+        data: The quarterly earnings indexed by fiscal date.
+
+    Returns:
+        A Plotly Figure object with a line per EPS series.
+    """
+    fig = go.Figure()
+    for column, name in (("estimatedEPS", "Estimated"), ("reportedEPS", "Reported")):
+        if column in data:
+            fig.add_trace(
+                go.Scatter(
+                    x=data.index, y=data[column], mode="lines+markers", name=name
+                )
+            )
+    fig.update_layout(
+        title="EPS", legend=dict(orientation="h", y=1.02, yanchor="bottom")
+    )
+    return fig
+
+
+def get_reaction_chart(data: pd.DataFrame, reaction: str) -> go.Figure:
+    """Generates a scatter chart of the price reactions against the EPS surprises.
+
+    Args:
+        data: The quarterly earnings with the reaction columns.
+        reaction: The reaction column to plot, e.g. `Reaction 1D`.
+
+    Returns:
+        A Plotly Figure object with a point per report.
+    """
+    points = data.dropna(subset=["surprisePercentage", reaction])
+    fig = px.scatter(
+        x=points["surprisePercentage"],
+        y=points[reaction] * 100,
+        hover_name=points.index.strftime("%Y-%m-%d"),
+        labels={"x": "EPS surprise [%]", "y": f"{reaction} [%]"},
+    )
+    fig.add_hline(y=0, line_width=1, line_color="gray")
+    fig.add_vline(x=0, line_width=1, line_color="gray")
+    return fig
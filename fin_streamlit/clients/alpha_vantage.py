@@ -1,11 +1,60 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
 from enum import Enum
-from typing import Any, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 
 import requests
 from requests.exceptions import HTTPError
 
-from fin_streamlit.clients.utils import get_retry_session
-from fin_streamlit.exc import ApiKeyMissingException
+from fin_streamlit import metrics
+from fin_streamlit.clients.batch import BatchReport, FetchResult
+from fin_streamlit.clients.cache import (
+    CacheEntry,
+    Freshness,
+    InMemoryResponseCache,
+    ResponseCache,
+    get_default_cache,
+    make_cache_key,
+)
+from fin_streamlit.clients.rate_limit import (
+    Priority,
+    RequestScheduler,
+    Throttle,
+    detect_throttle,
+    get_default_scheduler,
+    request_priority,
+)
+from fin_streamlit.clients.replay import (
+    FixtureStore,
+    RecordingSession,
+    ReplaySession,
+)
+from fin_streamlit.clients.revalidation import StaleWhileRevalidate
+from fin_streamlit.clients.singleflight import (
+    SingleFlight,
+    get_default_single_flight,
+)
+from fin_streamlit.clients.utils import (
+    ERROR_PAYLOAD_KEYS,
+    get_retry_count,
+    get_retry_session,
+    is_valid_payload,
+    json_loads,
+)
+from fin_streamlit.exc import ApiKeyMissingException, RateLimitExceeded
 from fin_streamlit.log import get_logger
 from fin_streamlit.settings import Settings
 
@@ -26,6 +75,56 @@ class Endpoints(Enum):
     NEWS_SENTIMENT = "NEWS_SENTIMENT"
 
 
+ENDPOINT_CACHE_TTL = {
+    Endpoints.OVERVIEW: timedelta(days=1),
+    Endpoints.BALANCE_SHEET: timedelta(days=7),
+    Endpoints.INCOME_STATEMENT: timedelta(days=7),
+    Endpoints.CASH_FLOW: timedelta(days=7),
+    Endpoints.EARNINGS: timedelta(days=7),
+    Endpoints.SYMBOL_SEARCH: timedelta(days=30),
+    Endpoints.TIME_SERIES_DAILY: timedelta(minutes=15),
+    Endpoints.TIME_SERIES_WEEKLY: timedelta(hours=6),
+    Endpoints.TIME_SERIES_MONTHLY: timedelta(days=1),
+    Endpoints.TOP_GAINERS_LOSERS: timedelta(minutes=5),
+    Endpoints.NEWS_SENTIMENT: timedelta(minutes=15),
+}
+
+SYMBOL_ENDPOINTS = {
+    Endpoints.OVERVIEW,
+    Endpoints.BALANCE_SHEET,
+    Endpoints.INCOME_STATEMENT,
+    Endpoints.CASH_FLOW,
+    Endpoints.EARNINGS,
+    Endpoints.TIME_SERIES_DAILY,
+    Endpoints.TIME_SERIES_WEEKLY,
+    Endpoints.TIME_SERIES_MONTHLY,
+}
+
+TRANSPORT_LIVE = "live"
+TRANSPORT_RECORD = "record"
+TRANSPORT_REPLAY = "replay"
+
+_default_client: Optional["AlphaVantageClient"] = None
+_default_client_lock = threading.Lock()
+
+
+def _describe_error(payload: Any) -> str:
+    """Returns a short description of why the payload is not a valid response."""
+    if isinstance(payload, dict):
+        for key in ERROR_PAYLOAD_KEYS:
+            if key in payload:
+                return str(payload[key])
+    return "empty response"
+
+
+def _cache_ttl(endpoint: str) -> float:
+    """Returns the cache time to live of the endpoint in seconds, 0 for unknown endpoints."""
+    try:
+        return ENDPOINT_CACHE_TTL[Endpoints(endpoint)].total_seconds()
+    except (KeyError, ValueError):
+        return 0.0
+
+
 class AlphaVantageClient:
     """
     A class for interacting with the Alpha Vantage API.
@@ -38,13 +137,49 @@ class AlphaVantageClient:
         The API key for the Alpha Vantage API.
     _requests_session : requests.Session
         The requests session object.
+    max_throttle_retries : int
+        How many times a throttled request is re-scheduled before giving up.
+    _cache : ResponseCache, optional
+        The cache responses are served from before hitting the API.
+    _scheduler : RequestScheduler
+        The rate limiter every request to the API has to pass.
+    _single_flight : SingleFlight
+        Shares one in-flight request between concurrent identical ones.
+    serve_stale : bool
+        Whether expired cached responses are served while they are refreshed in the background.
+    _revalidation : StaleWhileRevalidate
+        The freshness of the served responses and the background refreshes of stale ones.
     """
 
-    def __init__(self) -> None:
-        """Initializes the Alpha Vantage client."""
-        self.base_url = "https://www.alphavantage.co/query?"
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        base_url: Optional[str] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ) -> None:
+        """Initializes the Alpha Vantage client.
+
+        Args:
+            cache: The response cache to use, defaults to the process-wide cache from Settings,
+                or to a private in-memory one if base_url is not the one from Settings.
+            scheduler: The rate limiter to use, defaults to the process-wide scheduler from Settings.
+            base_url: The API url, e.g. of a local stub server, defaults to the one from Settings.
+            single_flight: The de-duplicator of identical requests, defaults to the process-wide one.
+        """
+        self.base_url = base_url or Settings.ALPHA_VANTAGE_BASE_URL
+        self.max_throttle_retries = Settings.ALPHA_VANTAGE_MAX_THROTTLE_RETRIES
         self._resolve_api_key()
-        self._requests_session = get_retry_session()
+        self._requests_session = self._create_session()
+        self._cache = cache if cache is not None else self._default_cache()
+        self._scheduler = (
+            scheduler if scheduler is not None else get_default_scheduler()
+        )
+        self._single_flight = (
+            single_flight if single_flight is not None else get_default_single_flight()
+        )
+        self.serve_stale = Settings.RESPONSE_CACHE_SERVE_STALE
+        self._revalidation = StaleWhileRevalidate()
 
     def __repr__(self) -> str:
         """Returns a string representation of the Alpha Vantage client."""
@@ -70,6 +205,28 @@ class AlphaVantageClient:
             qp["symbol"] = symbol
         return qp
 
+    def _create_session(self) -> requests.Session:
+        """Creates the HTTP session used to talk to the API.
+
+        With ALPHA_VANTAGE_TRANSPORT set to `record` the valid responses are
+        saved as fixtures, with `replay` the fixtures are served instead of
+        calling the API at all.
+        """
+        session = get_retry_session(
+            pool_connections=Settings.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=Settings.HTTP_POOL_MAXSIZE,
+        )
+        transport = Settings.ALPHA_VANTAGE_TRANSPORT
+        if transport == TRANSPORT_LIVE:
+            return session
+        fixtures = FixtureStore(Settings.ALPHA_VANTAGE_FIXTURES_DIR)
+        logger.debug("using %s transport with %s", transport, fixtures)
+        if transport == TRANSPORT_RECORD:
+            return RecordingSession(session, fixtures)
+        if transport == TRANSPORT_REPLAY:
+            return ReplaySession(fixtures)
+        raise ValueError(f"unknown ALPHA_VANTAGE_TRANSPORT: {transport}")
+
     @property
     def _session(self) -> requests.Session:
         """Returns the request session object."""
@@ -85,6 +242,9 @@ class AlphaVantageClient:
             "Looking for ALPHA_VANTAGE_API_KEY key in environment variables..."
         )
         api_key = Settings.ALPHA_VANTAGE_API_KEY
+        if not api_key and Settings.ALPHA_VANTAGE_TRANSPORT == TRANSPORT_REPLAY:
+            logger.debug("replaying fixtures, no ALPHA_VANTAGE_API_KEY needed")
+            api_key = "replay"
         if api_key is not None and isinstance(api_key, str):
             logger.debug("ALPHA_VANTAGE_API_KEY found in environment variables")
             self.api_key = api_key
@@ -95,10 +255,240 @@ class AlphaVantageClient:
                 "and then pass it in .env file as ALPHA_VANTAGE_API_KEY variable"
             )
 
-    def _make_request(
+    def _default_cache(self) -> Optional[ResponseCache]:
+        """Returns the process-wide cache, or a private one for another API url.
+
+        The keys of the persistent cache don't include the url, so a client
+        talking to e.g. a stub server must not share it with the live clients.
+        """
+        if self.base_url == Settings.ALPHA_VANTAGE_BASE_URL:
+            return get_default_cache()
+        if not Settings.RESPONSE_CACHE_ENABLED:
+            return None
+        return InMemoryResponseCache(stale_ttl=Settings.RESPONSE_CACHE_STALE_SECONDS)
+
+    def _get_cached_entry(self, cache_key: str) -> Optional[CacheEntry]:
+        """Returns the fresh or stale cache entry for the given key, if there is one."""
+        if self._cache is None:
+            return None
+        return self._cache.get_entry(cache_key)
+
+    def _store_cached(self, cache_key: str, endpoint: str, data: Any) -> None:
+        """Stores a valid response in the cache with the TTL of its endpoint."""
+        if self._cache is not None and is_valid_payload(data):
+            self._cache.set(cache_key, data, _cache_ttl(endpoint))
+
+    def freshness(
+        self, endpoint: Endpoints, symbol: Optional[str] = None
+    ) -> Optional[Freshness]:
+        """Returns how fresh the last response served for the endpoint and symbol is.
+
+        Args:
+            endpoint: The Alpha Vantage API endpoint.
+            symbol: The symbol of the request (optional).
+
+        Returns:
+            The Freshness of the response or None if none was served yet.
+        """
+        return self._revalidation.freshness(endpoint.value, symbol)
+
+    def _revalidate(self, cache_key: str, endpoint: str, query_params: dict) -> None:
+        """Refreshes a stale cached response on a background thread.
+
+        The request is sent with background priority and at most one refresh
+        per cache key runs at a time, the fresh payload replaces the stale one
+        in the cache once it arrives.
+        """
+
+        def revalidate() -> None:
+            with request_priority(Priority.BACKGROUND):
+                with metrics.trace_request(endpoint) as trace:
+
+                    def fetch() -> dict:
+                        data = self._fetch(query_params)
+                        self._store_cached(cache_key, endpoint, data)
+                        trace.outcome = "revalidated"
+                        return data
+
+                    data = self._single_flight.do(f"{self.base_url}{cache_key}", fetch)
+            if is_valid_payload(data):
+                self._revalidation.set_freshness(query_params, Freshness(time.time()))
+            else:
+                logger.warning(
+                    "could not revalidate %s: %s", cache_key, _describe_error(data)
+                )
+
+        self._revalidation.submit(cache_key, revalidate)
+
+    def _check_throttle(self, data: Any, query_params: dict, attempt: int) -> bool:
+        """Checks whether the response is a throttle message and backs off if so.
+
+        Args:
+            data: The decoded API response.
+            query_params: The query parameters of the request.
+            attempt: The zero based attempt number of the request.
+
+        Returns:
+            True if the request has to be re-scheduled, False if data is a regular response.
+
+        Raises:
+            RateLimitExceeded: If the daily quota is exhausted or there are no attempts left.
+        """
+        throttle = detect_throttle(data)
+        if throttle is None:
+            return False
+        metrics.record_throttle(str(query_params.get("function")), throttle.value)
+        if throttle is Throttle.DAILY:
+            self._scheduler.exhaust_daily_budget()
+            raise RateLimitExceeded("Alpha Vantage daily quota exhausted")
+        if attempt >= self.max_throttle_retries:
+            raise RateLimitExceeded(
+                f"request throttled {self.max_throttle_retries + 1} times in a row"
+            )
+        logger.warning(
+            "%s throttled by Alpha Vantage (attempt %s), re-scheduling",
+            query_params.get("function"),
+            attempt + 1,
+        )
+        self._scheduler.penalize()
+        return True
+
+    def _fetch(self, query_params: dict) -> dict:
+        """Sends the request once the scheduler lets it through, re-scheduling throttled calls.
+
+        Args:
+            query_params: The query parameters to send.
+
+        Returns:
+            A dictionary containing the API response.
+
+        Raises:
+            RateLimitExceeded: If the quota is exhausted or the request keeps being throttled.
+        """
+        endpoint = str(query_params.get("function"))
+        attempt = 0
+        while True:
+            self._scheduler.acquire()
+            started = time.perf_counter()
+            response = self._session.get(self.base_url, params=query_params)
+            metrics.record_http_response(
+                endpoint,
+                status=response.status_code,
+                size=len(response.content),
+                retries=get_retry_count(response),
+                elapsed=time.perf_counter() - started,
+            )
+            data = json_loads(response.content)
+            if not self._check_throttle(data, query_params, attempt):
+                return data
+            attempt += 1
+
+    def _serve_cached(
+        self,
+        query_params: dict,
+        entry: Optional[CacheEntry],
+        trace: metrics.RequestTrace,
+    ) -> Optional[dict]:
+        """Returns the cached response to serve without calling the API, if there is one.
+
+        A stale response is only served with `serve_stale`, it is then
+        refreshed in the background.
+
+        Args:
+            query_params: The query parameters of the request.
+            entry: The fresh or stale cache entry of the request (optional).
+            trace: The trace of the request.
+
+        Returns:
+            The cached payload or None if the API has to be called.
+        """
+        if entry is None:
+            return None
+        cache_key = make_cache_key(query_params)
+        if entry.fresh:
+            logger.debug("serving %s from cache", cache_key)
+            trace.outcome = "cache_hit"
+            self._revalidation.set_freshness(query_params, Freshness(entry.stored_at))
+            return entry.value
+        if not self.serve_stale:
+            return None
+        logger.debug("serving stale %s, revalidating it", cache_key)
+        trace.outcome = "stale"
+        self._revalidation.set_freshness(
+            query_params, Freshness(entry.stored_at, True, True)
+        )
+        self._revalidate(cache_key, str(query_params.get("function")), query_params)
+        return entry.value
+
+    def _accept_fetched(
+        self,
+        query_params: dict,
+        entry: Optional[CacheEntry],
+        trace: metrics.RequestTrace,
+        data: Any,
+    ) -> Any:
+        """Caches a response fetched from the API, or falls back to the stale entry if it is an error.
+
+        Args:
+            query_params: The query parameters of the request.
+            entry: The stale cache entry of the request (optional).
+            trace: The trace of the request.
+            data: The decoded API response.
+
+        Returns:
+            The payload to serve.
+        """
+        if entry is not None and not is_valid_payload(data):
+            trace.outcome = "stale"
+            self._revalidation.set_freshness(
+                query_params, Freshness(entry.stored_at, True)
+            )
+            return entry.value
+        self._store_cached(
+            make_cache_key(query_params), str(query_params.get("function")), data
+        )
+        trace.outcome = "fetched"
+        self._revalidation.set_freshness(query_params, Freshness(time.time()))
+        return data
+
+    def _serve_fallback(
+        self,
+        query_params: dict,
+        entry: Optional[CacheEntry],
+        trace: metrics.RequestTrace,
+        error: Exception,
+    ) -> dict:
+        """Serves the stale entry of a request the API could not answer.
+
+        Args:
+            query_params: The query parameters of the request.
+            entry: The stale cache entry of the request (optional).
+            trace: The trace of the request.
+            error: The error raised while fetching the response.
+
+        Returns:
+            The stale payload.
+
+        Raises:
+            Exception: The error, if there is no stale entry to fall back to.
+        """
+        if entry is None:
+            raise error
+        logger.warning(
+            "serving stale %s after an error: %s", make_cache_key(query_params), error
+        )
+        trace.outcome = "stale"
+        self._revalidation.set_freshness(query_params, Freshness(entry.stored_at, True))
+        return entry.value
+
+    def _request(
         self, endpoint: str, symbol: Optional[str] = None, **params: Any
     ) -> dict:
-        """Makes a request to the Alpha Vantage API.
+        """Makes a request to the Alpha Vantage API, serving it from the cache when possible.
+
+        An expired cached response is returned right away and refreshed in the
+        background (see `serve_stale`), it is also returned when fetching a new
+        one fails.
 
         Args:
             endpoint: The Alpha Vantage API endpoint.
@@ -107,22 +497,174 @@ class AlphaVantageClient:
 
         Returns:
             A dictionary containing the API response.
-        """
 
+        Raises:
+            Exception: Any error raised while sending the request or decoding the response,
+                if there is no stale response to fall back to.
+        """
         query_params = self._prepare_query_params(
             endpoint=endpoint, symbol=symbol, **params
         )
+        cache_key = make_cache_key(query_params)
+        with metrics.trace_request(endpoint) as trace:
+            entry = self._get_cached_entry(cache_key)
+            cached = self._serve_cached(query_params, entry, trace)
+            if cached is not None:
+                return cached
+
+            def fetch() -> dict:
+                try:
+                    data = self._fetch(query_params)
+                except Exception as e:
+                    return self._serve_fallback(query_params, entry, trace, e)
+                return self._accept_fetched(query_params, entry, trace, data)
+
+            return self._single_flight.do(f"{self.base_url}{cache_key}", fetch)
+
+    def _make_request(
+        self, endpoint: str, symbol: Optional[str] = None, **params: Any
+    ) -> dict:
+        """Makes a request to the Alpha Vantage API.
+
+        Args:
+            endpoint: The Alpha Vantage API endpoint.
+            symbol: The symbol to query (optional).
+            **params: Additional parameters to pass to the API (optional).
+
+        Returns:
+            A dictionary containing the API response.
+        """
         try:
-            return self._session.get(
-                self.base_url,
-                params=query_params,
-            ).json()
+            return self._request(endpoint=endpoint, symbol=symbol, **params)
         except HTTPError as he:
             logger.error("Invalid HTTP response. Error: %s", str(he))
         except Exception as e:
             logger.error("Couldn't make request: Error: %s", str(e))
         return {}
 
+    @staticmethod
+    def _check_batch_endpoints(endpoints: Iterable[Endpoints]) -> List[Endpoints]:
+        """Makes sure all the endpoints of a batch take a symbol.
+
+        Raises:
+            ValueError: If one of the endpoints does not take a symbol.
+        """
+        endpoints = list(endpoints)
+        unsupported = [e.value for e in endpoints if e not in SYMBOL_ENDPOINTS]
+        if unsupported:
+            raise ValueError(
+                f"endpoints without a symbol can't be batched: {unsupported}"
+            )
+        return endpoints
+
+    @staticmethod
+    def _batch_result(
+        symbol: str,
+        endpoint: Endpoints,
+        started: float,
+        data: Any = None,
+        exc: Optional[Exception] = None,
+    ) -> FetchResult:
+        """Builds the FetchResult of a batch request out of its payload or exception."""
+        if exc is not None:
+            error = str(exc) or repr(exc)
+        else:
+            error = None if is_valid_payload(data) else _describe_error(data)
+        return FetchResult(
+            symbol,
+            endpoint,
+            data=data,
+            error=error,
+            elapsed=time.perf_counter() - started,
+        )
+
+    def iter_many(
+        self,
+        symbols: Iterable[str],
+        endpoints: Iterable[Endpoints],
+        max_workers: int = 4,
+        endpoint_params: Optional[Dict[Endpoints, dict]] = None,
+    ) -> Iterator[FetchResult]:
+        """Fetches the endpoints for every symbol concurrently, yielding results as they complete.
+
+        Requests run on a bounded thread pool and still go through the response
+        cache and the shared request scheduler, so the quota is respected.
+
+        Args:
+            symbols: The symbols to query.
+            endpoints: The per-symbol endpoints to query for every symbol.
+            max_workers: The maximum number of requests in flight at once.
+            endpoint_params: Additional API parameters per endpoint (optional).
+
+        Yields:
+            A FetchResult for every (symbol, endpoint) pair, in completion order.
+
+        Raises:
+            ValueError: If one of the endpoints does not take a symbol.
+        """
+        endpoints = self._check_batch_endpoints(endpoints)
+        endpoint_params = endpoint_params or {}
+
+        def fetch(symbol: str, endpoint: Endpoints) -> FetchResult:
+            started = time.perf_counter()
+            try:
+                data = self._request(
+                    endpoint=endpoint.value,
+                    symbol=symbol,
+                    **endpoint_params.get(endpoint, {}),
+                )
+            except Exception as e:
+                return self._batch_result(symbol, endpoint, started, exc=e)
+            return self._batch_result(symbol, endpoint, started, data=data)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                executor.submit(contextvars.copy_context().run, fetch, symbol, endpoint)
+                for symbol in dict.fromkeys(symbols)
+                for endpoint in endpoints
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_many(
+        self,
+        symbols: Iterable[str],
+        endpoints: Iterable[Endpoints],
+        max_workers: int = 4,
+        endpoint_params: Optional[Dict[Endpoints, dict]] = None,
+        *,
+        callback: Optional[Callable[[FetchResult], None]] = None,
+    ) -> BatchReport:
+        """Fetches the endpoints for every symbol concurrently and reports successes and failures.
+
+        Args:
+            symbols: The symbols to query.
+            endpoints: The per-symbol endpoints to query for every symbol.
+            max_workers: The maximum number of requests in flight at once.
+            endpoint_params: Additional API parameters per endpoint (optional).
+            callback: Called with every FetchResult as soon as it completes (optional).
+
+        Returns:
+            A BatchReport with a result for every (symbol, endpoint) pair.
+        """
+        report = BatchReport()
+        for result in self.iter_many(
+            symbols, endpoints, max_workers=max_workers, endpoint_params=endpoint_params
+        ):
+            report.add(result)
+            if callback is not None:
+                callback(result)
+        logger.debug("batch finished: %s", report.summary())
+        return report
+
+    @property
+    def cache_stats(self) -> Optional[dict]:
+        """Returns hit/miss/eviction counters of the response cache, if there is one."""
+        return self._cache.stats.as_dict() if self._cache is not None else None
+
     def get_company_overview(self, symbol: str, **kwargs: Any) -> dict:
         """Gets the company information, financial ratios, and other key metrics for the equity specified.
 
@@ -330,3 +872,22 @@ class AlphaVantageClient:
             limit=limit,
             **kwargs,
         )
+
+
+def get_client() -> AlphaVantageClient:
+    """Returns the process-wide Alpha Vantage client.
+
+    The client is thread-safe, so all Streamlit sessions and reruns share it
+    along with its pooled keep-alive connections.
+
+    Returns:
+        The shared AlphaVantageClient.
+
+    Raises:
+        ApiKeyMissingException: If the Alpha Vantage API key is not found in the environment variables.
+    """
+    global _default_client  # pylint: disable=global-statement
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = AlphaVantageClient()
+        return _default_client
@@ -0,0 +1,405 @@
+import asyncio
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+import aiohttp
+
+from fin_streamlit import metrics
+from fin_streamlit.clients.alpha_vantage import (
+    AlphaVantageClient,
+    Endpoints,
+    get_client,
+)
+from fin_streamlit.clients.batch import BatchReport, FetchResult
+from fin_streamlit.clients.cache import make_cache_key
+from fin_streamlit.clients.singleflight import AsyncSingleFlight
+from fin_streamlit.clients.utils import (
+    RETRY_STATUS_FORCELIST,
+    get_backoff_time,
+    json_loads,
+)
+from fin_streamlit.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncAlphaVantageClient:
+    """
+    An asyncio client for the Alpha Vantage API.
+
+    It exposes the same `get_*` methods as AlphaVantageClient, but each of them
+    returns an awaitable, so several endpoints can be fetched concurrently:
+
+        async with AsyncAlphaVantageClient() as client:
+            overview, balance_sheet, quotes = await asyncio.gather(
+                client.get_company_overview("IBM"),
+                client.get_balance_sheet("IBM"),
+                client.get_time_series_daily("IBM"),
+            )
+
+    Only the HTTP calls are made here, on one pooled keep-alive aiohttp
+    session, retried like `clients.utils.get_retry_session` does. The response
+    cache, rate limiter and stale-while-revalidate handling are those of the
+    wrapped AlphaVantageClient, stale responses are refreshed by it.
+
+    Attributes
+    ----------
+    client : AlphaVantageClient
+        The synchronous client whose cache, scheduler and freshness are shared.
+    max_concurrency : int
+        The maximum number of requests in flight at once.
+    retries : int
+        The number of retries to attempt before giving up.
+    backoff_factor : float
+        The factor by which to increase the wait time between retries.
+    pool_size : int
+        The maximum number of pooled connections.
+    keepalive_timeout : float
+        How long an idle pooled connection is kept open, in seconds.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AlphaVantageClient] = None,
+        *,
+        max_concurrency: int = 4,
+        retries: int = 6,
+        backoff_factor: float = 0.1,
+        pool_size: int = 10,
+        keepalive_timeout: float = 30.0,
+    ) -> None:
+        """Initializes the asynchronous Alpha Vantage client.
+
+        Args:
+            client: The client whose base url, cache and scheduler are used,
+                defaults to the process-wide one, see `get_client`.
+            max_concurrency: The maximum number of requests in flight at once.
+            retries: The number of retries to attempt before giving up.
+            backoff_factor: The factor by which to increase the wait time between retries.
+            pool_size: The maximum number of pooled connections.
+            keepalive_timeout: How long an idle pooled connection is kept open, in seconds.
+        """
+        self.client = client if client is not None else get_client()
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self._aiohttp_session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._single_flight = AsyncSingleFlight()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(max_concurrency={self.max_concurrency})"
+
+    async def __aenter__(self) -> "AsyncAlphaVantageClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def _session(self) -> aiohttp.ClientSession:
+        """Returns the pooled aiohttp session, creating it on first use.
+
+        The session has to be created within a running event loop, so it is created lazily.
+        """
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=self.keepalive_timeout
+            )
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._aiohttp_session
+
+    async def close(self) -> None:
+        """Closes the underlying HTTP session and its pooled connections."""
+        if self._aiohttp_session is not None and not self._aiohttp_session.closed:
+            await self._aiohttp_session.close()
+        self._aiohttp_session = None
+
+    async def _get_json(self, query_params: dict) -> dict:
+        """Sends a GET request, retrying on connection errors and 5xx responses.
+
+        Args:
+            query_params: The query parameters to send.
+
+        Returns:
+            A dictionary containing the API response.
+        """
+        errors = 0
+        while True:
+            try:
+                started = time.perf_counter()
+                async with self._session.get(
+                    self.client.base_url, params=query_params
+                ) as response:
+                    if response.status not in RETRY_STATUS_FORCELIST:
+                        content = await response.read()
+                        metrics.record_http_response(
+                            str(query_params.get("function")),
+                            status=response.status,
+                            size=len(content),
+                            retries=errors,
+                            elapsed=time.perf_counter() - started,
+                        )
+                        return json_loads(content)
+                    response.raise_for_status()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                errors += 1
+                if errors > self.retries:
+                    raise
+                logger.debug("retrying request (%s/%s): %s", errors, self.retries, e)
+                await asyncio.sleep(get_backoff_time(errors, self.backoff_factor))
+
+    async def _fetch(self, query_params: dict) -> dict:
+        """Sends the request once the scheduler lets it through, re-scheduling throttled calls.
+
+        Args:
+            query_params: The query parameters to send.
+
+        Returns:
+            A dictionary containing the API response.
+
+        Raises:
+            RateLimitExceeded: If the quota is exhausted or the request keeps being throttled.
+        """
+        _ = self._session  # the semaphore is created along with the session
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                await asyncio.to_thread(self.client._scheduler.acquire)
+                data = await self._get_json(query_params)
+                if not self.client._check_throttle(data, query_params, attempt):
+                    return data
+                attempt += 1
+
+    async def _request(
+        self, endpoint: str, symbol: Optional[str] = None, **params: Any
+    ) -> dict:
+        """Makes a request to the Alpha Vantage API, serving it from the cache when possible.
+
+        Cached and stale responses are served like `AlphaVantageClient._request` does.
+
+        Args:
+            endpoint: The Alpha Vantage API endpoint.
+            symbol: The symbol to query (optional).
+            **params: Additional parameters to pass to the API (optional).
+
+        Returns:
+            A dictionary containing the API response.
+
+        Raises:
+            Exception: Any error raised while sending the request or decoding the response,
+                if there is no stale response to fall back to.
+        """
+        client = self.client
+        query_params = client._prepare_query_params(
+            endpoint=endpoint, symbol=symbol, **params
+        )
+        cache_key = make_cache_key(query_params)
+        with metrics.trace_request(endpoint) as trace:
+            entry = client._get_cached_entry(cache_key)
+            cached = client._serve_cached(query_params, entry, trace)
+            if cached is not None:
+                return cached
+
+            async def fetch() -> dict:
+                try:
+                    data = await self._fetch(query_params)
+                except Exception as e:
+                    return client._serve_fallback(query_params, entry, trace, e)
+                return client._accept_fetched(query_params, entry, trace, data)
+
+            return await self._single_flight.do(f"{client.base_url}{cache_key}", fetch)
+
+    async def _make_request(
+        self, endpoint: str, symbol: Optional[str] = None, **params: Any
+    ) -> dict:
+        """Makes a request to the Alpha Vantage API.
+
+        Args:
+            endpoint: The Alpha Vantage API endpoint.
+            symbol: The symbol to query (optional).
+            **params: Additional parameters to pass to the API (optional).
+
+        Returns:
+            A dictionary containing the API response.
+        """
+        try:
+            return await self._request(endpoint=endpoint, symbol=symbol, **params)
+        except aiohttp.ClientResponseError as he:
+            logger.error("Invalid HTTP response. Error: %s", str(he))
+        except Exception as e:
+            logger.error("Couldn't make request: Error: %s", str(e))
+        return {}
+
+    async def iter_many(
+        self,
+        symbols: Iterable[str],
+        endpoints: Iterable[Endpoints],
+        endpoint_params: Optional[Dict[Endpoints, dict]] = None,
+    ) -> AsyncIterator[FetchResult]:
+        """Fetches the endpoints for every symbol concurrently, yielding results as they complete.
+
+        Args:
+            symbols: The symbols to query.
+            endpoints: The per-symbol endpoints to query for every symbol.
+            endpoint_params: Additional API parameters per endpoint (optional).
+
+        Yields:
+            A FetchResult for every (symbol, endpoint) pair, in completion order.
+
+        Raises:
+            ValueError: If one of the endpoints does not take a symbol.
+        """
+        endpoints = AlphaVantageClient._check_batch_endpoints(endpoints)
+        endpoint_params = endpoint_params or {}
+
+        async def fetch(symbol: str, endpoint: Endpoints) -> FetchResult:
+            started = time.perf_counter()
+            try:
+                data = await self._request(
+                    endpoint=endpoint.value,
+                    symbol=symbol,
+                    **endpoint_params.get(endpoint, {}),
+                )
+            except Exception as e:
+                return AlphaVantageClient._batch_result(
+                    symbol, endpoint, started, exc=e
+                )
+            return AlphaVantageClient._batch_result(
+                symbol, endpoint, started, data=data
+            )
+
+        tasks = [
+            asyncio.ensure_future(fetch(symbol, endpoint))
+            for symbol in dict.fromkeys(symbols)
+            for endpoint in endpoints
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_many(
+        self,
+        symbols: Iterable[str],
+        endpoints: Iterable[Endpoints],
+        endpoint_params: Optional[Dict[Endpoints, dict]] = None,
+        *,
+        callback: Optional[Callable[[FetchResult], None]] = None,
+    ) -> BatchReport:
+        """Fetches the endpoints for every symbol concurrently and reports successes and failures.
+
+        Args:
+            symbols: The symbols to query.
+            endpoints: The per-symbol endpoints to query for every symbol.
+            endpoint_params: Additional API parameters per endpoint (optional).
+            callback: Called with every FetchResult as soon as it completes (optional).
+
+        Returns:
+            A BatchReport with a result for every (symbol, endpoint) pair.
+        """
+        report = BatchReport()
+        async for result in self.iter_many(
+            symbols, endpoints, endpoint_params=endpoint_params
+        ):
+            report.add(result)
+            if callback is not None:
+                callback(result)
+        logger.debug("batch finished: %s", report.summary())
+        return report
+
+    async def get_company_overview(self, symbol: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_company_overview`."""
+        return await self._make_request(
+            endpoint=Endpoints.OVERVIEW.value, symbol=symbol, **kwargs
+        )
+
+    async def get_balance_sheet(self, symbol: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_balance_sheet`."""
+        return await self._make_request(
+            endpoint=Endpoints.BALANCE_SHEET.value, symbol=symbol, **kwargs
+        )
+
+    async def get_income_statement(self, symbol: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_income_statement`."""
+        return await self._make_request(
+            endpoint=Endpoints.INCOME_STATEMENT.value, symbol=symbol, **kwargs
+        )
+
+    async def get_cash_flow(self, symbol: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_cash_flow`."""
+        return await self._make_request(
+            endpoint=Endpoints.CASH_FLOW.value, symbol=symbol, **kwargs
+        )
+
+    async def get_search_results(self, keywords: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_search_results`."""
+        return await self._make_request(
+            endpoint=Endpoints.SYMBOL_SEARCH.value, keywords=keywords, **kwargs
+        )
+
+    async def get_time_series_daily(
+        self, symbol: str, return_full_history: bool = False, **kwargs: Any
+    ) -> dict:
+        """See `AlphaVantageClient.get_time_series_daily`."""
+        return await self._make_request(
+            endpoint=Endpoints.TIME_SERIES_DAILY.value,
+            outputsize="full" if return_full_history else "compact",
+            symbol=symbol,
+            **kwargs,
+        )
+
+    async def get_time_series_weekly(self, symbol: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_time_series_weekly`."""
+        return await self._make_request(
+            endpoint=Endpoints.TIME_SERIES_WEEKLY.value, symbol=symbol, **kwargs
+        )
+
+    async def get_time_series_monthly(self, symbol: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_time_series_monthly`."""
+        return await self._make_request(
+            endpoint=Endpoints.TIME_SERIES_MONTHLY.value, symbol=symbol, **kwargs
+        )
+
+    async def get_top_gainers_and_losers(self, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_top_gainers_and_losers`."""
+        return await self._make_request(
+            endpoint=Endpoints.TOP_GAINERS_LOSERS.value, **kwargs
+        )
+
+    async def get_earnings(self, symbol: str, **kwargs: Any) -> dict:
+        """See `AlphaVantageClient.get_earnings`."""
+        return await self._make_request(
+            endpoint=Endpoints.EARNINGS.value, symbol=symbol, **kwargs
+        )
+
+    async def get_market_news_sentiment(
+        self,
+        symbol: str,
+        topics: Optional[Union[List[str], str]] = None,
+        limit: int = 50,
+        **kwargs: Any,
+    ) -> dict:
+        """See `AlphaVantageClient.get_market_news_sentiment`."""
+        if topics is not None:
+            kwargs["topics"] = ",".join(topics) if isinstance(topics, list) else topics
+        return await self._make_request(
+            endpoint=Endpoints.NEWS_SENTIMENT.value,
+            tickers=symbol,
+            limit=limit,
+            **kwargs,
+        )
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from fin_streamlit.clients.alpha_vantage import Endpoints
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single (symbol, endpoint) request of a batch."""
+
+    symbol: str
+    endpoint: "Endpoints"
+    data: Optional[dict] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Returns True if the request returned a valid response."""
+        return self.error is None
+
+
+@dataclass
+class BatchReport:
+    """Per-symbol, per-endpoint results of a batch fetch."""
+
+    results: Dict[str, Dict["Endpoints", FetchResult]] = field(default_factory=dict)
+
+    def add(self, result: FetchResult) -> None:
+        """Adds a result to the report."""
+        self.results.setdefault(result.symbol, {})[result.endpoint] = result
+
+    def __iter__(self):
+        for by_endpoint in self.results.values():
+            yield from by_endpoint.values()
+
+    @property
+    def succeeded(self) -> List[FetchResult]:
+        """Returns the successful results."""
+        return [result for result in self if result.ok]
+
+    @property
+    def failed(self) -> List[FetchResult]:
+        """Returns the failed results."""
+        return [result for result in self if not result.ok]
+
+    def data(self, symbol: str, endpoint: "Endpoints") -> Optional[dict]:
+        """Returns the payload fetched for the symbol and endpoint, None if it failed or is missing."""
+        result = self.results.get(symbol, {}).get(endpoint)
+        return result.data if result is not None and result.ok else None
+
+    def summary(self) -> dict:
+        """Returns the number of total, succeeded and failed requests."""
+        failed = len(self.failed)
+        total = failed + len(self.succeeded)
+        return {"total": total, "succeeded": total - failed, "failed": failed}
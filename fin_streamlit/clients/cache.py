@@ -0,0 +1,311 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from fin_streamlit.log import get_logger
+from fin_streamlit.settings import Settings
+
+logger = get_logger(__name__)
+
+_EXCLUDED_KEY_PARAMS = {"apikey"}
+_UPPERCASE_KEY_PARAMS = {"symbol", "tickers"}
+
+_default_cache: Optional["ResponseCache"] = None
+_default_cache_lock = threading.Lock()
+
+
+def make_cache_key(query_params: dict) -> str:
+    """Builds a stable cache key out of the query parameters of a request.
+
+    The api key is dropped, values are stripped and symbols are upper-cased,
+    so the same request made with different keys or casing shares one entry.
+
+    Args:
+        query_params: The query parameters sent to the Alpha Vantage API.
+
+    Returns:
+        A normalized, url-encoded representation of the query parameters.
+    """
+    normalized = {}
+    for name, value in query_params.items():
+        if name in _EXCLUDED_KEY_PARAMS or value is None:
+            continue
+        value = str(value).strip()
+        normalized[name] = value.upper() if name in _UPPERCASE_KEY_PARAMS else value
+    return urlencode(sorted(normalized.items()))
+
+
+@dataclass
+class CacheEntry:
+    """A stored payload with the time it was stored and the time it expires."""
+
+    value: dict
+    stored_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        """Returns True if the entry has not expired yet."""
+        return self.expires_at > time.time()
+
+
+@dataclass
+class Freshness:
+    """How fresh the payload served for a request is, shown along with the data."""
+
+    fetched_at: float
+    stale: bool = False
+    revalidating: bool = False
+
+    @property
+    def age(self) -> float:
+        """Returns the age of the payload in seconds."""
+        return max(0.0, time.time() - self.fetched_at)
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the effectiveness of a response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    stale_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Returns the fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the counters as a dictionary."""
+        return {**asdict(self), "hit_ratio": self.hit_ratio}
+
+
+class ResponseCache(ABC):
+    """Base class for Alpha Vantage response caches.
+
+    Subclasses only have to implement storage primitives, expiry handling
+    and hit/miss/eviction accounting are done here.
+
+    Expired entries are kept for `stale_ttl` more seconds, so they can be
+    served while a fresh copy is fetched or when the API is unavailable.
+    """
+
+    def __init__(self, stale_ttl: float = 0.0) -> None:
+        self.stale_ttl = stale_ttl
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.stats.as_dict()})"
+
+    @abstractmethod
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Returns the stored entry or None."""
+
+    @abstractmethod
+    def _set_entry(self, key: str, value: dict, expires_at: float) -> None:
+        """Stores the payload under the given key."""
+
+    @abstractmethod
+    def _delete_entry(self, key: str) -> None:
+        """Removes the given key from the storage."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+
+    def _count(self, counter: str, value: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + value)
+
+    def _lookup(self, key: str) -> Optional[CacheEntry]:
+        """Returns the fresh or stale entry of the key, evicting it past the stale horizon."""
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+        if entry.expires_at + self.stale_ttl <= time.time():
+            self._delete_entry(key)
+            self._count("evictions")
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[dict]:
+        """Gets a fresh payload from the cache.
+
+        Args:
+            key: The cache key, see `make_cache_key`.
+
+        Returns:
+            The cached payload or None if it is missing or expired.
+        """
+        entry = self._lookup(key)
+        if entry is None or not entry.fresh:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry.value
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Gets a fresh or stale entry from the cache.
+
+        Args:
+            key: The cache key, see `make_cache_key`.
+
+        Returns:
+            The entry, possibly expired, or None if there is none within the stale horizon.
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            self._count("misses")
+        else:
+            self._count("hits" if entry.fresh else "stale_hits")
+        return entry
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        """Stores a payload in the cache.
+
+        Args:
+            key: The cache key, see `make_cache_key`.
+            value: The payload to store.
+            ttl: Time to live of the entry, in seconds.
+        """
+        if ttl <= 0:
+            return
+        self._set_entry(key, value, time.time() + ttl)
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Response cache kept in the memory of the current process."""
+
+    def __init__(self, stale_ttl: float = 0.0) -> None:
+        super().__init__(stale_ttl)
+        self._entries: Dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def _set_entry(self, key: str, value: dict, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.time(), expires_at)
+
+    def _delete_entry(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Response cache persisted in a SQLite database, so it survives restarts.
+
+    Attributes
+    ----------
+    path : str
+        The location of the SQLite database file.
+    max_entries : int, optional
+        The maximum number of stored responses, the oldest are evicted first.
+    """
+
+    def __init__(
+        self, path: str, max_entries: Optional[int] = None, stale_ttl: float = 0.0
+    ) -> None:
+        super().__init__(stale_ttl)
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+        self.purge_expired()
+
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload, stored_at, expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[0]), row[1], row[2])
+
+    def _set_entry(self, key: str, value: dict, expires_at: float) -> None:
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, payload, time.time(), expires_at),
+            )
+            evicted = self._evict_overflow()
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _evict_overflow(self) -> int:
+        if self.max_entries is None:
+            return 0
+        return self._connection.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+
+    def _delete_entry(self, key: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Removes all entries expired for longer than the stale horizon from the database.
+
+        Returns:
+            The number of evicted entries.
+        """
+        with self._lock, self._connection:
+            evicted = self._connection.execute(
+                "DELETE FROM responses WHERE expires_at <= ?",
+                (time.time() - self.stale_ttl,),
+            ).rowcount
+        if evicted:
+            logger.debug("evicted %s expired responses from %s", evicted, self.path)
+            self._count("evictions", evicted)
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """Returns the process-wide response cache configured in Settings.
+
+    Returns:
+        A SQLiteResponseCache shared by all clients, or None if caching is disabled.
+    """
+    global _default_cache  # pylint: disable=global-statement
+    if not Settings.RESPONSE_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SQLiteResponseCache(
+                Settings.RESPONSE_CACHE_PATH,
+                max_entries=Settings.RESPONSE_CACHE_MAX_ENTRIES,
+                stale_ttl=Settings.RESPONSE_CACHE_STALE_SECONDS,
+            )
+        return _default_cache
@@ -0,0 +1,244 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from enum import Enum, IntEnum
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from fin_streamlit.exc import RateLimitExceeded
+from fin_streamlit.log import get_logger
+from fin_streamlit.settings import Settings
+
+logger = get_logger(__name__)
+
+_default_scheduler: Optional["RequestScheduler"] = None
+_default_scheduler_lock = threading.Lock()
+
+
+class Priority(IntEnum):
+    """Priority of a request waiting for the quota, lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class Throttle(Enum):
+    """Kinds of throttle responses returned by Alpha Vantage."""
+
+    MINUTE = "minute"
+    DAILY = "daily"
+
+
+_request_priority: ContextVar[Priority] = ContextVar(
+    "request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Runs the requests made within the block with the given priority.
+
+    Args:
+        priority: The priority used to schedule the requests.
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def detect_throttle(payload: Any) -> Optional[Throttle]:
+    """Detects whether the Alpha Vantage payload is a throttle message.
+
+    Alpha Vantage answers over-quota calls with status 200 and a body holding
+    only a "Note" (per minute limit) or an "Information" (daily limit) message.
+
+    Args:
+        payload: The decoded API response.
+
+    Returns:
+        The kind of throttle or None if the payload is a regular response.
+    """
+    if not isinstance(payload, dict):
+        return None
+    message = str(payload.get("Note") or payload.get("Information") or "").lower()
+    if not message or not any(
+        phrase in message for phrase in ("call frequency", "rate limit", "requests")
+    ):
+        return None
+    if "Note" not in payload and "per day" in message:
+        return Throttle.DAILY
+    return Throttle.MINUTE
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `capacity` tokens per `period` seconds.
+
+    Attributes
+    ----------
+    capacity : float
+        The maximum number of tokens, i.e. the allowed burst.
+    period : float
+        The time in seconds needed to refill an empty bucket.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        period: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._tokens = min(
+            self.capacity, self._tokens + elapsed * self.capacity / self.period
+        )
+        self._updated = now
+
+    def delay(self) -> float:
+        """Returns the number of seconds until a token is available."""
+        self._refill()
+        missing = 1.0 - self._tokens
+        return max(0.0, missing * self.period / self.capacity)
+
+    def consume(self) -> None:
+        """Takes one token from the bucket."""
+        self._refill()
+        self._tokens -= 1.0
+
+    def drain(self) -> None:
+        """Empties the bucket, so the next token is available after one refill interval."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+
+class RequestScheduler:
+    """Queues requests so they respect the per-minute and per-day Alpha Vantage quota.
+
+    Waiting requests are served by priority and then in arrival order, so
+    interactive page loads overtake background prefetches.
+
+    Attributes
+    ----------
+    calls_per_minute : int
+        The number of calls allowed within a minute.
+    calls_per_day : int, optional
+        The number of calls allowed within a (UTC) day, unlimited if None.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: int,
+        calls_per_day: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_day = calls_per_day
+        self._bucket = TokenBucket(calls_per_minute, 60.0, clock=clock)
+        self._condition = threading.Condition()
+        self._waiting: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._day = self._today()
+        self._calls_today = 0
+        self._exhausted = False
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(calls_per_minute={self.calls_per_minute}, "
+            f"calls_per_day={self.calls_per_day})"
+        )
+
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(timezone.utc).date()
+
+    def _check_daily_budget(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day, self._calls_today, self._exhausted = today, 0, False
+        if self._exhausted or (
+            self.calls_per_day is not None and self._calls_today >= self.calls_per_day
+        ):
+            raise RateLimitExceeded(
+                f"daily budget of {self.calls_per_day} Alpha Vantage calls exhausted"
+            )
+
+    @property
+    def calls_today(self) -> int:
+        """Returns the number of calls let through today."""
+        return self._calls_today
+
+    @property
+    def queue_length(self) -> int:
+        """Returns the number of requests waiting for the quota."""
+        return len(self._waiting)
+
+    def acquire(self, priority: Optional[Priority] = None) -> None:
+        """Blocks until the caller may send a request.
+
+        Args:
+            priority: The priority of the request, defaults to the one set with `request_priority`.
+
+        Raises:
+            RateLimitExceeded: If the daily budget is exhausted.
+        """
+        priority = _request_priority.get() if priority is None else priority
+        ticket = (int(priority), next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    self._check_daily_budget()
+                    timeout = None
+                    if self._waiting[0] == ticket:
+                        timeout = self._bucket.delay()
+                        if timeout <= 0:
+                            self._bucket.consume()
+                            self._calls_today += 1
+                            return
+                    self._condition.wait(timeout)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def penalize(self) -> None:
+        """Backs off after a throttle response by emptying the per-minute bucket."""
+        with self._condition:
+            self._bucket.drain()
+
+    def exhaust_daily_budget(self) -> None:
+        """Marks the daily budget as used up, e.g. after a daily throttle response."""
+        with self._condition:
+            self._exhausted = True
+            self._condition.notify_all()
+
+
+def get_default_scheduler() -> RequestScheduler:
+    """Returns the process-wide request scheduler configured in Settings.
+
+    The quota belongs to the api key, so all clients of the process share it.
+
+    Returns:
+        The shared RequestScheduler.
+    """
+    global _default_scheduler  # pylint: disable=global-statement
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler(
+                calls_per_minute=Settings.ALPHA_VANTAGE_CALLS_PER_MINUTE,
+                calls_per_day=Settings.ALPHA_VANTAGE_CALLS_PER_DAY,
+            )
+            logger.debug("created %s", _default_scheduler)
+        return _default_scheduler
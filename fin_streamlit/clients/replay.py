@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Optional
+
+import requests
+
+from fin_streamlit.clients.utils import is_valid_payload, json_loads
+from fin_streamlit.log import get_logger
+
+logger = get_logger(__name__)
+
+# names of the fixtures that were recorded before per-symbol fixtures existed
+LEGACY_FIXTURE_NAMES = {
+    "OVERVIEW": "company_overview",
+    "SYMBOL_SEARCH": "search_results",
+    "TOP_GAINERS_LOSERS": "top_gainers_and_losers",
+    "NEWS_SENTIMENT": "market_news_sentiment",
+}
+_FIXTURE_KEY_PARAMS = ("symbol", "tickers", "keywords")
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value.strip()).upper() or "_"
+
+
+class FixtureStore:
+    """Alpha Vantage responses stored as JSON files, one per endpoint and symbol.
+
+    Responses live in `<root>/<function>/<SYMBOL>.json`, the flat files of
+    `tests/data` (e.g. `balance_sheet.json`) serve as a fallback for any symbol.
+
+    Attributes
+    ----------
+    root : str
+        The directory holding the fixtures.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.root!r})"
+
+    def path(self, query_params: dict) -> str:
+        """Returns the path of the per-symbol fixture of the request."""
+        function = str(query_params.get("function", "")).lower()
+        key = next(
+            (
+                str(query_params[name])
+                for name in _FIXTURE_KEY_PARAMS
+                if query_params.get(name)
+            ),
+            "",
+        )
+        return os.path.join(self.root, function, f"{_slug(key)}.json")
+
+    def _fallback_path(self, query_params: dict) -> str:
+        function = str(query_params.get("function", "")).upper()
+        name = LEGACY_FIXTURE_NAMES.get(function, function.lower())
+        return os.path.join(self.root, f"{name}.json")
+
+    def load(self, query_params: dict) -> Optional[bytes]:
+        """Loads the raw fixture of the request.
+
+        Args:
+            query_params: The query parameters of the request.
+
+        Returns:
+            The recorded response body or None if there is no fixture for it.
+        """
+        for path in (self.path(query_params), self._fallback_path(query_params)):
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    return f.read()
+        return None
+
+    def save(self, query_params: dict, content: bytes) -> str:
+        """Records the response body of the request.
+
+        Args:
+            query_params: The query parameters of the request.
+            content: The raw response body.
+
+        Returns:
+            The path of the written fixture.
+        """
+        path = self.path(query_params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+
+def missing_fixture_body(query_params: dict) -> bytes:
+    """Returns the body Alpha Vantage sends for invalid calls, used when there is no fixture."""
+    message = (
+        f"Invalid API call. No fixture recorded for {query_params.get('function')}"
+    )
+    return json.dumps({"Error Message": message}).encode()
+
+
+class FixtureResponse:
+    """The subset of requests.Response the client uses, backed by a fixture."""
+
+    def __init__(self, content: bytes, status_code: int = 200) -> None:
+        self.content = content
+        self.status_code = status_code
+
+    def json(self) -> Any:
+        return json_loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+class ReplaySession:
+    """Serves recorded fixtures instead of calling the API, for offline runs."""
+
+    def __init__(self, fixtures: FixtureStore) -> None:
+        self.fixtures = fixtures
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs: Any):
+        params = params or {}
+        content = self.fixtures.load(params)
+        if content is None:
+            logger.warning("no fixture for %s", self.fixtures.path(params))
+            content = missing_fixture_body(params)
+        return FixtureResponse(content)
+
+
+class RecordingSession:
+    """Sends requests with the wrapped session and records the valid responses as fixtures."""
+
+    def __init__(self, session: requests.Session, fixtures: FixtureStore) -> None:
+        self.session = session
+        self.fixtures = fixtures
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs: Any):
+        params = params or {}
+        response = self.session.get(url, params=params, **kwargs)
+        if response.status_code == 200 and _is_recordable(response.content):
+            with self._lock:
+                path = self.fixtures.save(params, response.content)
+            logger.debug("recorded %s", path)
+        return response
+
+
+def _is_recordable(content: bytes) -> bool:
+    """Checks whether the body is a regular response rather than an error or throttle message."""
+    try:
+        return is_valid_payload(json_loads(content))
+    except ValueError:
+        return False
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from fin_streamlit.clients.cache import Freshness
+from fin_streamlit.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class StaleWhileRevalidate:
+    """Bookkeeping of the stale-while-revalidate policy of a client.
+
+    It records how fresh the last response served per endpoint and symbol is
+    and refreshes stale responses on background threads, at most one refresh
+    per cache key at a time.
+
+    Attributes
+    ----------
+    max_workers : int
+        The maximum number of refreshes running at once.
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self.max_workers = max_workers
+        self._freshness: Dict[Tuple[str, Optional[str]], Freshness] = {}
+        self._running: Set[str] = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(running={len(self._running)})"
+
+    def set_freshness(self, query_params: dict, freshness: Freshness) -> None:
+        """Records the freshness of the response served for the request."""
+        key = str(query_params.get("function")), query_params.get("symbol")
+        self._freshness[key] = freshness
+
+    def freshness(
+        self, endpoint: str, symbol: Optional[str] = None
+    ) -> Optional[Freshness]:
+        """Returns the freshness of the last response served for the endpoint and symbol."""
+        return self._freshness.get((endpoint, symbol))
+
+    def submit(self, cache_key: str, refresh: Callable[[], None]) -> bool:
+        """Runs refresh on a background thread, unless the key is already being refreshed.
+
+        Args:
+            cache_key: The cache key of the stale response.
+            refresh: Fetches the response and stores it in the cache.
+
+        Returns:
+            True if the refresh was scheduled, False if one is already running.
+        """
+        with self._lock:
+            if cache_key in self._running:
+                return False
+            self._running.add(cache_key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="revalidate"
+                )
+
+        def run() -> None:
+            try:
+                refresh()
+            except Exception as e:
+                logger.warning("could not revalidate %s: %s", cache_key, e)
+            finally:
+                with self._lock:
+                    self._running.discard(cache_key)
+
+        self._executor.submit(run)
+        return True
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fin_streamlit.log import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Call:
+    """An in-flight call whose result is shared by every caller of the same key."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """De-duplicates concurrent calls made with the same key.
+
+    The first caller of a key runs the function, callers arriving while it is
+    in flight wait for it and get the same result (or exception).
+
+    Attributes
+    ----------
+    shared : int
+        The number of calls served from another caller's in-flight call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.shared = 0
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(in_flight={len(self._calls)}, shared={self.shared})"
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Runs fn, unless a call with the same key is in flight, then waits for its result.
+
+        Args:
+            key: The key identifying identical calls.
+            fn: The function to run.
+
+        Returns:
+            The result of fn.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            logger.debug("joining in-flight call %s", key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """De-duplicates concurrent coroutine calls made with the same key within one event loop."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaits fn, unless a call with the same key is in flight, then awaits its result.
+
+        Args:
+            key: The key identifying identical calls.
+            fn: The coroutine function to run.
+
+        Returns:
+            The result of fn.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+
+_default_single_flight = SingleFlight()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """Returns the process-wide SingleFlight shared by all the clients."""
+    return _default_single_flight
@@ -0,0 +1,202 @@
+"""Local HTTP stub of the Alpha Vantage API serving recorded fixtures.
+
+Run it with:
+
+    python -m fin_streamlit.clients.stub_server --fixtures tests/data --port 8765
+
+and point the app at it with ALPHA_VANTAGE_BASE_URL=http://127.0.0.1:8765/query,
+its responses are then cached and stored under their own directory of .cache.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from fin_streamlit.clients.replay import FixtureStore, missing_fixture_body
+from fin_streamlit.log import get_logger
+
+logger = get_logger(__name__)
+
+MINUTE_THROTTLE_BODY = {
+    "Note": "Thank you for using Alpha Vantage! Our standard API call frequency is "
+    "5 calls per minute and 500 calls per day."
+}
+DAILY_THROTTLE_BODY = {
+    "Information": "Thank you for using Alpha Vantage! Our standard API rate limit "
+    "is 25 requests per day."
+}
+
+
+class StubBehaviour:
+    """Latency, error and throttle injection settings of the stub server.
+
+    Attributes
+    ----------
+    latency : float
+        The base delay of every response, in seconds.
+    jitter : float
+        The maximum random delay added to the latency, in seconds.
+    error_rate : float
+        The probability of answering with a 503 error.
+    throttle_every : int, optional
+        Every n-th call gets a per-minute throttle body.
+    daily_limit : int, optional
+        The number of calls after which every call gets a daily throttle body.
+    seed : int, optional
+        The seed of the random generator, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_every: Optional[int] = None,
+        daily_limit: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_every = throttle_every
+        self.daily_limit = daily_limit
+        self._random = random.Random(seed)
+        self._calls = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_call(self) -> Tuple[int, float, float]:
+        """Returns the call number, the delay and a random draw for the next call."""
+        with self._lock:
+            return (
+                next(self._calls),
+                self.latency + self._random.uniform(0.0, self.jitter),
+                self._random.random(),
+            )
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/query":
+            self._send(404, {"Error Message": f"unknown path {url.path}"})
+            return
+        params = dict(parse_qsl(url.query))
+        behaviour = self.server.behaviour
+        call, delay, draw = behaviour.next_call()
+        if delay:
+            time.sleep(delay)
+        if draw < behaviour.error_rate:
+            self._send(503, {"Error Message": "injected error"})
+        elif behaviour.daily_limit is not None and call > behaviour.daily_limit:
+            self._send(200, DAILY_THROTTLE_BODY)
+        elif behaviour.throttle_every and call % behaviour.throttle_every == 0:
+            self._send(200, MINUTE_THROTTLE_BODY)
+        else:
+            content = self.server.fixtures.load(params)
+            self._send_raw(200, content or missing_fixture_body(params))
+
+    def _send(self, status: int, body: dict) -> None:
+        self._send_raw(status, json.dumps(body).encode())
+
+    def _send_raw(self, status: int, content: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering Alpha Vantage queries from a FixtureStore."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        fixtures: FixtureStore,
+        behaviour: Optional[StubBehaviour] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__((host, port), StubRequestHandler)
+        self.fixtures = fixtures
+        self.behaviour = behaviour or StubBehaviour()
+
+    @property
+    def base_url(self) -> str:
+        """Returns the url the clients should use as their base_url."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/query"
+
+
+def start_stub_server(
+    fixtures_dir: str,
+    behaviour: Optional[StubBehaviour] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> StubServer:
+    """Starts a stub server on a background thread.
+
+    Args:
+        fixtures_dir: The directory holding the recorded fixtures.
+        behaviour: The latency, error and throttle injection settings.
+        host: The interface to listen on.
+        port: The port to listen on, a free one is picked if 0.
+
+    Returns:
+        The running StubServer, stop it with `shutdown()`.
+    """
+    server = StubServer(FixtureStore(fixtures_dir), behaviour, host=host, port=port)
+    threading.Thread(
+        target=server.serve_forever, name="alpha-vantage-stub", daemon=True
+    ).start()
+    logger.debug("stub server listening on %s", server.base_url)
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default="tests/data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-every", type=int, default=None)
+    parser.add_argument("--daily-limit", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    behaviour = StubBehaviour(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_every=args.throttle_every,
+        daily_limit=args.daily_limit,
+        seed=args.seed,
+    )
+    server = StubServer(
+        FixtureStore(args.fixtures), behaviour, host=args.host, port=args.port
+    )
+    print(f"Serving {args.fixtures} on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
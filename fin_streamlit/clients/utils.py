@@ -1,14 +1,85 @@
+import json
+from typing import Any, Union
+
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+ERROR_PAYLOAD_KEYS = ("Error Message", "Note", "Information")
+RETRY_STATUS_FORCELIST = [500, 502, 503, 504]
+RETRY_BACKOFF_MAX = 120.0
+
+
+def is_valid_payload(payload: Any) -> bool:
+    """Checks whether the payload is a proper Alpha Vantage response and not an error message."""
+    return (
+        isinstance(payload, dict)
+        and bool(payload)
+        and not any(key in payload for key in ERROR_PAYLOAD_KEYS)
+    )
+
+
+def json_loads(content: Union[bytes, str]) -> Any:
+    """Decodes a JSON document, with orjson when it is installed.
+
+    Args:
+        content: The raw JSON document.
+
+    Returns:
+        The decoded document.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def get_retry_count(response: Any) -> int:
+    """Returns how many times urllib3 retried the request of a requests.Response.
+
+    Args:
+        response: The response, responses of other transports count as not retried.
+
+    Returns:
+        The number of retries recorded in the history of the urllib3 Retry.
+    """
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(getattr(retries, "history", ()) or ())
 
-def get_retry_session(retries=6, backoff_factor=0.1) -> requests.Session:
+
+def get_backoff_time(consecutive_errors: int, backoff_factor: float) -> float:
+    """Computes the sleep time before the next retry, the same way urllib3's Retry does.
+
+    Args:
+        consecutive_errors: The number of consecutive failed attempts so far.
+        backoff_factor: The factor by which to increase the wait time between retries.
+
+    Returns:
+        The number of seconds to wait before retrying.
+    """
+    if consecutive_errors <= 1:
+        return 0.0
+    return min(RETRY_BACKOFF_MAX, backoff_factor * (2 ** (consecutive_errors - 1)))
+
+
+def get_retry_session(
+    retries=6, backoff_factor=0.1, pool_connections=10, pool_maxsize=10
+) -> requests.Session:
     """Get a Session object with retry capabilities.
 
+    Connections are kept alive in the adapter's pool, so requests sent through
+    the same session reuse the TCP connection and TLS session of earlier ones.
+
     Args:
         retries: The number of retries to attempt before giving up.
         backoff_factor: The factor by which to increase the wait time between retries.
+        pool_connections: The number of hosts to keep connection pools for.
+        pool_maxsize: The maximum number of connections kept alive per host,
+            should cover the number of threads sharing the session.
 
     Returns:
         A Session object with retry capabilities.
@@ -19,9 +90,11 @@ def get_retry_session(retries=6, backoff_factor=0.1) -> requests.Session:
         read=retries,
         connect=retries,
         backoff_factor=backoff_factor,
-        status_forcelist=[500, 502, 503, 504],
+        status_forcelist=RETRY_STATUS_FORCELIST,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry, pool_connections=pool_connections, pool_maxsize=pool_maxsize
     )
-    adapter = HTTPAdapter(max_retries=retry)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     session.mount("https://www.alphavantage.co", adapter)
@@ -0,0 +1,83 @@
+"""Price reactions of a stock around its earnings reports."""
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from fin_streamlit.statements import DATE_FIELD, FinancialStatement
+
+REPORTED_DATE = "reportedDate"
+EARNINGS_FIELDS = ("reportedEPS", "estimatedEPS", "surprise", "surprisePercentage")
+# trading days after the report the reaction is measured at
+REACTION_HORIZONS = (1, 5, 20)
+
+
+def reaction_column(horizon: int) -> str:
+    """Returns the name of the column holding the reaction after `horizon` trading days."""
+    return f"Reaction {horizon}D"
+
+
+def earnings_reactions(
+    earnings: FinancialStatement,
+    quotes: pd.DataFrame,
+    horizons: Sequence[int] = REACTION_HORIZONS,
+) -> pd.DataFrame:
+    """Joins the quarterly earnings with the price moves that followed their reports.
+
+    The reference price is the last close before the report date, as the
+    time of day of a report is not known. The reaction after h trading days
+    is the return from it to the close h bars later.
+
+    Args:
+        earnings: The quarterly earnings, see `models.earnings`.
+        quotes: Daily quotes with a Close column, indexed by ascending date.
+        horizons: The numbers of trading days to measure the reactions at.
+
+    Returns:
+        A Pandas DataFrame of the EPS, surprise and reactions per report,
+        indexed by fiscal date, newest first. Reactions are NaN where the
+        quotes don't cover the report.
+    """
+    table = earnings.table
+    if table.empty or REPORTED_DATE not in table:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name=DATE_FIELD))
+    fields = [f for f in EARNINGS_FIELDS if f in table]
+    events = (
+        table[[REPORTED_DATE, *fields]]
+        .dropna(subset=[REPORTED_DATE])
+        .reset_index()
+        .sort_values(REPORTED_DATE, kind="stable")
+    )
+    close = quotes["Close"].to_numpy(dtype="f8") if "Close" in quotes else np.empty(0)
+    bars = pd.DataFrame(
+        {
+            "date": pd.DatetimeIndex(quotes.index[: len(close)]).astype(
+                events[REPORTED_DATE].dtype
+            ),
+            "position": np.arange(len(close)),
+        }
+    )
+    events = pd.merge_asof(
+        events,
+        bars,
+        left_on=REPORTED_DATE,
+        right_on="date",
+        direction="backward",
+        allow_exact_matches=False,
+    ).drop(columns="date")
+    position = events["position"].to_numpy(dtype="f8")
+    valid = ~np.isnan(position)
+    base = np.full(len(events), np.nan)
+    base[valid] = close[position[valid].astype(int)]
+    for horizon in horizons:
+        target = position + horizon
+        covered = valid & (target < len(close))
+        reaction = np.full(len(events), np.nan)
+        reaction[covered] = close[target[covered].astype(int)] / base[covered] - 1
+        events[reaction_column(horizon)] = reaction
+    events["Close before"] = base
+    return (
+        events.drop(columns="position")
+        .set_index(DATE_FIELD)
+        .sort_index(ascending=False)
+    )
@@ -4,3 +4,11 @@ class AlphVantageApiKeyException(Exception):
 
 class ApiKeyMissingException(Exception):
     pass
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+class NewsUnavailable(Exception):
+    pass
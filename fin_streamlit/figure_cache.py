@@ -0,0 +1,116 @@
+"""Process-wide cache of built Plotly figures shared by all sessions.
+
+The figures are kept as `go.Figure` objects rather than JSON or dicts:
+`st.plotly_chart` validates every dict it is given by building a Figure out
+of it, which costs as much as building the chart, while a Figure is only
+copied and serialized. Streamlit never modifies the figure it is given, so
+the same object can be passed by every session.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from fin_streamlit.log import get_logger
+from fin_streamlit.settings import Settings
+
+logger = get_logger(__name__)
+
+_default_cache: Optional["FigureCache"] = None
+_default_cache_lock = threading.Lock()
+
+
+def frame_version(data: pd.DataFrame) -> int:
+    """Returns a hash of the values, index and columns of a frame, it changes with any of them."""
+    values = int(pd.util.hash_pandas_object(data, index=True).sum())
+    return values ^ hash(tuple(data.columns))
+
+
+class FigureCache:
+    """Figures by key, least recently used dropped past a memory cap.
+
+    Keys are tuples like (symbol, dataset version, chart type, category or
+    range), so a figure is rebuilt as soon as the data behind it changes.
+    The size of a figure is the length of its JSON, measured when it is stored.
+
+    Attributes
+    ----------
+    max_bytes : int
+        The maximum total size of the stored figures, in bytes.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self._figures: "OrderedDict[Hashable, Tuple[go.Figure, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(figures={len(self._figures)}, "
+            f"nbytes={self.nbytes}, max_bytes={self.max_bytes})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+    def get(self, key: Hashable) -> Optional[go.Figure]:
+        """Returns the figure stored under key, None if there is none."""
+        with self._lock:
+            entry = self._figures.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._figures.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, figure: go.Figure) -> None:
+        """Stores a figure, evicting the least recently used ones above max_bytes.
+
+        Figures larger than max_bytes on their own are not stored.
+        """
+        size = len(pio.to_json(figure, validate=False))
+        if size > self.max_bytes:
+            logger.debug("figure %s of %s bytes is too large to cache", key, size)
+            return
+        with self._lock:
+            previous = self._figures.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[1]
+            self._figures[key] = (figure, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._figures.popitem(last=False)
+                self.nbytes -= evicted
+                self.evictions += 1
+
+    def figure(self, key: Hashable, build: Callable[[], go.Figure]) -> go.Figure:
+        """Returns the figure under key, building and storing it on a miss.
+
+        Args:
+            key: The key of the figure.
+            build: Builds the figure when it is not cached.
+
+        Returns:
+            The figure, to pass to `st.plotly_chart` as is. It is shared, so
+            it must not be modified.
+        """
+        figure = self.get(key)
+        if figure is None:
+            figure = build()
+            self.put(key, figure)
+        return figure
+
+
+def get_figure_cache() -> FigureCache:
+    """Returns the process-wide FigureCache configured in Settings."""
+    global _default_cache  # pylint: disable=global-statement
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = FigureCache(Settings.FIGURE_CACHE_MAX_BYTES)
+        return _default_cache
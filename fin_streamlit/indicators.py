@@ -0,0 +1,350 @@
+"""Technical indicators computed on the daily quotes frame.
+
+Every indicator is vectorized and can continue from the state of an earlier
+computation, so `IndicatorCache` only computes the last cached bar (which may
+have been revised) and the bars appended since instead of the whole history.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS_PER_YEAR = 252
+
+_State = Dict[str, float]
+# computes the rows of `data` from position `start` on, continuing from `state`,
+# the parameters of the indicator are passed as keyword arguments
+_Kernel = Callable[..., Tuple[pd.DataFrame, _State]]
+
+
+def _ewm(
+    values: pd.Series, alpha: float, min_periods: int = 0, seed: Optional[float] = None
+) -> pd.Series:
+    """Exponentially weighted mean y[t] = (1 - alpha) * y[t-1] + alpha * x[t].
+
+    With a seed the recursion continues from it, giving the same values as
+    a computation over the whole history.
+    """
+    if seed is None:
+        return values.ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+    seeded = pd.concat([pd.Series([seed]), values], ignore_index=True)
+    result = seeded.ewm(alpha=alpha, adjust=False).mean().iloc[1:]
+    result.index = values.index
+    return result
+
+
+def _tail(data: pd.DataFrame, start: int, lookback: int) -> pd.DataFrame:
+    """Returns the rows needed to compute the rows from start on with a lookback window."""
+    return data.iloc[max(0, start - lookback) :]
+
+
+def _sma(data: pd.DataFrame, start: int, state: _State, *, window: int = 20):
+    close = _tail(data, start, window - 1)["Close"]
+    sma = close.rolling(window).mean()
+    return sma.to_frame(f"SMA({window})").iloc[-(len(data) - start) :], {}
+
+
+def _ema(data: pd.DataFrame, start: int, state: _State, *, span: int = 20):
+    ema = _ewm(data["Close"].iloc[start:], 2 / (span + 1), seed=state.get("ema"))
+    return ema.to_frame(f"EMA({span})"), {"ema": ema.iloc[-1]}
+
+
+def _rsi(data: pd.DataFrame, start: int, state: _State, *, window: int = 14):
+    change = _tail(data, start, 1)["Close"].diff().iloc[-(len(data) - start) :]
+    alpha = 1 / window
+    gain = _ewm(change.clip(lower=0), alpha, window, seed=state.get("gain"))
+    loss = _ewm(-change.clip(upper=0), alpha, window, seed=state.get("loss"))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + gain / loss)
+    rsi[(loss == 0) & gain.notna()] = 100.0
+    return rsi.to_frame(f"RSI({window})"), {
+        "gain": gain.iloc[-1],
+        "loss": loss.iloc[-1],
+    }
+
+
+def _macd(
+    data: pd.DataFrame,
+    start: int,
+    state: _State,
+    *,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+):
+    close = data["Close"].iloc[start:]
+    fast_ema = _ewm(close, 2 / (fast + 1), seed=state.get("fast"))
+    slow_ema = _ewm(close, 2 / (slow + 1), seed=state.get("slow"))
+    macd = fast_ema - slow_ema
+    signal_line = _ewm(macd, 2 / (signal + 1), seed=state.get("signal"))
+    label = f"MACD({fast},{slow},{signal})"
+    frame = pd.DataFrame(
+        {
+            label: macd,
+            f"{label} Signal": signal_line,
+            f"{label} Histogram": macd - signal_line,
+        }
+    )
+    return frame, {
+        "fast": fast_ema.iloc[-1],
+        "slow": slow_ema.iloc[-1],
+        "signal": signal_line.iloc[-1],
+    }
+
+
+def _bollinger(
+    data: pd.DataFrame, start: int, state: _State, *, window: int = 20, k: float = 2.0
+):
+    rolling = _tail(data, start, window - 1)["Close"].rolling(window)
+    middle, deviation = rolling.mean(), rolling.std(ddof=0)
+    label = f"BB({window},{k:g})"
+    frame = pd.DataFrame(
+        {
+            f"{label} Upper": middle + k * deviation,
+            f"{label} Middle": middle,
+            f"{label} Lower": middle - k * deviation,
+        }
+    )
+    return frame.iloc[-(len(data) - start) :], {}
+
+
+def _atr(data: pd.DataFrame, start: int, state: _State, *, window: int = 14):
+    rows = _tail(data, start, 1)
+    previous_close = rows["Close"].shift()
+    true_range = pd.concat(
+        [
+            rows["High"] - rows["Low"],
+            (rows["High"] - previous_close).abs(),
+            (rows["Low"] - previous_close).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+    true_range = true_range.iloc[-(len(data) - start) :]
+    atr = _ewm(true_range, 1 / window, window, seed=state.get("atr"))
+    return atr.to_frame(f"ATR({window})"), {"atr": atr.iloc[-1]}
+
+
+def _volatility(data: pd.DataFrame, start: int, state: _State, *, window: int = 21):
+    close = _tail(data, start, window)["Close"]
+    returns = np.log(close).diff()
+    volatility = returns.rolling(window).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+    frame = volatility.to_frame(f"Volatility({window})")
+    return frame.iloc[-(len(data) - start) :], {}
+
+
+def _drawdown(data: pd.DataFrame, start: int, state: _State):
+    close = data["Close"].iloc[start:]
+    peak = np.fmax(close.cummax(), state.get("peak", -np.inf))
+    return (close / peak - 1).to_frame("Drawdown"), {"peak": peak.iloc[-1]}
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """An indicator the quotes chart can show.
+
+    Attributes
+    ----------
+    name : str
+        The name the indicator is selected by.
+    kernel : _Kernel
+        The function computing it.
+    overlay : bool
+        True if it is drawn over the candles, False if it gets its own panel.
+    defaults : Dict[str, Any]
+        The default parameters of the kernel.
+    """
+
+    name: str
+    kernel: _Kernel = field(repr=False)
+    overlay: bool
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {
+    spec.name: spec
+    for spec in (
+        IndicatorSpec("SMA", _sma, True, {"window": 20}),
+        IndicatorSpec("EMA", _ema, True, {"span": 20}),
+        IndicatorSpec("Bollinger Bands", _bollinger, True, {"window": 20, "k": 2.0}),
+        IndicatorSpec("RSI", _rsi, False, {"window": 14}),
+        IndicatorSpec("MACD", _macd, False, {"fast": 12, "slow": 26, "signal": 9}),
+        IndicatorSpec("ATR", _atr, False, {"window": 14}),
+        IndicatorSpec("Volatility", _volatility, False, {"window": 21}),
+        IndicatorSpec("Drawdown", _drawdown, False),
+    )
+}
+
+
+def compute_indicator(data: pd.DataFrame, name: str, **params: Any) -> pd.DataFrame:
+    """Computes an indicator over the whole quotes frame.
+
+    Args:
+        data: A Pandas DataFrame of daily OHLC columns indexed by an ascending date.
+        name: The name of the indicator, one of the INDICATORS keys.
+        **params: Parameters overriding the defaults of the indicator.
+
+    Returns:
+        A Pandas DataFrame of the indicator line(s) with the index of data.
+    """
+    spec = INDICATORS[name]
+    if data.empty:
+        return pd.DataFrame(index=data.index)
+    frame, _ = spec.kernel(data, 0, {}, **{**spec.defaults, **params})
+    return frame
+
+
+class IndicatorResult:
+    """An indicator computed over a quotes frame, with the state to extend it.
+
+    The last bar of the quotes may still be revised (it is replaced while the
+    session is open), so the state is the one before it and extending the
+    result recomputes the indicator from the last bar on.
+
+    Attributes
+    ----------
+    spec : IndicatorSpec
+        The indicator that was computed.
+    frame : pd.DataFrame
+        The indicator line(s), indexed like the quotes.
+    state : Dict[str, float]
+        The values of the recursive parts of the indicator before the last bar.
+    last_bar : np.ndarray
+        The values of the last bar of the quotes the indicator was computed on.
+    """
+
+    def __init__(
+        self,
+        spec: IndicatorSpec,
+        frame: pd.DataFrame,
+        state: _State,
+        last_bar: Optional[np.ndarray] = None,
+    ):
+        self.spec = spec
+        self.frame = frame
+        self.state = state
+        self.last_bar = last_bar
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.spec.name}, rows={len(self.frame)})"
+
+    @property
+    def overlay(self) -> bool:
+        """Returns True if the indicator is drawn over the candles."""
+        return self.spec.overlay
+
+    @classmethod
+    def compute(
+        cls,
+        spec: IndicatorSpec,
+        data: pd.DataFrame,
+        params: Dict[str, Any],
+        previous: Optional["IndicatorResult"] = None,
+    ) -> "IndicatorResult":
+        """Computes the indicator of data, continuing from a previous result.
+
+        Args:
+            spec: The indicator to compute.
+            data: A non-empty Pandas DataFrame of daily OHLC columns indexed by an ascending date.
+            params: The parameters of the kernel.
+            previous: A result data extends, whose last bar on is recomputed.
+
+        Returns:
+            The IndicatorResult covering every row of data.
+        """
+        start, state = 0, {}
+        if previous is not None:
+            start, state = len(previous.frame) - 1, previous.state
+        last = len(data) - 1
+        frames = [previous.frame.iloc[:start]] if previous is not None else []
+        if start < last:
+            head, state = spec.kernel(data.iloc[:last], start, state, **params)
+            frames.append(head)
+        frames.append(spec.kernel(data, last, state, **params)[0])
+        frame = pd.concat(frames) if len(frames) > 1 else frames[0]
+        return cls(spec, frame, state, data.iloc[last].to_numpy())
+
+    def extends_to(self, data: pd.DataFrame) -> bool:
+        """Checks whether data is the computed history, with the last bar revised or new bars appended."""
+        rows = len(self.frame)
+        return (
+            0 < rows <= len(data)
+            and data.index[0] == self.frame.index[0]
+            and data.index[rows - 1] == self.frame.index[-1]
+            and not any(pd.isna(v) for v in self.state.values())
+        )
+
+    def covers(self, data: pd.DataFrame) -> bool:
+        """Checks whether data is exactly the computed history, last bar values included."""
+        return (
+            self.extends_to(data)
+            and len(data) == len(self.frame)
+            and self.last_bar is not None
+            and np.array_equal(data.iloc[-1].to_numpy(), self.last_bar)
+        )
+
+
+class IndicatorCache:
+    """Indicators by symbol and parameters, extended incrementally when new bars arrive.
+
+    Attributes
+    ----------
+    maxsize : int
+        The maximum number of results kept, the least recently used are dropped.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._results: "OrderedDict[tuple, IndicatorResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(size={len(self._results)}, maxsize={self.maxsize})"
+
+    def get(
+        self, symbol: str, data: pd.DataFrame, name: str, **params: Any
+    ) -> IndicatorResult:
+        """Returns the indicator of the symbol's quotes, computing only what is not cached.
+
+        If data extends the cached quotes, only the last cached bar, which
+        may have been revised, and the new bars are computed. If it does not
+        (e.g. a different window of history) it is recomputed.
+
+        Args:
+            symbol: The symbol of the quotes.
+            data: A Pandas DataFrame of daily OHLC columns indexed by an ascending date.
+            name: The name of the indicator, one of the INDICATORS keys.
+            **params: Parameters overriding the defaults of the indicator.
+
+        Returns:
+            The IndicatorResult covering every row of data.
+        """
+        spec = INDICATORS[name]
+        if data.empty:
+            return IndicatorResult(spec, pd.DataFrame(index=data.index), {})
+        params = {**spec.defaults, **params}
+        key = (symbol.upper(), name, tuple(sorted(params.items())))
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is not None and cached.covers(data):
+            result = cached
+        elif cached is not None and cached.extends_to(data):
+            result = IndicatorResult.compute(spec, data, params, previous=cached)
+        else:
+            result = IndicatorResult.compute(spec, data, params)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+
+_default_indicator_cache = IndicatorCache()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Returns the process-wide IndicatorCache."""
+    return _default_indicator_cache
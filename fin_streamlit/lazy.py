@@ -0,0 +1,32 @@
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """A module proxy that imports the module on first attribute access.
+
+    Lets pages that never use a heavy module (pandas, plotly, the API client)
+    skip importing it, instead of paying for it on every cold start.
+    """
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r}>"
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Returns the module if it is already imported, a LazyModule proxy of it otherwise.
+
+    Args:
+        name: The absolute name of the module, e.g. `fin_streamlit.charts`.
+
+    Returns:
+        The module or its proxy.
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
@@ -0,0 +1,384 @@
+"""Request and render metrics of the dashboard, optionally exported to Prometheus.
+
+The client records every request (endpoint, outcome, status, bytes, retries,
+throttles) and the controller every page phase (load, fetch, parse, render).
+With the `metrics` extra (prometheus-client) installed, set METRICS_PORT to
+serve them on `http://<host>:<port>/metrics`.
+"""
+import contextvars
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fin_streamlit.lazy import lazy_import
+from fin_streamlit.log import get_logger
+
+# optional, only imported once the metrics are exported
+prometheus_client = lazy_import("prometheus_client")
+prometheus_core = lazy_import("prometheus_client.core")
+
+logger = get_logger(__name__)
+
+RECENT_REQUESTS = 50
+
+_LabelValues = Tuple[str, ...]
+
+
+class _Metric(ABC):
+    """A metric kept in memory per label set, read by the diagnostics panel and the exporter."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[_LabelValues, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> _LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Dict[_LabelValues, Any]:
+        """Returns a copy of the values of every label set."""
+        with self._lock:
+            return dict(self._values)
+
+    def clear(self) -> None:
+        """Resets the values of every label set."""
+        with self._lock:
+            self._values.clear()
+
+    @abstractmethod
+    def family(self) -> Any:
+        """Returns the values as a prometheus_client metric family."""
+
+
+class Counter(_Metric):
+    """A monotonically increasing value per label set."""
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increases the counter of the label set by amount."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Returns the current value of the label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def family(self) -> Any:
+        family = prometheus_core.CounterMetricFamily(
+            self.name, self.documentation, labels=self.labelnames
+        )
+        for key, value in sorted(self.samples().items()):
+            family.add_metric(key, value)
+        return family
+
+
+class Summary(_Metric):
+    """The number and sum of the observations per label set, e.g. of durations."""
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Records one observation of the label set."""
+        key = self._key(labels)
+        with self._lock:
+            count, total = self._values.get(key, (0, 0.0))
+            self._values[key] = (count + 1, total + value)
+
+    def family(self) -> Any:
+        family = prometheus_core.SummaryMetricFamily(
+            self.name, self.documentation, labels=self.labelnames
+        )
+        for key, (count, total) in sorted(self.samples().items()):
+            family.add_metric(key, count_value=count, sum_value=total)
+        return family
+
+
+class MetricsRegistry:
+    """The set of metrics exported together, a prometheus_client collector.
+
+    Attributes
+    ----------
+    metrics : Dict[str, _Metric]
+        The registered metrics by name.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Creates and registers a Counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def summary(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Summary:
+        """Creates and registers a Summary."""
+        return self._register(Summary(name, documentation, labelnames))
+
+    def collect(self) -> Iterator[Any]:
+        """Yields the metric families of all the metrics, called on every scrape."""
+        for metric in list(self.metrics.values()):
+            yield metric.family()
+
+    def clear(self) -> None:
+        """Resets the values of all the metrics."""
+        for metric in self.metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    "alpha_vantage_requests",
+    "Client requests by endpoint and outcome "
+    "(cache_hit, stale, fetched, shared, revalidated, error).",
+    ["endpoint", "outcome"],
+)
+REQUEST_SECONDS = REGISTRY.summary(
+    "alpha_vantage_request_seconds",
+    "Time to serve a client request, cache and rate limiter waits included.",
+    ["endpoint"],
+)
+HTTP_SECONDS = REGISTRY.summary(
+    "alpha_vantage_http_seconds",
+    "Time of the HTTP calls to the API, transport retries included.",
+    ["endpoint"],
+)
+HTTP_RESPONSES = REGISTRY.counter(
+    "alpha_vantage_http_responses",
+    "HTTP responses of the API by endpoint and status code.",
+    ["endpoint", "status"],
+)
+RESPONSE_BYTES = REGISTRY.counter(
+    "alpha_vantage_response_bytes",
+    "Bytes of the response bodies received from the API.",
+    ["endpoint"],
+)
+RETRIES = REGISTRY.counter(
+    "alpha_vantage_retries",
+    "Transport level retries of connection errors and 5xx responses.",
+    ["endpoint"],
+)
+THROTTLED = REGISTRY.counter(
+    "alpha_vantage_throttled",
+    "Responses that were throttle messages, by kind (minute, daily).",
+    ["endpoint", "kind"],
+)
+PHASE_SECONDS = REGISTRY.summary(
+    "dashboard_phase_seconds",
+    "Time spent per page and phase (load, fetch, parse, render, total).",
+    ["page", "phase"],
+)
+
+
+@dataclass
+class RequestTrace:
+    """What happened to one client request, kept for the diagnostics panel."""
+
+    endpoint: str
+    outcome: str = "shared"
+    status: Optional[int] = None
+    bytes: int = 0
+    retries: int = 0
+    throttled: int = 0
+    elapsed: float = 0.0
+    started: float = 0.0
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+_current_page: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_page", default="-"
+)
+_recent_requests: Deque[RequestTrace] = deque(maxlen=RECENT_REQUESTS)
+_last_phases: Dict[Tuple[str, str], float] = {}
+
+
+@contextmanager
+def trace_request(endpoint: str) -> Iterator[RequestTrace]:
+    """Records the outcome and duration of the client request made within the with block.
+
+    The trace is the current one of the context, so the HTTP layer can fill
+    in the status, size and retries of the calls it sends for the request.
+
+    Args:
+        endpoint: The Alpha Vantage function of the request.
+
+    Yields:
+        The RequestTrace of the request.
+    """
+    trace = RequestTrace(endpoint=endpoint, started=time.time())
+    token = _current_trace.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    except BaseException:
+        trace.outcome = "error"
+        raise
+    finally:
+        _current_trace.reset(token)
+        trace.elapsed = time.perf_counter() - started
+        REQUESTS.inc(endpoint=endpoint, outcome=trace.outcome)
+        REQUEST_SECONDS.observe(trace.elapsed, endpoint=endpoint)
+        _recent_requests.append(trace)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """Returns the trace of the client request being served, if any."""
+    return _current_trace.get()
+
+
+def record_http_response(
+    endpoint: str, status: int, size: int, retries: int, elapsed: float
+) -> None:
+    """Records one HTTP call to the API and adds it to the current request trace.
+
+    Args:
+        endpoint: The Alpha Vantage function of the request.
+        status: The HTTP status code of the response.
+        size: The size of the response body in bytes.
+        retries: The number of transport level retries the call took.
+        elapsed: The duration of the call in seconds.
+    """
+    HTTP_SECONDS.observe(elapsed, endpoint=endpoint)
+    HTTP_RESPONSES.inc(endpoint=endpoint, status=str(status))
+    RESPONSE_BYTES.inc(size, endpoint=endpoint)
+    if retries:
+        RETRIES.inc(retries, endpoint=endpoint)
+    trace = current_trace()
+    if trace is not None:
+        trace.status = status
+        trace.bytes += size
+        trace.retries += retries
+
+
+def record_throttle(endpoint: str, kind: str) -> None:
+    """Records a throttle message received for the endpoint."""
+    THROTTLED.inc(endpoint=endpoint, kind=kind)
+    trace = current_trace()
+    if trace is not None:
+        trace.throttled += 1
+
+
+@contextmanager
+def page(name: str) -> Iterator[None]:
+    """Attributes the phases of the with block to the page and records its total time."""
+    token = _current_page.set(name)
+    try:
+        with phase("total"):
+            yield
+    finally:
+        _current_page.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Records the duration of one phase (e.g. fetch, parse, render) of the current page."""
+    page_name = _current_page.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        PHASE_SECONDS.observe(elapsed, page=page_name, phase=name)
+        _last_phases[(page_name, name)] = elapsed
+
+
+def recent_requests() -> List[dict]:
+    """Returns the traces of the last client requests, newest first."""
+    return [asdict(trace) for trace in reversed(list(_recent_requests))]
+
+
+def last_phases(page_name: str) -> Dict[str, float]:
+    """Returns the duration of each phase of the last run of the page."""
+    return {p: v for (name, p), v in list(_last_phases.items()) if name == page_name}
+
+
+def endpoint_summary() -> List[dict]:
+    """Returns the request count, cache hit ratio, mean latency and bytes per endpoint."""
+    requests: Dict[str, Dict[str, float]] = {}
+    for (endpoint, outcome), value in REQUESTS.samples().items():
+        requests.setdefault(endpoint, {})[outcome] = value
+    latency = REQUEST_SECONDS.samples()
+    http_latency = HTTP_SECONDS.samples()
+    size = RESPONSE_BYTES.samples()
+    retries = RETRIES.samples()
+    throttled: Dict[str, float] = {}
+    for (endpoint, _), value in THROTTLED.samples().items():
+        throttled[endpoint] = throttled.get(endpoint, 0) + value
+    summary = []
+    for endpoint, outcomes in sorted(requests.items()):
+        total = sum(outcomes.values())
+        count, seconds = latency.get((endpoint,), (0, 0.0))
+        http_count, http_seconds = http_latency.get((endpoint,), (0, 0.0))
+        summary.append(
+            {
+                "endpoint": endpoint,
+                "requests": int(total),
+                "cache hit ratio": outcomes.get("cache_hit", 0) / total,
+                "stale served": int(outcomes.get("stale", 0)),
+                "errors": int(outcomes.get("error", 0)),
+                "mean latency [ms]": 1e3 * seconds / count if count else 0.0,
+                "http calls": http_count,
+                "mean http latency [ms]": (
+                    1e3 * http_seconds / http_count if http_count else 0.0
+                ),
+                "bytes": int(size.get((endpoint,), 0)),
+                "retries": int(retries.get((endpoint,), 0)),
+                "throttled": int(throttled.get(endpoint, 0)),
+            }
+        )
+    return summary
+
+
+_metrics_exported = False
+_metrics_exported_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> bool:
+    """Serves the metrics with prometheus_client on a background thread, once.
+
+    Streamlit reruns the app script on every interaction, later calls keep
+    the server started by the first one.
+
+    Args:
+        port: The port to listen on.
+        host: The interface to listen on.
+
+    Returns:
+        True if the metrics are served, False if prometheus_client is not installed.
+    """
+    global _metrics_exported  # pylint: disable=global-statement
+    with _metrics_exported_lock:
+        if not _metrics_exported:
+            try:
+                registry = prometheus_client.CollectorRegistry()
+            except ImportError:
+                logger.warning(
+                    "install the metrics extra (prometheus-client) to serve metrics"
+                )
+                return False
+            registry.register(REGISTRY)
+            prometheus_client.start_http_server(port, addr=host, registry=registry)
+            _metrics_exported = True
+            logger.info("serving metrics on %s:%s/metrics", host, port)
+    return True
@@ -0,0 +1,181 @@
+"""Process-wide snapshot of the top gainers, losers and most traded tickers.
+
+Every session of the dashboard reads the same parsed snapshot. The first one
+is fetched when the app starts, later ones only when the page asks for the
+snapshot after it expired, by a single background thread: sessions never wait
+for TOP_GAINERS_LOSERS, and nothing calls it while nobody looks at the movers.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from fin_streamlit.clients.alpha_vantage import Endpoints
+from fin_streamlit.clients.rate_limit import Priority, request_priority
+from fin_streamlit.log import get_logger
+from fin_streamlit.settings import Settings
+
+logger = get_logger(__name__)
+
+# payload key -> title of the table
+MOVER_LISTS = {
+    "top_gainers": "Top gainers",
+    "top_losers": "Top losers",
+    "most_actively_traded": "Most actively traded",
+}
+MOVER_COLUMNS = ["price", "change_amount", "change_percentage", "volume"]
+# how soon to try again when the API answered with an outdated or no snapshot
+RETRY_SECONDS = 15.0
+
+_default_feed: Optional["MoversFeed"] = None
+_default_feed_lock = threading.Lock()
+
+
+def _movers_frame(rows: Any) -> pd.DataFrame:
+    """Parses a list of movers into a typed frame, percentages as float64 numbers."""
+    raw = pd.DataFrame.from_records(list(rows or [])).reindex(
+        columns=["ticker", *MOVER_COLUMNS]
+    )
+    raw["change_percentage"] = raw["change_percentage"].astype(str).str.rstrip("%")
+    frame = raw[MOVER_COLUMNS].apply(pd.to_numeric, errors="coerce").astype("f8")
+    frame["volume"] = frame["volume"].fillna(0).astype("i8")
+    return frame.set_axis(pd.Index(raw["ticker"].astype(str), name="ticker"))
+
+
+class MoversSnapshot:
+    """A TOP_GAINERS_LOSERS response parsed once into typed frames.
+
+    Attributes
+    ----------
+    tables : Dict[str, pd.DataFrame]
+        The movers by list (see MOVER_LISTS), indexed by ticker.
+    last_updated : str
+        When Alpha Vantage computed the lists, as it reports it.
+    fetched_at : float
+        When the snapshot was fetched, as a timestamp.
+    """
+
+    def __init__(
+        self, tables: Dict[str, pd.DataFrame], last_updated: str, fetched_at: float
+    ) -> None:
+        self.tables = tables
+        self.last_updated = last_updated
+        self.fetched_at = fetched_at
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(last_updated={self.last_updated!r})"
+
+    @classmethod
+    def from_payload(cls, payload: Optional[dict]) -> Optional["MoversSnapshot"]:
+        """Parses a TOP_GAINERS_LOSERS response, None if it holds none of the lists."""
+        payload = payload or {}
+        if not any(key in payload for key in MOVER_LISTS):
+            return None
+        return cls(
+            {key: _movers_frame(payload.get(key)) for key in MOVER_LISTS},
+            str(payload.get("last_updated", "")),
+            time.time(),
+        )
+
+
+class MoversFeed:
+    """Keeps the latest MoversSnapshot, refreshed in the background once it is older than a TTL.
+
+    The first snapshot is fetched when the app starts, see `start`. Sessions
+    asking for an expired snapshot get the previous one while a single thread
+    fetches the new one, no session ever waits for the API.
+
+    Attributes
+    ----------
+    ttl : float
+        How long a snapshot is served before it is refreshed, in seconds.
+    snapshot : MoversSnapshot, optional
+        The latest snapshot, None until the first refresh succeeded.
+    """
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self.snapshot: Optional[MoversSnapshot] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(ttl={self.ttl}, snapshot={self.snapshot})"
+
+    @property
+    def expired(self) -> bool:
+        """Returns True if the snapshot is due for a refresh."""
+        return time.monotonic() >= self._expires_at
+
+    def start(self, client: Any) -> bool:
+        """Fetches the first snapshot in the background, unless there already is one.
+
+        Args:
+            client: The AlphaVantageClient used by the refresh thread.
+
+        Returns:
+            True if a refresh was started.
+        """
+        with self._lock:
+            return self.snapshot is None and self._refresh_in_background(client)
+
+    def get(self, client: Any) -> Optional[MoversSnapshot]:
+        """Returns the latest snapshot without waiting, refreshing it in the background if it expired.
+
+        Args:
+            client: The AlphaVantageClient used by the refresh thread.
+
+        Returns:
+            The latest snapshot, None until the first refresh succeeded.
+        """
+        with self._lock:
+            self._refresh_in_background(client)
+        return self.snapshot
+
+    def _refresh_in_background(self, client: Any) -> bool:
+        if not self.expired or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self._thread = threading.Thread(
+            target=self._run, args=(client,), name="movers-refresh", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _run(self, client: Any) -> None:
+        delay = self.ttl if self.refresh(client) else min(RETRY_SECONDS, self.ttl)
+        self._expires_at = time.monotonic() + delay
+
+    def refresh(self, client: Any) -> bool:
+        """Fetches and parses a new snapshot, keeping the previous one on failure.
+
+        Args:
+            client: An AlphaVantageClient.
+
+        Returns:
+            True if the snapshot is up to date, False if it should be retried soon.
+        """
+        with request_priority(Priority.BACKGROUND):
+            try:
+                payload = client.get_top_gainers_and_losers()
+            except Exception as e:
+                logger.warning("couldn't refresh the market movers: %s", e)
+                return False
+        snapshot = MoversSnapshot.from_payload(payload)
+        if snapshot is None:
+            logger.warning("couldn't refresh the market movers, keeping the last ones")
+            return False
+        self.snapshot = snapshot
+        freshness = client.freshness(Endpoints.TOP_GAINERS_LOSERS)
+        # a stale response is being revalidated, pick the new one up soon
+        return freshness is None or not freshness.revalidating
+
+
+def get_movers_feed() -> MoversFeed:
+    """Returns the process-wide MoversFeed configured in Settings."""
+    global _default_feed  # pylint: disable=global-statement
+    with _default_feed_lock:
+        if _default_feed is None:
+            _default_feed = MoversFeed(Settings.MOVERS_TTL_SECONDS)
+        return _default_feed
@@ -1,32 +1,62 @@
-import numpy as np
-import pandas as pd
+from __future__ import annotations
+
+import functools
+from datetime import timedelta
+from typing import TYPE_CHECKING, Callable, Optional
+
 import streamlit as st
 
-from fin_streamlit.clients.alpha_vantage import AlphaVantageClient
-from fin_streamlit.mvc import models, views
+from fin_streamlit import metrics
+from fin_streamlit.lazy import lazy_import
+from fin_streamlit.mvc import views
+from fin_streamlit.settings import Settings
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-class DashboardController:
-    def __init__(self, symbol: str):
-        self.symbol = symbol
-        self.client = AlphaVantageClient()
+    from fin_streamlit.clients.alpha_vantage import AlphaVantageClient
+    from fin_streamlit.statements import StatementSet
 
-    @staticmethod
-    def _clean_data_for_chart(data: pd.DataFrame) -> pd.DataFrame:
-        """Cleans the given Pandas DataFrame for charting purposes.
+# heavy modules, imported by the first page that needs them
+models = lazy_import("fin_streamlit.mvc.models")
+alpha_vantage = lazy_import("fin_streamlit.clients.alpha_vantage")
+indicators = lazy_import("fin_streamlit.indicators")
+screener = lazy_import("fin_streamlit.screener")
+news = lazy_import("fin_streamlit.news")
+movers = lazy_import("fin_streamlit.movers")
 
-        Args:
-            data: A Pandas DataFrame containing the data to be cleaned.
 
-        Returns:
-            A Pandas DataFrame containing the cleaned data.
-        """
-        cleaned_data = data.drop(["reportedCurrency"])
-        cols = cleaned_data.select_dtypes(exclude="int").columns.to_list()
-        cleaned_data[cols] = cleaned_data[cols].astype("str")
-        cleaned_data = cleaned_data.replace(["None", "0", 0], np.nan)
-        return cleaned_data.dropna(how="all")
+def _traced_page(method: Callable) -> Callable:
+    """Records the load, render and total time of a page in the metrics."""
+
+    @functools.wraps(method)
+    def wrapper(self, **kwargs):
+        with metrics.page(method.__name__):
+            return method(self, **kwargs)
+
+    return wrapper
+
 
+class DashboardController:
+    def __init__(self, symbol: str, client: Optional[AlphaVantageClient] = None):
+        self.symbol = symbol
+        self._client = client
+
+    @property
+    def client(self) -> AlphaVantageClient:
+        """Returns the client, the process-wide one unless another was given."""
+        if self._client is None:
+            self._client = alpha_vantage.get_client()
+        return self._client
+
+    def _show_freshness(self, endpoint: str) -> None:
+        """Displays how fresh the endpoint's response shown for the symbol is."""
+        freshness = self.client.freshness(
+            alpha_vantage.Endpoints[endpoint], self.symbol
+        )
+        views.freshness_view(freshness)
+
+    @_traced_page
     def load_home_page(self, **kwargs):
         """Loads the home page of the dashboard.
 
@@ -38,9 +68,12 @@ class DashboardController:
 
         user_input = st.text_input("Enter company keywords that you are looking for")
         if user_input:
-            data = models.search(self.client, user_input, **kwargs)
-            views.search_results_view(user_input, data)
+            with metrics.phase("load"):
+                data = models.search(self.client, user_input, **kwargs)
+            with metrics.phase("render"):
+                views.search_results_view(user_input, data)
 
+    @_traced_page
     def load_company_info(self, **kwargs):
         """Loads the company information page of the dashboard.
 
@@ -48,9 +81,13 @@ class DashboardController:
             **kwargs: Keyword arguments to pass to the `models.company_info()` function.
         """
 
-        data: dict = models.company_info(self.client, self.symbol, **kwargs)
-        views.company_info_view(symbol=self.symbol, data=data)
+        with metrics.phase("load"):
+            data: dict = models.company_info(self.client, self.symbol, **kwargs)
+        with metrics.phase("render"):
+            views.company_info_view(symbol=self.symbol, data=data)
+            self._show_freshness("OVERVIEW")
 
+    @_traced_page
     def load_balance_sheet(self, **kwargs):
         """Loads the balance sheet page of the dashboard.
 
@@ -58,13 +95,20 @@ class DashboardController:
             **kwargs: Keyword arguments to pass to the `models.balance_sheet()` function.
         """
 
-        data: pd.DataFrame = models.balance_sheet(self.client, self.symbol, **kwargs)
-        views.balance_sheet_view(symbol=self.symbol, data=data)
+        with metrics.phase("load"):
+            statements: StatementSet = models.balance_sheet(
+                self.client, self.symbol, **kwargs
+            )
+        with metrics.phase("render"):
+            statement = statements.get(views.period_selector())
+            views.balance_sheet_view(symbol=self.symbol, data=statement.frame)
+            self._show_freshness("BALANCE_SHEET")
 
-        check_box = st.checkbox("Analyze Balance Sheet on Chart")
-        if check_box:
-            views.financial_assets_chart_view(self._clean_data_for_chart(data))
+            check_box = st.checkbox("Analyze Balance Sheet on Chart")
+            if check_box:
+                views.financial_assets_chart_view(statement.chart_frame, self.symbol)
 
+    @_traced_page
     def load_income_statement(self, **kwargs):
         """Loads the income statement page of the dashboard.
 
@@ -72,13 +116,20 @@ class DashboardController:
             **kwargs: Keyword arguments to pass to the `models.income_statement()` function.
         """
 
-        data: pd.DataFrame = models.income_statement(self.client, self.symbol, **kwargs)
-        views.income_statement_view(self.symbol, data)
+        with metrics.phase("load"):
+            statements: StatementSet = models.income_statement(
+                self.client, self.symbol, **kwargs
+            )
+        with metrics.phase("render"):
+            statement = statements.get(views.period_selector())
+            views.income_statement_view(self.symbol, statement.frame)
+            self._show_freshness("INCOME_STATEMENT")
 
-        check_box = st.checkbox("Analyze Income Statement on Chart")
-        if check_box:
-            views.financial_assets_chart_view(self._clean_data_for_chart(data))
+            check_box = st.checkbox("Analyze Income Statement on Chart")
+            if check_box:
+                views.financial_assets_chart_view(statement.chart_frame, self.symbol)
 
+    @_traced_page
     def load_cashflow(self, **kwargs):
         """Loads the cash flow page of the dashboard.
 
@@ -86,27 +137,71 @@ class DashboardController:
             **kwargs: Keyword arguments to pass to the `models.cash_flow()` function.
         """
 
-        data: pd.DataFrame = models.cash_flow(self.client, self.symbol, **kwargs)
-        views.cash_flow_view(self.symbol, data)
+        with metrics.phase("load"):
+            statements: StatementSet = models.cash_flow(
+                self.client, self.symbol, **kwargs
+            )
+        with metrics.phase("render"):
+            statement = statements.get(views.period_selector())
+            views.cash_flow_view(self.symbol, statement.frame)
+            self._show_freshness("CASH_FLOW")
 
-        check_box = st.checkbox("Analyze Cash Flow on Chart")
-        if check_box:
-            views.financial_assets_chart_view(self._clean_data_for_chart(data))
+            check_box = st.checkbox("Analyze Cash Flow on Chart")
+            if check_box:
+                views.financial_assets_chart_view(statement.chart_frame, self.symbol)
 
+    @_traced_page
     def load_quotes(self, **kwargs):
         """Loads the quotes page of the dashboard.
 
+        The table shows the latest quotes, the chart the full history, which
+        the date window and the downsampling of the chart cut down.
+
         Args:
             **kwargs: Keyword arguments to pass to the `models.quotes()` function.
         """
 
-        data: pd.DataFrame = models.quotes(self.client, self.symbol, **kwargs)
-        views.quotes_view(self.symbol, data)
+        with metrics.phase("load"):
+            data: pd.DataFrame = models.quotes(self.client, self.symbol, **kwargs)
+        with metrics.phase("render"):
+            views.quotes_view(self.symbol, data)
+            self._show_freshness("TIME_SERIES_DAILY")
+            check_box = st.checkbox("Analyze quotes chart")
 
-        check_box = st.checkbox("Analyze quotes chart")
         if check_box:
-            views.quotes_chart_view(data)
+            with metrics.phase("history"):
+                history: pd.DataFrame = models.quotes(
+                    self.client, self.symbol, return_full_history=True, **kwargs
+                )
+            with metrics.phase("chart"):
+                cache = indicators.get_indicator_cache()
+                chosen = [
+                    cache.get(self.symbol, history, name)
+                    for name in views.indicator_selector()
+                ]
+                views.quotes_chart_view(history, chosen, self.symbol)
+
+    @_traced_page
+    def load_earnings(self, **kwargs):
+        """Loads the earnings page with the EPS surprises and the price reactions to them.
 
+        Args:
+            **kwargs: Keyword arguments to pass to the `models.earnings_reactions()` function.
+        """
+
+        with metrics.phase("load"):
+            data: pd.DataFrame = models.earnings_reactions(
+                self.client, self.symbol, **kwargs
+            )
+        with metrics.phase("render"):
+            views.earnings_view(self.symbol, data)
+            self._show_freshness("EARNINGS")
+
+            check_box = st.checkbox("Analyze earnings on chart")
+            if check_box:
+                views.earnings_chart_view(data)
+
+    @_traced_page
     def load_kpis(self, **kwargs):
         """Loads the key performance indicators (KPIs) page of the dashboard.
 
@@ -114,5 +209,77 @@ class DashboardController:
             **kwargs: Keyword arguments to pass to the `models.kpis()` function.
         """
 
-        data: pd.DataFrame = models.kpis(self.client, self.symbol, **kwargs)
-        views.kpi_view(self.symbol, data)
+        with metrics.phase("load"):
+            data: pd.DataFrame = models.kpis(self.client, self.symbol, **kwargs)
+        with metrics.phase("render"):
+            views.kpi_view(self.symbol, data)
+            self._show_freshness("OVERVIEW")
+        with metrics.phase("ratios"):
+            period = views.period_selector()
+            ratios = models.ratios(self.client, self.symbol, period)
+            views.ratios_view(self.symbol, ratios)
+
+    @_traced_page
+    def load_screener(self, **kwargs):
+        """Loads the screener page comparing the companies of a watchlist.
+
+        Args:
+            **kwargs: Keyword arguments to pass to the `ScreenerTable.refresh()` method.
+        """
+
+        table = screener.get_screener()
+        symbols = views.watchlist_input(Settings.SCREENER_WATCHLIST)
+        with_statements = st.checkbox(
+            "Include statement ratios (three more requests per symbol)"
+        )
+        if st.button("Refresh watchlist"):
+            with metrics.phase("fetch"), st.spinner("Fetching the watchlist..."):
+                sent, failed = table.refresh(
+                    self.client, symbols, with_statements=with_statements, **kwargs
+                )
+            views.refresh_result_view(sent, failed)
+
+        with metrics.phase("render"):
+            watchlist = table.query(symbols)
+            query = views.screener_filters(watchlist, table.numeric_columns)
+            data = table.query(symbols, **query)
+            missing = [s for s in symbols if s not in watchlist.index]
+            views.screener_view(data, missing)
+
+    @_traced_page
+    def load_news(self, **kwargs):
+        """Loads the news page with the latest articles and sentiment of a watchlist.
+
+        Args:
+            **kwargs: Keyword arguments to pass to the `NewsStore.refresh()` method.
+        """
+
+        store = news.get_news_store()
+        symbols = views.watchlist_input(self.symbol.upper())
+        with metrics.phase("fetch"), st.spinner("Fetching the latest news..."):
+            store.refresh(
+                self.client,
+                symbols,
+                lookback=timedelta(days=Settings.NEWS_LOOKBACK_DAYS),
+                page_size=Settings.NEWS_PAGE_SIZE,
+                **kwargs,
+            )
+        with metrics.phase("render"):
+            views.sentiment_chart_view(store.daily_sentiment(symbols))
+            views.news_view(store.feed(symbols))
+
+    @_traced_page
+    def load_market_movers(self, **kwargs):
+        """Loads the market movers page from the process-wide snapshot.
+
+        An expired snapshot is refreshed by a background thread while the page
+        shows the previous one, the page never waits for the API.
+
+        Args:
+            **kwargs: Not used, pages are called with the same arguments.
+        """
+
+        with metrics.phase("load"):
+            snapshot = movers.get_movers_feed().get(self.client)
+        with metrics.phase("render"):
+            views.market_movers_view(snapshot)
@@ -3,8 +3,17 @@ from typing import Any
 import pandas as pd
 import streamlit as st
 
+from fin_streamlit import metrics
 from fin_streamlit.clients.alpha_vantage import AlphaVantageClient
-from fin_streamlit.utils import _prepare_statement_df
+from fin_streamlit.earnings import (
+    earnings_reactions as compute_earnings_reactions,
+)
+from fin_streamlit.parsers import parse_time_series, records_to_frame
+from fin_streamlit.quote_store import COMPACT_OUTPUT_SIZE, get_quote_store
+from fin_streamlit.ratios import get_ratio_cache
+from fin_streamlit.settings import Settings
+from fin_streamlit.statements import Period, StatementSet
+from fin_streamlit.symbol_index import get_symbol_index
 
 COMPANY_BASIC_INFORMATION = [
     "Exchange",
@@ -19,7 +28,7 @@ COMPANY_BASIC_INFORMATION = [
 ]
 
 
-@st.cache_data
+@st.cache_data(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
 def _company_info(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> dict:
     """Gets an overview of a company, cached in Streamlit.
 
@@ -31,11 +40,12 @@ def _company_info(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> di
     Returns:
         A dictionary containing the company overview.
     """
-    data = _client.get_company_overview(symbol, **kwargs)
+    with metrics.phase("fetch"):
+        data = _client.get_company_overview(symbol, **kwargs)
     return data
 
 
-@st.cache_data
+@st.cache_data(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
 def company_info(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> dict:
     """Gets an overview of a company, cached in Streamlit
 
@@ -57,11 +67,16 @@ def company_info(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> dic
     }
 
 
-@st.cache_data
+@st.cache_resource(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
 def balance_sheet(
     _client: AlphaVantageClient, symbol: str, **kwargs: Any
-) -> pd.DataFrame:
-    """Gets the balance sheet for a company, cached in Streamlit, and returns a Pandas DataFrame.
+) -> StatementSet:
+    """Gets the balance sheets for a company, shared by all sessions, and returns a StatementSet.
+
+    The statements are cached as resources rather than data, so every rerun
+    gets the same objects and the frames they derive lazily are built once,
+    where `st.cache_data` would unpickle a fresh copy with empty caches. The
+    statements are shared, so they must not be modified.
 
     Args:
         _client: An AlphaVantageClient.
@@ -69,17 +84,19 @@ def balance_sheet(
         **kwargs: Additional parameters to pass to the API.
 
     Returns:
-        A Pandas DataFrame containing the company's balance sheet data.
+        A StatementSet of the company's annual and quarterly balance sheets.
     """
-    data: dict = _client.get_balance_sheet(symbol=symbol, **kwargs).get("annualReports")
-    return _prepare_statement_df(data)
+    with metrics.phase("fetch"):
+        data: dict = _client.get_balance_sheet(symbol=symbol, **kwargs)
+    with metrics.phase("parse"):
+        return StatementSet.from_payload(data)
 
 
-@st.cache_data
+@st.cache_resource(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
 def income_statement(
     _client: AlphaVantageClient, symbol: str, **kwargs: Any
-) -> pd.DataFrame:
-    """Gets the income statement for a company, cached in Streamlit, and returns a Pandas DataFrame.
+) -> StatementSet:
+    """Gets the income statements for a company, shared by all sessions, and returns a StatementSet.
 
     Args:
         _client: An AlphaVantageClient.
@@ -87,15 +104,17 @@ def income_statement(
         **kwargs: Additional parameters to pass to the API.
 
     Returns:
-        A Pandas DataFrame containing the company's income statement data.
+        A StatementSet of the company's annual and quarterly income statements.
     """
-    data: dict = _client.get_income_statement(symbol, **kwargs).get("annualReports")
-    return _prepare_statement_df(data)
+    with metrics.phase("fetch"):
+        data: dict = _client.get_income_statement(symbol, **kwargs)
+    with metrics.phase("parse"):
+        return StatementSet.from_payload(data)
 
 
-@st.cache_data
-def cash_flow(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> pd.DataFrame:
-    """Gets the cash flow for a company, cached in Streamlit, and returns a Pandas DataFrame.
+@st.cache_resource(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
+def cash_flow(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> StatementSet:
+    """Gets the cash flows for a company, shared by all sessions, and returns a StatementSet.
 
     Args:
         _client: An AlphaVantageClient.
@@ -103,15 +122,17 @@ def cash_flow(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> pd.Dat
         **kwargs: Additional parameters to pass to the API.
 
     Returns:
-        A Pandas DataFrame containing the company's cash flow data.
+        A StatementSet of the company's annual and quarterly cash flows.
     """
-    data: dict = _client.get_cash_flow(symbol, **kwargs).get("annualReports")
-    return _prepare_statement_df(data)
+    with metrics.phase("fetch"):
+        data: dict = _client.get_cash_flow(symbol, **kwargs)
+    with metrics.phase("parse"):
+        return StatementSet.from_payload(data)
 
 
-@st.cache_data
-def quotes(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> pd.DataFrame:
-    """Gets the daily quotes for a company, cached in Streamlit, and returns a Pandas DataFrame.
+@st.cache_resource(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
+def earnings(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> StatementSet:
+    """Gets the earnings (EPS) of a company, shared by all sessions, and returns a StatementSet.
 
     Args:
         _client: An AlphaVantageClient.
@@ -119,16 +140,47 @@ def quotes(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> pd.DataFr
         **kwargs: Additional parameters to pass to the API.
 
     Returns:
-        A Pandas DataFrame containing the company's daily quote data.
+        A StatementSet of the company's annual and quarterly earnings, the
+        quarterly ones with the estimated EPS, surprise and report date.
     """
-    data: dict = _client.get_time_series_daily(symbol, **kwargs)
-    data = data.get("Time Series (Daily)")
-    df = pd.DataFrame(data).T.reset_index()
-    df.columns = ["Date", "Open", "High", "Low", "Close", "Volume"]
-    return df
+    with metrics.phase("fetch"):
+        data: dict = _client.get_earnings(symbol, **kwargs)
+    with metrics.phase("parse"):
+        return StatementSet.from_payload(data, "annualEarnings", "quarterlyEarnings")
 
 
-@st.cache_data
+@st.cache_data(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
+def quotes(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> pd.DataFrame:
+    """Gets the daily quotes for a company, cached in Streamlit, and returns a Pandas DataFrame.
+
+    When the quote store is enabled the history is kept on disk and only
+    the latest bars are requested from the API.
+
+    Args:
+        _client: An AlphaVantageClient.
+        symbol: The symbol of the company to query.
+        **kwargs: Additional parameters to pass to the API.
+
+    Returns:
+        A Pandas DataFrame containing the company's daily OHLCV data, indexed by date.
+    """
+    if Settings.QUOTE_STORE_ENABLED:
+        return_full_history = kwargs.pop("return_full_history", False)
+        with metrics.phase("fetch"):
+            records = get_quote_store().refresh(
+                _client, symbol, return_full_history=return_full_history, **kwargs
+            )
+        if not return_full_history:
+            records = records[-COMPACT_OUTPUT_SIZE:]
+        with metrics.phase("parse"):
+            return records_to_frame(records)
+    with metrics.phase("fetch"):
+        data: dict = _client.get_time_series_daily(symbol, **kwargs)
+    with metrics.phase("parse"):
+        return parse_time_series(data)
+
+
+@st.cache_data(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
 def kpis(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> pd.DataFrame:
     """Gets the key performance indicators (KPIs) for a company, cached in Streamlit,
     and returns a Pandas DataFrame.
@@ -161,19 +213,84 @@ def kpis(_client: AlphaVantageClient, symbol: str, **kwargs: Any) -> pd.DataFram
     return df
 
 
+@st.cache_data(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
+def ratios(_client: AlphaVantageClient, symbol: str, period: Period) -> pd.DataFrame:
+    """Gets the financial ratios of a company derived from its three statements, cached in Streamlit.
+
+    The ratios are also memoized by statement version, so they are only
+    derived again when a statement changes.
+
+    Args:
+        _client: An AlphaVantageClient.
+        symbol: The symbol of the company to query.
+        period: The reporting period of the statements.
+
+    Returns:
+        A Pandas DataFrame with a column per ratio, indexed by ascending fiscal date.
+    """
+    statements = {
+        "balance_sheet": balance_sheet(_client, symbol).get(period),
+        "income_statement": income_statement(_client, symbol).get(period),
+        "cash_flow": cash_flow(_client, symbol).get(period),
+    }
+    with metrics.phase("derive"):
+        return get_ratio_cache().get(symbol, period.value, **statements)
+
+
+@st.cache_data(ttl=Settings.MODEL_CACHE_TTL_SECONDS)
+def earnings_reactions(_client: AlphaVantageClient, symbol: str) -> pd.DataFrame:
+    """Gets the quarterly earnings of a company joined with the price reactions to them, cached in Streamlit.
+
+    Args:
+        _client: An AlphaVantageClient.
+        symbol: The symbol of the company to query.
+
+    Returns:
+        A Pandas DataFrame of the EPS, surprise and reactions per report, newest first.
+    """
+    statements = earnings(_client, symbol)
+    data = quotes(_client, symbol, return_full_history=True)
+    return compute_earnings_reactions(statements.quarterly, data)
+
+
 @st.cache_data
+def _search_matches(_client: AlphaVantageClient, keywords: str, **kwargs) -> list:
+    """Gets the best-matching symbols from the API and adds them to the local index.
+
+    Cached in Streamlit, so keywords the local index has no match for are
+    only sent to the API once.
+
+    Args:
+        _client: An AlphaVantageClient.
+        keywords: query keyword to search for.
+        **kwargs: Additional parameters to pass to the API.
+
+    Returns:
+        The best matches of the API, empty if there are none.
+    """
+    with metrics.phase("fetch"):
+        results = _client.get_search_results(keywords, **kwargs).get("bestMatches")
+    get_symbol_index().add_matches(results or [])
+    return results or []
+
+
 def search(_client: AlphaVantageClient, keywords: str, **kwargs) -> pd.DataFrame:
     """Gets the best-matching symbols and market information
     based on provided keywords
 
+    The local symbol index answers first, the API is only called when it
+    has no match, and its results are added to the index.
+
     Args:
         _client: An AlphaVantageClient.
         keywords: query keyword to search for.
         **kwargs: Additional parameters to pass to the API.
 
         Returns:
-            A Pandas DataFrame containing the company's KPI data.
+            A Pandas DataFrame containing the best-matching symbols.
 
     """
-    results = _client.get_search_results(keywords, **kwargs).get("bestMatches")
+    results = get_symbol_index().search(keywords)
+    if not results:
+        results = _search_matches(_client, keywords, **kwargs)
     return pd.DataFrame(results)
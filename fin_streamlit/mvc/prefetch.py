@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from fin_streamlit.clients.alpha_vantage import AlphaVantageClient
+from fin_streamlit.clients.rate_limit import Priority, request_priority
+from fin_streamlit.log import get_logger
+from fin_streamlit.mvc import models
+from fin_streamlit.settings import Settings
+from fin_streamlit.statements import Period
+
+logger = get_logger(__name__)
+
+
+def annual_ratios(client: AlphaVantageClient, symbol: str) -> pd.DataFrame:
+    """Loads the ratios of the annual statements, the ones the KPIs page shows first."""
+    return models.ratios(client, symbol, Period.ANNUAL)
+
+
+DEFAULT_LOADERS = (
+    models.company_info,
+    models.kpis,
+    models.balance_sheet,
+    models.income_statement,
+    models.cash_flow,
+    models.quotes,
+    models.earnings_reactions,
+    annual_ratios,
+)
+
+_default_prefetcher: Optional["Prefetcher"] = None
+_default_prefetcher_lock = threading.Lock()
+
+
+class Prefetcher:
+    """Warms the model caches of a symbol on a background thread.
+
+    The loaders are the cached model functions, so once a symbol is warmed
+    switching between the pages of the dashboard doesn't hit the API. Requests
+    are sent with background priority, so they never delay interactive ones.
+
+    Attributes
+    ----------
+    loaders : Sequence[Callable]
+        The model functions called with (client, symbol) for every symbol.
+    refresh_after : float
+        How long, in seconds, a warmed symbol is not prefetched again.
+    """
+
+    def __init__(
+        self,
+        loaders: Sequence[Callable[[AlphaVantageClient, str], Any]] = DEFAULT_LOADERS,
+        refresh_after: float = 600.0,
+    ) -> None:
+        self.loaders = loaders
+        self.refresh_after = refresh_after
+        self._queue: "queue.Queue[Tuple[AlphaVantageClient, str]]" = queue.Queue()
+        self._submitted: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(pending={self._queue.qsize()})"
+
+    def submit(self, client: AlphaVantageClient, symbol: str) -> bool:
+        """Schedules the symbol to be prefetched, unless it was warmed recently.
+
+        Args:
+            client: The client used to fetch the data.
+            symbol: The symbol exactly as it is passed to the models.
+
+        Returns:
+            True if the symbol was scheduled, False if it was skipped.
+        """
+        now = time.monotonic()
+        with self._lock:
+            submitted_at = self._submitted.get(symbol)
+            if submitted_at is not None and now - submitted_at < self.refresh_after:
+                return False
+            self._submitted[symbol] = now
+            self._ensure_worker()
+        self._queue.put((client, symbol))
+        return True
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="fin-streamlit-prefetch", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            client, symbol = self._queue.get()
+            try:
+                self.warm(client, symbol)
+            finally:
+                self._queue.task_done()
+
+    def warm(self, client: AlphaVantageClient, symbol: str) -> None:
+        """Calls every loader for the symbol with background priority.
+
+        Args:
+            client: The client used to fetch the data.
+            symbol: The symbol exactly as it is passed to the models.
+        """
+        started = time.perf_counter()
+        with request_priority(Priority.BACKGROUND):
+            for loader in self.loaders:
+                try:
+                    loader(client, symbol)
+                except Exception as e:
+                    logger.warning(
+                        "couldn't prefetch %s for %s: %s", loader.__name__, symbol, e
+                    )
+        logger.debug("prefetched %s in %.2fs", symbol, time.perf_counter() - started)
+
+    def join(self) -> None:
+        """Blocks until all scheduled symbols are prefetched."""
+        self._queue.join()
+
+
+def get_prefetcher() -> Prefetcher:
+    """Returns the process-wide prefetcher.
+
+    Returns:
+        The shared Prefetcher.
+    """
+    global _default_prefetcher  # pylint: disable=global-statement
+    with _default_prefetcher_lock:
+        if _default_prefetcher is None:
+            _default_prefetcher = Prefetcher(
+                refresh_after=Settings.PREFETCH_REFRESH_SECONDS
+            )
+        return _default_prefetcher
@@ -1,7 +1,28 @@
-import pandas as pd
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
 import streamlit as st
 
-from fin_streamlit.charts import get_barchart, get_candle_chart
+from fin_streamlit.lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from fin_streamlit.clients.cache import Freshness
+    from fin_streamlit.indicators import IndicatorResult
+    from fin_streamlit.movers import MoversSnapshot
+    from fin_streamlit.statements import Period
+else:
+    pd = lazy_import("pandas")
+
+charts = lazy_import("fin_streamlit.charts")
+figure_cache = lazy_import("fin_streamlit.figure_cache")
+indicators_module = lazy_import("fin_streamlit.indicators")
+movers = lazy_import("fin_streamlit.movers")
+ratios_module = lazy_import("fin_streamlit.ratios")
+statements = lazy_import("fin_streamlit.statements")
 
 
 def _write_view(symbol: str, header: str, data: pd.DataFrame) -> None:
@@ -87,6 +108,17 @@ def company_info_view(symbol: str, data: dict) -> None:
         st.write(f"* {k}: {v}")
 
 
+def period_selector() -> Period:
+    """Displays a selector of the reporting period of the financial statements.
+
+    Returns:
+        The chosen Period.
+    """
+    periods = statements.Period
+    chosen = st.radio("Reporting period", [p.value for p in periods], horizontal=True)
+    return periods(chosen)
+
+
 def balance_sheet_view(symbol: str, data: pd.DataFrame) -> None:
     """Displays the balance sheet page of the Streamlit app.
 
@@ -122,9 +154,9 @@ def quotes_view(symbol: str, data: pd.DataFrame) -> None:
 
     Args:
         symbol: The symbol of the company to display.
-        data: A pd.DataFrame containing the quotes data.
+        data: A pd.DataFrame containing the quotes data, indexed by date.
     """
-    _write_view(symbol, "Daily Quotes", data)
+    _write_view(symbol, "Daily Quotes", data.iloc[::-1])
 
 
 def kpi_view(symbol: str, data: pd.DataFrame) -> None:
@@ -137,27 +169,318 @@ def kpi_view(symbol: str, data: pd.DataFrame) -> None:
     _write_view(symbol, "KPI's", data)
 
 
-def quotes_chart_view(data: pd.DataFrame) -> None:
-    """Displays a candle chart of the quotes data.
+def ratios_view(symbol: str, data: pd.DataFrame) -> None:
+    """Displays the financial ratios derived from the statements, newest fiscal date first.
+
+    Args:
+        symbol: The symbol of the company to display.
+        data: The ratios with a column per ratio, indexed by ascending fiscal date.
+    """
+    st.subheader(f"*{symbol} Financial Ratios*")
+    if data.empty:
+        st.info("There are no statements to derive the ratios from")
+        return
+    frame = data.iloc[::-1].T
+    frame.columns = frame.columns.strftime("%Y-%m-%d")
+    amounts = [r for r in ratios_module.AMOUNT_RATIOS if r in frame.index]
+    fractions = [r for r in frame.index if r not in amounts]
+    st.dataframe(
+        frame.style.format(
+            "{:.2%}", subset=pd.IndexSlice[fractions, :], na_rep="-"
+        ).format("{:,.0f}", subset=pd.IndexSlice[amounts, :], na_rep="-")
+    )
+
+
+def date_window_selector(start: date, end: date) -> Tuple[date, date]:
+    """Displays a slider to choose the window of dates to chart.
+
+    Args:
+        start: The first date that can be chosen.
+        end: The last date that can be chosen.
+
+    Returns:
+        The first and last date of the chosen window.
+    """
+    if start >= end:
+        return start, end
+    return st.slider("Date range", min_value=start, max_value=end, value=(start, end))
+
+
+def indicator_selector() -> List[str]:
+    """Displays a multiselect of the technical indicators to draw on the quotes chart.
+
+    Returns:
+        The names of the chosen indicators.
+    """
+    return st.multiselect("Indicators", list(indicators_module.INDICATORS))
+
+
+def quotes_chart_view(
+    data: pd.DataFrame, indicators: Sequence[IndicatorResult] = (), symbol: str = ""
+) -> None:
+    """Displays a candle chart of the quotes data within the chosen window of dates.
 
     Args:
-        data: A Pandas DataFrame containing the quotes data.
+        data: A Pandas DataFrame containing the quotes data, indexed by ascending date.
+        indicators: The indicators of the quotes to draw along with the candles.
+        symbol: The symbol of the quotes, part of the key of the cached figure.
     """
 
-    fig = get_candle_chart(data)
+    if data.empty:
+        st.info("There are no quotes to analyze on the chart")
+        return
+
+    start, end = date_window_selector(data.index[0].date(), data.index[-1].date())
+    key = (
+        symbol.upper(),
+        figure_cache.frame_version(data),
+        "candle",
+        start,
+        end,
+        tuple(column for result in indicators for column in result.frame.columns),
+    )
+    fig = figure_cache.get_figure_cache().figure(
+        key,
+        lambda: charts.get_candle_chart(
+            data.loc[pd.Timestamp(start) : pd.Timestamp(end)], indicators=indicators
+        ),
+    )
     st.plotly_chart(figure_or_data=fig)
 
 
-def financial_assets_chart_view(data: pd.DataFrame) -> None:
+def financial_assets_chart_view(data: pd.DataFrame, symbol: str = "") -> None:
     """Displays a bar chart of the financial assets data.
 
     Args:
         data: A Pandas DataFrame containing the financial assets data.
+        symbol: The symbol of the statement, part of the key of the cached figure.
     """
 
+    if data.empty:
+        st.info("There is no data to analyze on the chart")
+        return
+
     categories = data.index.to_list()
     chosen_category = st.selectbox(
         "What category, do you want to analyze ? ", categories
     )
-    fig = get_barchart(data, chosen_category)
+    key = (symbol.upper(), figure_cache.frame_version(data), "bar", chosen_category)
+    fig = figure_cache.get_figure_cache().figure(
+        key, lambda: charts.get_barchart(data, chosen_category)
+    )
     st.plotly_chart(figure_or_data=fig)
+
+
+def diagnostics_view(page: str, phases: dict, endpoints: list, requests: list) -> None:
+    """Displays where the time of the last run of a page went, in the sidebar.
+
+    Args:
+        page: The name of the page that was rendered.
+        phases: The duration in seconds of each phase of the last run of the page.
+        endpoints: The per-endpoint request summary of the process.
+        requests: The traces of the latest client requests, newest first.
+    """
+    with st.sidebar.expander("Diagnostics"):
+        st.caption(f"Last run of {page}")
+        st.dataframe(
+            pd.DataFrame(
+                {"phase": list(phases), "ms": [1e3 * v for v in phases.values()]}
+            ),
+            hide_index=True,
+        )
+        st.caption("Requests per endpoint")
+        st.dataframe(pd.DataFrame(endpoints), hide_index=True)
+        st.caption("Latest requests")
+        st.dataframe(pd.DataFrame(requests), hide_index=True)
+
+
+def watchlist_input(default: str) -> List[str]:
+    """Displays a text area for the symbols of the watchlist.
+
+    Args:
+        default: The comma separated symbols shown initially.
+
+    Returns:
+        The upper case symbols of the watchlist, without duplicates.
+    """
+    text = st.text_area("Watchlist (comma separated symbols)", value=default)
+    symbols = (s.strip().upper() for s in text.replace("\n", ",").split(","))
+    return list(dict.fromkeys(s for s in symbols if s))
+
+
+def screener_filters(data: pd.DataFrame, numeric_columns: List[str]) -> dict:
+    """Displays the sector, range and sort controls of the screener.
+
+    Args:
+        data: The screener table the controls are built for.
+        numeric_columns: The columns that can be filtered by range and sorted by.
+
+    Returns:
+        The keyword arguments of `ScreenerTable.query` the controls select.
+    """
+    sectors = []
+    if "Sector" in data:
+        sectors = st.multiselect(
+            "Sectors", sorted(data["Sector"].dropna().unique().tolist())
+        )
+    ranges = {}
+    for column in st.multiselect("Filter by", numeric_columns):
+        values = data[column].dropna()
+        if values.empty or values.min() == values.max():
+            continue
+        low, high = float(values.min()), float(values.max())
+        ranges[column] = st.slider(column, low, high, (low, high))
+    sort_by = st.selectbox("Sort by", ["", *numeric_columns])
+    ascending = st.checkbox("Ascending")
+    return {
+        "sectors": sectors,
+        "ranges": ranges,
+        "sort_by": sort_by or None,
+        "ascending": ascending,
+    }
+
+
+def screener_view(data: pd.DataFrame, missing: List[str]) -> None:
+    """Displays the screened companies.
+
+    Args:
+        data: The rows of the screener table matching the filters.
+        missing: The symbols of the watchlist that are not in the table yet.
+    """
+    st.subheader("*Screener*")
+    if missing:
+        st.info(
+            f"No data yet for {', '.join(missing)}, refresh the watchlist to fetch it"
+        )
+    st.dataframe(data)
+
+
+def refresh_result_view(sent: int, failed: int) -> None:
+    """Displays how many requests a refresh of the watchlist took."""
+    if not sent:
+        st.caption("Everything is up to date")
+    elif failed:
+        st.warning(f"{failed} of {sent} requests failed, try again later")
+    else:
+        st.caption(f"Fetched {sent} responses")
+
+
+def earnings_view(symbol: str, data: pd.DataFrame) -> None:
+    """Displays the quarterly earnings with the price reactions to their reports.
+
+    Args:
+        symbol: The symbol of the company.
+        data: The EPS, surprise and reactions per report, see `models.earnings_reactions`.
+    """
+    st.subheader(f"*{symbol} Earnings*")
+    if data.empty:
+        st.info("There are no earnings reports")
+        return
+    reactions = [c for c in data.columns if c.startswith("Reaction")]
+    st.dataframe(
+        data.style.format(
+            {**{c: "{:+.2%}" for c in reactions}, "surprisePercentage": "{:+.2f}%"},
+            na_rep="-",
+        )
+    )
+
+
+def earnings_chart_view(data: pd.DataFrame) -> None:
+    """Displays the reported vs estimated EPS and the price reactions to the surprises.
+
+    Args:
+        data: The EPS, surprise and reactions per report, see `models.earnings_reactions`.
+    """
+    reactions = [c for c in data.columns if c.startswith("Reaction")]
+    if data.empty or not reactions:
+        return
+    st.plotly_chart(figure_or_data=charts.get_eps_chart(data))
+    horizon = st.selectbox("Reaction after", reactions)
+    st.plotly_chart(figure_or_data=charts.get_reaction_chart(data, horizon))
+
+
+def market_movers_view(snapshot: Optional[MoversSnapshot]) -> None:
+    """Displays the top gainers, losers and most traded tickers side by side.
+
+    Args:
+        snapshot: The shared snapshot of the market movers, None if there is none yet.
+    """
+    st.subheader("*Market Movers*")
+    if snapshot is None:
+        st.info("The market movers are not available yet, try again in a moment")
+        return
+    st.caption(
+        f"Last updated {snapshot.last_updated}, "
+        f"fetched at {datetime.fromtimestamp(snapshot.fetched_at):%H:%M:%S}"
+    )
+    column_config = {
+        "price": st.column_config.NumberColumn("Price", format="%.2f"),
+        "change_amount": st.column_config.NumberColumn("Change", format="%+.2f"),
+        "change_percentage": st.column_config.NumberColumn(
+            "Change %", format="%+.2f%%"
+        ),
+        "volume": st.column_config.NumberColumn("Volume", format="%d"),
+    }
+    for column, (key, title) in zip(
+        st.columns(len(movers.MOVER_LISTS)), movers.MOVER_LISTS.items()
+    ):
+        with column:
+            st.markdown(f"**{title}**")
+            st.dataframe(snapshot.tables[key], column_config=column_config)
+
+
+def news_view(data: pd.DataFrame) -> None:
+    """Displays the latest articles of the watchlist.
+
+    Args:
+        data: The articles, newest first, see `NewsStore.feed`.
+    """
+    st.subheader("*News*")
+    if data.empty:
+        st.info("No news for the watchlist yet")
+        return
+    for row in data.itertuples():
+        st.markdown(f"**[{row.title}]({row.url})**")
+        st.caption(
+            f"{row.published:%Y-%m-%d %H:%M} · {row.source} · {row.ticker} "
+            f"sentiment {row.ticker_score:+.2f} · {row.label}"
+        )
+
+
+def sentiment_chart_view(data: pd.DataFrame) -> None:
+    """Displays the daily news sentiment of every symbol of the watchlist.
+
+    Args:
+        data: The mean sentiment per day (rows) and symbol (columns).
+    """
+    if data.empty:
+        return
+    st.subheader("*Daily news sentiment*")
+    st.line_chart(data)
+
+
+def _format_age(seconds: float) -> str:
+    """Formats an age in seconds as e.g. `5 min` or `3 h`."""
+    for unit, length in (("d", 86400), ("h", 3600), ("min", 60)):
+        if seconds >= length:
+            return f"{int(seconds // length)} {unit}"
+    return "<1 min"
+
+
+def freshness_view(freshness: Optional[Freshness]) -> None:
+    """Displays when the data on the page was fetched and whether it is being refreshed.
+
+    Args:
+        freshness: The Freshness of the response the page shows, nothing is shown if None.
+    """
+    if freshness is None:
+        return
+    fetched_at = datetime.fromtimestamp(freshness.fetched_at)
+    caption = (
+        f"Data as of {fetched_at:%Y-%m-%d %H:%M} ({_format_age(freshness.age)} old)"
+    )
+    if freshness.revalidating:
+        caption += ", refreshing in the background, rerun to see the update"
+    elif freshness.stale:
+        caption += ", could not be refreshed"
+    st.caption(caption)
@@ -0,0 +1,367 @@
+"""News and sentiment of a watchlist, ingested incrementally from NEWS_SENTIMENT.
+
+Each symbol keeps a cursor at the newest article seen so far, a refresh only
+asks for the articles published after it, page by page, and stores them as
+they arrive. Articles are de-duplicated by the hash of their url and only the
+fields the News page shows are kept.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from fin_streamlit.clients.alpha_vantage import ENDPOINT_CACHE_TTL, Endpoints
+from fin_streamlit.clients.utils import is_valid_payload
+from fin_streamlit.exc import NewsUnavailable
+from fin_streamlit.log import get_logger
+from fin_streamlit.settings import Settings
+
+logger = get_logger(__name__)
+
+# format of `time_published` and of the `time_from`/`time_to` parameters
+PUBLISHED_FORMAT = "%Y%m%dT%H%M%S"
+WINDOW_FORMAT = "%Y%m%dT%H%M"
+NEWS_REFRESH_INTERVAL = ENDPOINT_CACHE_TTL[Endpoints.NEWS_SENTIMENT]
+
+_default_store: Optional["NewsStore"] = None
+_default_store_lock = threading.Lock()
+
+
+def url_hash(url: str) -> str:
+    """Returns the key articles are de-duplicated by."""
+    return hashlib.sha1(url.strip().encode()).hexdigest()[:16]
+
+
+def utcnow() -> datetime:
+    """Returns the current time as a naive UTC datetime, like the times of the feed."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class TickerSentiment:
+    """Sentiment of an article towards one ticker."""
+
+    ticker: str
+    relevance: Optional[float]
+    score: Optional[float]
+
+
+@dataclass(frozen=True)
+class Article:
+    """The fields of a NEWS_SENTIMENT feed item the News page shows."""
+
+    key: str
+    url: str
+    title: str
+    source: str
+    published: str
+    summary: str
+    score: Optional[float]
+    label: str
+    tickers: Tuple[TickerSentiment, ...] = ()
+
+    @classmethod
+    def from_item(cls, item: dict) -> "Article":
+        """Builds an Article out of an item of the `feed` list."""
+        url = str(item.get("url", ""))
+        return cls(
+            key=url_hash(url),
+            url=url,
+            title=str(item.get("title", "")),
+            source=str(item.get("source", "")),
+            published=str(item.get("time_published", "")),
+            summary=str(item.get("summary", "")),
+            score=_float(item.get("overall_sentiment_score")),
+            label=str(item.get("overall_sentiment_label", "")),
+            tickers=tuple(
+                TickerSentiment(
+                    str(t.get("ticker", "")).upper(),
+                    _float(t.get("relevance_score")),
+                    _float(t.get("ticker_sentiment_score")),
+                )
+                for t in item.get("ticker_sentiment", ())
+            ),
+        )
+
+
+def parse_feed(payload: dict) -> Iterator[Article]:
+    """Yields the articles of a NEWS_SENTIMENT response one at a time.
+
+    Items without a url or publication time are skipped.
+
+    Args:
+        payload: The decoded response of `get_market_news_sentiment`.
+
+    Yields:
+        The Articles in the order of the feed.
+    """
+    for item in payload.get("feed", ()):
+        if item.get("url") and item.get("time_published"):
+            yield Article.from_item(item)
+
+
+def iter_news(
+    client: Any,
+    symbol: str,
+    since: datetime,
+    *,
+    until: Optional[datetime] = None,
+    page_size: int = 200,
+    max_pages: int = 5,
+) -> Iterator[List[Article]]:
+    """Pages through the news of a symbol published in a time window, oldest first.
+
+    Every page asks for the articles published from the newest one of the
+    previous page on, paging stops at the first page that is not full.
+
+    Args:
+        client: An AlphaVantageClient.
+        symbol: The symbol of the company.
+        since: The start of the window, in UTC.
+        until: The end of the window in UTC, open-ended by default.
+        page_size: The number of articles requested per call, at most 1000.
+        max_pages: The maximum number of calls.
+
+    Yields:
+        The articles of each page.
+
+    Raises:
+        NewsUnavailable: If a call failed or was answered with an error message.
+    """
+    window = {"time_to": until.strftime(WINDOW_FORMAT)} if until else {}
+    time_from = since.strftime(WINDOW_FORMAT)
+    for _ in range(max_pages):
+        payload = client.get_market_news_sentiment(
+            symbol, limit=page_size, sort="EARLIEST", time_from=time_from, **window
+        )
+        if not is_valid_payload(payload) or "feed" not in payload:
+            raise NewsUnavailable(f"no news response for {symbol}: {payload}")
+        page = list(parse_feed(payload))
+        if not page:
+            return
+        yield page
+        newest = max(article.published for article in page)[: len(time_from)]
+        if len(page) < page_size or newest <= time_from:
+            return
+        time_from = newest
+
+
+class NewsStore:
+    """Articles and their ticker sentiment in a SQLite database.
+
+    Attributes
+    ----------
+    path : str
+        The location of the SQLite database file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "key TEXT PRIMARY KEY, url TEXT NOT NULL, title TEXT, source TEXT, "
+                "published TEXT NOT NULL, summary TEXT, score REAL, label TEXT);"
+                "CREATE INDEX IF NOT EXISTS articles_published ON articles (published);"
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                "key TEXT NOT NULL, ticker TEXT NOT NULL, relevance REAL, score REAL, "
+                "PRIMARY KEY (ticker, key)) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS cursors ("
+                "symbol TEXT PRIMARY KEY, published TEXT, refreshed_at REAL);"
+            )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    def add(self, articles: Iterable[Article]) -> int:
+        """Stores the articles that are not stored yet.
+
+        Args:
+            articles: The articles to store.
+
+        Returns:
+            The number of new articles.
+        """
+        added = 0
+        with self._lock, self._connection:
+            for article in articles:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        article.key,
+                        article.url,
+                        article.title,
+                        article.source,
+                        article.published,
+                        article.summary,
+                        article.score,
+                        article.label,
+                    ),
+                )
+                if not cursor.rowcount:
+                    continue
+                added += 1
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO sentiment VALUES (?, ?, ?, ?)",
+                    [
+                        (article.key, t.ticker, t.relevance, t.score)
+                        for t in article.tickers
+                    ],
+                )
+        return added
+
+    def cursor(self, symbol: str) -> Tuple[Optional[str], Optional[float]]:
+        """Returns the newest publication time seen for the symbol and when it was last refreshed."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT published, refreshed_at FROM cursors WHERE symbol = ?",
+                (symbol.upper(),),
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def _set_cursor(
+        self, symbol: str, published: Optional[str], refreshed_at: Optional[float]
+    ) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)",
+                (symbol.upper(), published, refreshed_at),
+            )
+
+    def stale(self, symbols: Iterable[str], max_age: timedelta) -> List[str]:
+        """Returns the symbols whose news were refreshed longer than max_age ago."""
+        expired = time.time() - max_age.total_seconds()
+        return [
+            symbol
+            for symbol in dict.fromkeys(s.strip().upper() for s in symbols)
+            if symbol and (self.cursor(symbol)[1] or 0.0) < expired
+        ]
+
+    def refresh(
+        self,
+        client: Any,
+        symbols: Iterable[str],
+        *,
+        max_age: timedelta = NEWS_REFRESH_INTERVAL,
+        lookback: timedelta = timedelta(days=7),
+        page_size: int = 200,
+        max_pages: int = 5,
+    ) -> Dict[str, int]:
+        """Fetches the news published since the last refresh of every stale symbol.
+
+        Symbols that were never refreshed get the news of the lookback period,
+        every page is stored as soon as it arrives. A symbol only counts as
+        refreshed once every call succeeded, so failed ones are retried on the
+        next refresh from the newest article stored.
+
+        Args:
+            client: An AlphaVantageClient.
+            symbols: The symbols of the watchlist.
+            max_age: Symbols refreshed more recently than this are skipped.
+            lookback: How far back to go for a new symbol.
+            page_size: The number of articles requested per call.
+            max_pages: The maximum number of calls per symbol.
+
+        Returns:
+            The number of new articles by refreshed symbol.
+        """
+        added = {}
+        for symbol in self.stale(symbols, max_age):
+            published, refreshed_at = self.cursor(symbol)
+            since = (
+                datetime.strptime(published, PUBLISHED_FORMAT)
+                if published
+                else utcnow() - lookback
+            )
+            added[symbol] = 0
+            try:
+                for page in iter_news(
+                    client, symbol, since, page_size=page_size, max_pages=max_pages
+                ):
+                    added[symbol] += self.add(page)
+                    published = max([published or "", *(a.published for a in page)])
+                refreshed_at = time.time()
+            except NewsUnavailable as e:
+                logger.warning("could not refresh the news of %s: %s", symbol, e)
+            self._set_cursor(symbol, published, refreshed_at)
+            logger.debug("%s new articles for %s", added[symbol], symbol)
+        return added
+
+    def feed(self, symbols: Iterable[str], limit: int = 50) -> pd.DataFrame:
+        """Returns the latest articles mentioning any of the symbols.
+
+        Args:
+            symbols: The symbols of the watchlist.
+            limit: The maximum number of articles.
+
+        Returns:
+            A Pandas DataFrame of the articles, newest first, with the sentiment
+            towards the most relevant symbol of the watchlist.
+        """
+        symbols = [s.strip().upper() for s in symbols if s.strip()]
+        placeholders = ",".join("?" * len(symbols))
+        query = (
+            "SELECT a.published, s.ticker, a.title, a.source, s.score AS ticker_score, "
+            "a.score AS overall_score, a.label, a.url FROM articles a "
+            "JOIN sentiment s ON s.key = a.key "
+            f"WHERE s.ticker IN ({placeholders}) "
+            "ORDER BY a.published DESC, s.relevance DESC"
+        )
+        with self._lock:
+            frame = pd.read_sql_query(query, self._connection, params=symbols)
+        frame = frame.drop_duplicates("url").head(limit)
+        frame["published"] = pd.to_datetime(frame["published"], format=PUBLISHED_FORMAT)
+        return frame.reset_index(drop=True)
+
+    def daily_sentiment(
+        self, symbols: Iterable[str], min_relevance: float = 0.1
+    ) -> pd.DataFrame:
+        """Returns the relevance-weighted mean sentiment per day and symbol.
+
+        Args:
+            symbols: The symbols of the watchlist.
+            min_relevance: Mentions less relevant than this are ignored.
+
+        Returns:
+            A Pandas DataFrame indexed by day with a column per symbol.
+        """
+        symbols = [s.strip().upper() for s in symbols if s.strip()]
+        placeholders = ",".join("?" * len(symbols))
+        query = (
+            "SELECT substr(a.published, 1, 8) AS day, s.ticker, "
+            "SUM(s.score * s.relevance) / SUM(s.relevance) AS sentiment "
+            "FROM sentiment s JOIN articles a ON a.key = s.key "
+            f"WHERE s.ticker IN ({placeholders}) AND s.relevance >= ? "
+            "GROUP BY day, s.ticker"
+        )
+        with self._lock:
+            frame = pd.read_sql_query(
+                query, self._connection, params=[*symbols, min_relevance]
+            )
+        frame["day"] = pd.to_datetime(frame["day"], format="%Y%m%d")
+        return frame.pivot(index="day", columns="ticker", values="sentiment")
+
+
+def get_news_store() -> NewsStore:
+    """Returns the process-wide NewsStore configured in Settings."""
+    global _default_store  # pylint: disable=global-statement
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = NewsStore(Settings.NEWS_DB_PATH)
+        return _default_store
@@ -0,0 +1,125 @@
+from itertools import chain
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+QUOTE_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+QUOTE_DTYPE = np.dtype(
+    [
+        ("Date", "datetime64[D]"),
+        ("Open", "f8"),
+        ("High", "f8"),
+        ("Low", "f8"),
+        ("Close", "f8"),
+        ("Volume", "i8"),
+    ]
+)
+_INTEGER_FIELDS = {"Volume"}
+
+
+def _field_name(key: str) -> str:
+    """Turns an Alpha Vantage field name like `5. adjusted close` into `Adjusted Close`."""
+    return key.split(". ", 1)[-1].title()
+
+
+def find_time_series(payload: Optional[dict]) -> Optional[dict]:
+    """Finds the time series of a daily, weekly or monthly Alpha Vantage payload.
+
+    Args:
+        payload: The decoded API response.
+
+    Returns:
+        The dictionary mapping dates to bars or None if there is no time series.
+    """
+    if not payload:
+        return None
+    for key, value in payload.items():
+        if "Time Series" in key:
+            return value
+    return None
+
+
+def time_series_records(series: Optional[dict]) -> np.ndarray:
+    """Converts a time series into date-sorted OHLCV records in one vectorized pass.
+
+    Args:
+        series: A dictionary mapping dates to open, high, low, close and volume strings.
+
+    Returns:
+        A structured NumPy array with the QUOTE_DTYPE layout, sorted by date.
+    """
+    if not series:
+        return np.empty(0, dtype=QUOTE_DTYPE)
+    values = _series_values(series)
+    records = np.empty(len(series), dtype=QUOTE_DTYPE)
+    records["Date"] = np.array(list(series), dtype="datetime64[D]")
+    for position, column in enumerate(QUOTE_COLUMNS[1:]):
+        records[column] = values[:, position]
+    return np.sort(records, order="Date")
+
+
+def _series_values(series: dict) -> np.ndarray:
+    """Returns the bar values of a time series as a (bars, fields) float64 matrix."""
+    width = len(next(iter(series.values())))
+    flat = np.fromiter(
+        chain.from_iterable(fields.values() for fields in series.values()),
+        dtype="f8",
+        count=len(series) * width,
+    )
+    return flat.reshape(len(series), width)
+
+
+def records_to_frame(records: np.ndarray) -> pd.DataFrame:
+    """Converts OHLCV records into a Pandas DataFrame indexed by date.
+
+    Args:
+        records: A date-sorted structured NumPy array with the QUOTE_DTYPE layout.
+
+    Returns:
+        A Pandas DataFrame with float64 Open, High, Low, Close and int64 Volume columns.
+    """
+    index = pd.DatetimeIndex(records["Date"].astype("datetime64[ns]"), name="Date")
+    return pd.DataFrame(
+        {column: np.asarray(records[column]) for column in QUOTE_COLUMNS[1:]},
+        index=index,
+    )
+
+
+def parse_time_series(payload: Optional[dict]) -> pd.DataFrame:
+    """Parses a daily, weekly or monthly time series payload into a typed DataFrame.
+
+    Every field of the bars becomes a column (`1. open` -> `Open`), volumes
+    are int64, the rest float64 and the index is a sorted DatetimeIndex.
+
+    Args:
+        payload: The decoded response of one of the `get_time_series_*` methods.
+
+    Returns:
+        A Pandas DataFrame of the bars, empty if the payload holds no time series.
+    """
+    series = find_time_series(payload)
+    if not series:
+        return pd.DataFrame(
+            columns=QUOTE_COLUMNS[1:], index=pd.DatetimeIndex([], name="Date")
+        )
+    columns: List[str] = [_field_name(key) for key in next(iter(series.values()))]
+    values = _series_values(series)
+    index = pd.DatetimeIndex(
+        np.array(list(series), dtype="datetime64[D]").astype("datetime64[ns]"),
+        name="Date",
+    )
+    frame = pd.DataFrame(
+        {
+            column: values[:, position].astype(
+                "i8" if column in _INTEGER_FIELDS else "f8"
+            )
+            for position, column in enumerate(columns)
+        },
+        index=index,
+    )
+    if index.is_monotonic_increasing:
+        return frame
+    if index.is_monotonic_decreasing:
+        return frame.iloc[::-1]
+    return frame.sort_index()
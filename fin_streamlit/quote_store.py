@@ -0,0 +1,177 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Optional
+
+import numpy as np
+
+from fin_streamlit.log import get_logger
+from fin_streamlit.parsers import (
+    QUOTE_DTYPE,
+    find_time_series,
+    time_series_records,
+)
+from fin_streamlit.settings import Settings
+
+logger = get_logger(__name__)
+
+COMPACT_OUTPUT_SIZE = 100
+
+_default_store: Optional["QuoteStore"] = None
+_default_store_lock = threading.Lock()
+
+
+class QuoteStore:
+    """Local columnar store of daily OHLCV history, one memory-mapped NumPy file per symbol.
+
+    After the first load only the compact (last 100 bars) series is requested
+    and the new dates are appended to the stored history.
+
+    Attributes
+    ----------
+    root : str
+        The directory holding the `<SYMBOL>.npy` files.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.root!r})"
+
+    def _path(self, symbol: str, extension: str) -> str:
+        return os.path.join(self.root, f"{symbol.strip().upper()}.{extension}")
+
+    def load(self, symbol: str) -> np.ndarray:
+        """Loads the stored history of the symbol as a read-only memory map.
+
+        Args:
+            symbol: The symbol of the company.
+
+        Returns:
+            The stored OHLCV records, empty if there are none.
+        """
+        path = self._path(symbol, "npy")
+        if not os.path.exists(path):
+            return np.empty(0, dtype=QUOTE_DTYPE)
+        return np.load(path, mmap_mode="r")
+
+    def has_full_history(self, symbol: str) -> bool:
+        """Returns True if the full (20+ years) history of the symbol is stored."""
+        try:
+            with open(self._path(symbol, "json")) as f:
+                return bool(json.load(f).get("full_history"))
+        except (OSError, ValueError):
+            return False
+
+    def last_date(self, symbol: str) -> Optional[np.datetime64]:
+        """Returns the most recent stored date of the symbol, None if nothing is stored."""
+        records = self.load(symbol)
+        return records["Date"][-1] if records.size else None
+
+    def write(self, symbol: str, records: np.ndarray, full_history: bool) -> None:
+        """Replaces the stored history of the symbol.
+
+        Args:
+            symbol: The symbol of the company.
+            records: Date-sorted OHLCV records with the QUOTE_DTYPE layout.
+            full_history: Whether the records cover the full history of the symbol.
+        """
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".npy")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(records, dtype=QUOTE_DTYPE))
+            os.replace(tmp_path, self._path(symbol, "npy"))
+            with open(self._path(symbol, "json"), "w") as f:
+                json.dump({"full_history": full_history, "rows": len(records)}, f)
+
+    def append(self, symbol: str, records: np.ndarray) -> int:
+        """Merges newer records into the stored history of the symbol.
+
+        Bars dated on or after the last stored date replace the stored ones,
+        as the latest bar may have been fetched during the trading session.
+
+        Args:
+            symbol: The symbol of the company.
+            records: Date-sorted OHLCV records with the QUOTE_DTYPE layout.
+
+        Returns:
+            The number of new dates added to the history.
+        """
+        stored = self.load(symbol)
+        last = stored["Date"][-1] if stored.size else None
+        if last is None:
+            self.write(symbol, records, full_history=False)
+            return len(records)
+        newer = records[records["Date"] >= last]
+        if not newer.size:
+            return 0
+        merged = np.concatenate([stored[stored["Date"] < last], newer])
+        self.write(symbol, merged, full_history=self.has_full_history(symbol))
+        return len(merged) - len(stored)
+
+    def refresh(
+        self,
+        client: Any,
+        symbol: str,
+        return_full_history: bool = False,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """Brings the stored history of the symbol up to date and returns it.
+
+        The full series is requested only when nothing is stored yet or the
+        full history is asked for the first time, otherwise the compact one.
+
+        Args:
+            client: An AlphaVantageClient.
+            symbol: The symbol of the company.
+            return_full_history: Whether the full history has to be stored.
+            **kwargs: Additional parameters to pass to the API.
+
+        Returns:
+            The stored OHLCV records.
+        """
+        stored = self.load(symbol)
+        fetch_full = return_full_history and not self.has_full_history(symbol)
+        payload = client.get_time_series_daily(
+            symbol, return_full_history=fetch_full, **kwargs
+        )
+        records = time_series_records(find_time_series(payload))
+        if not records.size:
+            logger.warning("no quotes fetched for %s, serving stored ones", symbol)
+            return stored
+        if fetch_full or not stored.size:
+            self.write(symbol, records, full_history=fetch_full)
+        elif records["Date"][0] > stored["Date"][-1]:
+            logger.debug("gap in stored %s quotes, replacing them", symbol)
+            if self.has_full_history(symbol):
+                self._invalidate(symbol)
+                return self.refresh(client, symbol, return_full_history=True, **kwargs)
+            self.write(symbol, records, full_history=False)
+        else:
+            appended = self.append(symbol, records)
+            logger.debug("appended %s new %s quotes", appended, symbol)
+        return self.load(symbol)
+
+    def _invalidate(self, symbol: str) -> None:
+        """Forgets that the full history of the symbol is stored."""
+        try:
+            os.remove(self._path(symbol, "json"))
+        except OSError:
+            pass
+
+
+def get_quote_store() -> QuoteStore:
+    """Returns the process-wide quote store configured in Settings.
+
+    Returns:
+        The shared QuoteStore.
+    """
+    global _default_store  # pylint: disable=global-statement
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = QuoteStore(Settings.QUOTE_STORE_DIR)
+        return _default_store
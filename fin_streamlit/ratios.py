@@ -0,0 +1,227 @@
+"""Financial ratios derived from the balance sheet, income statement and cash flow.
+
+The three statements are aligned by fiscal date into one frame and every
+ratio is a vectorized column operation over it. `RatioCache` keeps the
+results per symbol and statement version, so they are only derived again
+when a statement changes.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fin_streamlit.statements import DATE_FIELD, FinancialStatement
+
+# how far the fiscal date of a report may be from exactly n years before another one
+YEAR_TOLERANCE = pd.Timedelta(days=20)
+
+_Ratio = Callable[[pd.DataFrame], pd.Series]
+
+
+def _divide(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Divides element-wise, NaN where the denominator is zero or missing."""
+    return numerator / denominator.where(denominator != 0)
+
+
+def _column(frame: pd.DataFrame, name: str) -> pd.Series:
+    if name in frame:
+        return frame[name]
+    return pd.Series(np.nan, index=frame.index, name=name)
+
+
+def _years_ago(values: pd.Series, years: int) -> pd.Series:
+    """Returns the values reported `years` years before each fiscal date, NaN if there are none."""
+    earlier = values.dropna()
+    if earlier.empty:
+        return pd.Series(np.nan, index=values.index)
+    shifted = earlier.reindex(
+        values.index - pd.DateOffset(years=years),
+        method="nearest",
+        tolerance=YEAR_TOLERANCE,
+    )
+    return pd.Series(shifted.to_numpy(), index=values.index)
+
+
+def _growth(name: str) -> _Ratio:
+    def growth(frame: pd.DataFrame) -> pd.Series:
+        values = _column(frame, name)
+        previous = _years_ago(values, 1)
+        return _divide(values - previous, previous.abs())
+
+    return growth
+
+
+def _cagr(name: str, years: int) -> _Ratio:
+    def cagr(frame: pd.DataFrame) -> pd.Series:
+        values = _column(frame, name)
+        start = _years_ago(values, years)
+        ratio = _divide(values, start)
+        # a CAGR is not defined between values of different signs
+        return np.power(ratio.where(ratio > 0), 1 / years) - 1
+
+    return cagr
+
+
+def _free_cash_flow(frame: pd.DataFrame) -> pd.Series:
+    return _column(frame, "operatingCashflow") - _column(frame, "capitalExpenditures")
+
+
+def _ratio(numerator: str, denominator: str) -> _Ratio:
+    def ratio(frame: pd.DataFrame) -> pd.Series:
+        return _divide(_column(frame, numerator), _column(frame, denominator))
+
+    return ratio
+
+
+# ratio name -> function computing it from the aligned statements, in display order
+RATIOS: Dict[str, _Ratio] = {
+    "GrossMargin": _ratio("grossProfit", "totalRevenue"),
+    "OperatingMargin": _ratio("operatingIncome", "totalRevenue"),
+    "NetMargin": _ratio("netIncome", "totalRevenue"),
+    "ROE": _ratio("netIncome", "totalShareholderEquity"),
+    "ROA": _ratio("netIncome", "totalAssets"),
+    "CurrentRatio": _ratio("totalCurrentAssets", "totalCurrentLiabilities"),
+    "DebtToEquity": _ratio("totalLiabilities", "totalShareholderEquity"),
+    "EquityMultiplier": _ratio("totalAssets", "totalShareholderEquity"),
+    "FreeCashFlow": _free_cash_flow,
+    "FCFMargin": lambda frame: _divide(
+        _free_cash_flow(frame), _column(frame, "totalRevenue")
+    ),
+    "RevenueGrowthYoY": _growth("totalRevenue"),
+    "NetIncomeGrowthYoY": _growth("netIncome"),
+    "FCFGrowthYoY": lambda frame: _growth("FreeCashFlow")(
+        frame.assign(FreeCashFlow=_free_cash_flow(frame))
+    ),
+    "RevenueCAGR3Y": _cagr("totalRevenue", 3),
+    "NetIncomeCAGR3Y": _cagr("netIncome", 3),
+}
+# ratios that are amounts rather than fractions
+AMOUNT_RATIOS = ("FreeCashFlow",)
+
+
+def align_statements(
+    balance_sheet: FinancialStatement,
+    income_statement: FinancialStatement,
+    cash_flow: FinancialStatement,
+) -> pd.DataFrame:
+    """Joins the line items of the three statements by fiscal date.
+
+    Items reported by more than one statement (e.g. netIncome) are taken
+    from the income statement first, then the balance sheet.
+
+    Args:
+        balance_sheet: The balance sheets of one reporting period.
+        income_statement: The income statements of the same period.
+        cash_flow: The cash flows of the same period.
+
+    Returns:
+        A Pandas DataFrame of the float64 line items indexed by ascending fiscal date.
+    """
+    tables = []
+    seen = set()
+    for statement in (income_statement, balance_sheet, cash_flow):
+        table = statement.table.select_dtypes("number")
+        table = table.drop(columns=[c for c in table.columns if c in seen])
+        seen.update(table.columns)
+        tables.append(table)
+    frame = pd.concat(tables, axis=1, join="outer", sort=True)
+    frame.index.name = DATE_FIELD
+    return frame
+
+
+def compute_ratios(
+    balance_sheet: FinancialStatement,
+    income_statement: FinancialStatement,
+    cash_flow: FinancialStatement,
+) -> pd.DataFrame:
+    """Computes the RATIOS of every fiscal date of the statements.
+
+    Args:
+        balance_sheet: The balance sheets of one reporting period.
+        income_statement: The income statements of the same period.
+        cash_flow: The cash flows of the same period.
+
+    Returns:
+        A Pandas DataFrame with a float64 column per ratio, indexed by
+        ascending fiscal date, NaN where a line item is not reported.
+    """
+    frame = align_statements(balance_sheet, income_statement, cash_flow)
+    ratios = pd.DataFrame(
+        {name: ratio(frame) for name, ratio in RATIOS.items()}, index=frame.index
+    )
+    return ratios.astype("f8")
+
+
+def statement_version(statement: FinancialStatement) -> int:
+    """Returns a hash identifying the reports of a statement, it changes with any restated value."""
+    table = statement.table
+    return int(pd.util.hash_pandas_object(table, index=True).sum()) ^ hash(
+        tuple(table.columns)
+    )
+
+
+class RatioCache:
+    """Ratios by symbol, reporting period and statement versions.
+
+    Attributes
+    ----------
+    maxsize : int
+        The maximum number of results kept, the least recently used are dropped.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._results: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(size={len(self._results)}, maxsize={self.maxsize})"
+
+    def get(
+        self,
+        symbol: str,
+        period: str,
+        *,
+        balance_sheet: FinancialStatement,
+        income_statement: FinancialStatement,
+        cash_flow: FinancialStatement,
+    ) -> pd.DataFrame:
+        """Returns the ratios of the symbol's statements, computing them only if they changed.
+
+        Args:
+            symbol: The symbol of the company.
+            period: The reporting period of the statements, e.g. `Annual`.
+            balance_sheet: The balance sheets of the period.
+            income_statement: The income statements of the period.
+            cash_flow: The cash flows of the period.
+
+        Returns:
+            The ratios, see `compute_ratios`.
+        """
+        statements = (balance_sheet, income_statement, cash_flow)
+        key: Tuple = (
+            symbol.upper(),
+            period,
+            *(statement_version(s) for s in statements),
+        )
+        with self._lock:
+            cached: Optional[pd.DataFrame] = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+        ratios = compute_ratios(*statements)
+        with self._lock:
+            self._results[key] = ratios
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return ratios
+
+
+_default_ratio_cache = RatioCache()
+
+
+def get_ratio_cache() -> RatioCache:
+    """Returns the process-wide RatioCache."""
+    return _default_ratio_cache
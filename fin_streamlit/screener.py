@@ -0,0 +1,325 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fin_streamlit.clients.alpha_vantage import (
+    ENDPOINT_CACHE_TTL,
+    AlphaVantageClient,
+    Endpoints,
+)
+from fin_streamlit.clients.batch import FetchResult
+from fin_streamlit.log import get_logger
+from fin_streamlit.ratios import get_ratio_cache
+from fin_streamlit.settings import Settings
+from fin_streamlit.statements import Period, StatementSet
+
+logger = get_logger(__name__)
+
+SYMBOL_FIELD = "Symbol"
+TEXT_FIELDS = (
+    "Name",
+    "AssetType",
+    "Exchange",
+    "Currency",
+    "Country",
+    "Sector",
+    "Industry",
+    "FiscalYearEnd",
+)
+DATE_FIELDS = ("LatestQuarter", "DividendDate", "ExDividendDate")
+# long text fields of the overview that are not worth screening on
+IGNORED_FIELDS = ("Description", "Address", "CIK")
+OVERVIEW_UPDATED_AT = "overview_updated_at"
+STATEMENTS_UPDATED_AT = "statements_updated_at"
+STATEMENT_ENDPOINTS = (
+    Endpoints.BALANCE_SHEET,
+    Endpoints.INCOME_STATEMENT,
+    Endpoints.CASH_FLOW,
+)
+
+# ratios of the latest annual statements kept in the table, see `ratios.RATIOS`
+STATEMENT_RATIOS = (
+    "GrossMargin",
+    "OperatingMargin",
+    "NetMargin",
+    "ROE",
+    "ROA",
+    "CurrentRatio",
+    "DebtToEquity",
+    "FCFMargin",
+    "RevenueGrowthYoY",
+    "RevenueCAGR3Y",
+)
+
+_default_screener: Optional["ScreenerTable"] = None
+_default_screener_lock = threading.Lock()
+
+
+def _typed(frame: pd.DataFrame) -> pd.DataFrame:
+    """Casts the columns of a screener table: text to category, dates to datetime, the rest to float64."""
+    columns = {}
+    for column in frame.columns:
+        if column in TEXT_FIELDS:
+            columns[column] = frame[column].astype("category")
+        elif column in DATE_FIELDS or column.endswith("_updated_at"):
+            columns[column] = pd.to_datetime(frame[column], errors="coerce")
+        else:
+            columns[column] = pd.to_numeric(frame[column], errors="coerce").astype("f8")
+    typed = pd.DataFrame(columns, index=frame.index)
+    typed.index.name = SYMBOL_FIELD
+    return typed
+
+
+def parse_overviews(payloads: Dict[str, dict]) -> pd.DataFrame:
+    """Parses OVERVIEW payloads into one typed row per symbol.
+
+    Values like "None" or "-" become NaN, the columns are the fields the
+    KPI page shows plus the company's name, exchange, sector and industry.
+
+    Args:
+        payloads: Decoded responses of `get_company_overview` by requested symbol.
+
+    Returns:
+        A Pandas DataFrame indexed by the upper case symbols.
+    """
+    ignored = (SYMBOL_FIELD, *IGNORED_FIELDS)
+    records = {
+        symbol.upper(): {k: v for k, v in payload.items() if k not in ignored}
+        for symbol, payload in payloads.items()
+        if payload
+    }
+    if not records:
+        return pd.DataFrame(index=pd.Index([], name=SYMBOL_FIELD))
+    return _typed(pd.DataFrame.from_dict(records, orient="index"))
+
+
+def statement_ratios(
+    symbol: str, balance_sheet: dict, income_statement: dict, cash_flow: dict
+) -> Dict[str, float]:
+    """Computes the STATEMENT_RATIOS of the latest annual statements.
+
+    Args:
+        symbol: The symbol of the company, the ratios are memoized by it.
+        balance_sheet: The decoded response of `get_balance_sheet`.
+        income_statement: The decoded response of `get_income_statement`.
+        cash_flow: The decoded response of `get_cash_flow`.
+
+    Returns:
+        A dictionary of the ratios, NaN where a line item is not reported or zero.
+    """
+    ratios = get_ratio_cache().get(
+        symbol,
+        Period.ANNUAL.value,
+        balance_sheet=StatementSet.from_payload(balance_sheet).annual,
+        income_statement=StatementSet.from_payload(income_statement).annual,
+        cash_flow=StatementSet.from_payload(cash_flow).annual,
+    )
+    if ratios.empty:
+        return dict.fromkeys(STATEMENT_RATIOS, np.nan)
+    return ratios[list(STATEMENT_RATIOS)].iloc[-1].to_dict()
+
+
+class ScreenerTable:
+    """Cross-sectional table of company KPIs and ratios, persisted as a Parquet file.
+
+    Screening queries run on the local table, refreshing it only fetches the
+    symbols that are missing or older than the time to live of their data.
+
+    Attributes
+    ----------
+    path : str
+        The Parquet file holding the table.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._frame: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Returns the whole table, loading it from disk on first use."""
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    self._frame = self._load()
+        return self._frame
+
+    def _load(self) -> pd.DataFrame:
+        if os.path.exists(self.path):
+            try:
+                return _typed(pd.read_parquet(self.path))
+            except Exception as e:
+                logger.warning("could not read screener table %s: %s", self.path, e)
+        return pd.DataFrame(index=pd.Index([], name=SYMBOL_FIELD))
+
+    def save(self) -> None:
+        """Writes the table to disk."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        self.frame.to_parquet(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def update(self, rows: pd.DataFrame) -> None:
+        """Upserts rows, their non-missing values replace the stored ones.
+
+        Args:
+            rows: A Pandas DataFrame indexed by symbol.
+        """
+        if rows.empty:
+            return
+        with self._lock:
+            current = self._frame if self._frame is not None else self._load()
+            self._frame = _typed(rows.combine_first(current))
+
+    def stale(
+        self, symbols: Iterable[str], column: str, max_age: timedelta
+    ) -> List[str]:
+        """Returns the symbols that are missing or were updated longer than max_age ago.
+
+        Args:
+            symbols: The symbols of the watchlist.
+            column: The `*_updated_at` column of the data to check.
+            max_age: How old the data may be.
+
+        Returns:
+            The stale symbols, upper case, in the order of `symbols`.
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        frame = self.frame
+        if column not in frame:
+            return symbols
+        updated_at = frame[column].reindex(symbols)
+        expired = updated_at.isna() | (updated_at < datetime.now() - max_age)
+        return updated_at.index[expired.to_numpy()].to_list()
+
+    def refresh(
+        self,
+        client: AlphaVantageClient,
+        symbols: Iterable[str],
+        *,
+        with_statements: bool = False,
+        max_workers: int = 4,
+        callback: Optional[Callable[[FetchResult], None]] = None,
+    ) -> Tuple[int, int]:
+        """Fetches the stale symbols of the watchlist and saves the updated table.
+
+        Args:
+            client: The client used to fetch the data.
+            symbols: The symbols of the watchlist.
+            with_statements: Whether to compute the STATEMENT_RATIOS too,
+                it takes three more requests per symbol.
+            max_workers: The maximum number of requests in flight at once.
+            callback: Called with every FetchResult as soon as it completes (optional).
+
+        Returns:
+            The number of requests sent and of the ones that failed.
+        """
+        symbols = list(symbols)
+        sent = failed = 0
+        stale = self.stale(
+            symbols, OVERVIEW_UPDATED_AT, ENDPOINT_CACHE_TTL[Endpoints.OVERVIEW]
+        )
+        if stale:
+            report = client.fetch_many(
+                stale, [Endpoints.OVERVIEW], max_workers=max_workers, callback=callback
+            )
+            sent, failed = sent + len(stale), failed + len(report.failed)
+            rows = parse_overviews(
+                {result.symbol: result.data for result in report.succeeded}
+            )
+            rows[OVERVIEW_UPDATED_AT] = pd.Timestamp.now()
+            self.update(rows)
+        if with_statements:
+            stale = self.stale(
+                symbols,
+                STATEMENTS_UPDATED_AT,
+                ENDPOINT_CACHE_TTL[Endpoints.BALANCE_SHEET],
+            )
+            if stale:
+                report = client.fetch_many(
+                    stale,
+                    STATEMENT_ENDPOINTS,
+                    max_workers=max_workers,
+                    callback=callback,
+                )
+                sent += len(stale) * len(STATEMENT_ENDPOINTS)
+                failed += len(report.failed)
+                ratios = {
+                    symbol: statement_ratios(
+                        symbol, *(report.data(symbol, e) for e in STATEMENT_ENDPOINTS)
+                    )
+                    for symbol in stale
+                    if all(report.data(symbol, e) for e in STATEMENT_ENDPOINTS)
+                }
+                rows = pd.DataFrame.from_dict(ratios, orient="index")
+                rows[STATEMENTS_UPDATED_AT] = pd.Timestamp.now()
+                self.update(rows)
+        if sent:
+            self.save()
+        logger.debug("screener refreshed, %s requests, %s failed", sent, failed)
+        return sent, failed
+
+    def query(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        *,
+        sectors: Optional[Sequence[str]] = None,
+        ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = False,
+    ) -> pd.DataFrame:
+        """Screens the table with vectorized filters.
+
+        Args:
+            symbols: Only these symbols, e.g. the watchlist (optional).
+            sectors: Only companies of these sectors (optional).
+            ranges: Inclusive (low, high) bounds per numeric column (optional).
+            sort_by: The column to sort by (optional).
+            ascending: The sort order, missing values always come last.
+
+        Returns:
+            The matching rows, without the bookkeeping columns.
+        """
+        frame = self.frame
+        mask = np.ones(len(frame), dtype=bool)
+        if symbols is not None:
+            mask &= frame.index.isin([s.strip().upper() for s in symbols])
+        if sectors and "Sector" in frame:
+            mask &= frame["Sector"].isin(sectors).to_numpy()
+        for column, (low, high) in (ranges or {}).items():
+            values = frame[column].to_numpy()
+            mask &= (values >= low) & (values <= high)
+        result = frame[mask]
+        if sort_by in result:
+            result = result.sort_values(
+                sort_by, ascending=ascending, na_position="last"
+            )
+        return result.drop(
+            columns=[c for c in result.columns if c.endswith("_updated_at")]
+        )
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        """Returns the columns that can be filtered by range."""
+        return [
+            c
+            for c in self.frame.columns
+            if self.frame[c].dtype.kind == "f" and not c.endswith("_updated_at")
+        ]
+
+
+def get_screener() -> ScreenerTable:
+    """Returns the process-wide ScreenerTable configured in Settings."""
+    global _default_screener  # pylint: disable=global-statement
+    with _default_screener_lock:
+        if _default_screener is None:
+            _default_screener = ScreenerTable(Settings.SCREENER_PATH)
+        return _default_screener
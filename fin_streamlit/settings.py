@@ -1,15 +1,129 @@
+import hashlib
 import os
 
-from dotenv import find_dotenv, load_dotenv
+from dotenv import load_dotenv
 
-env_file = find_dotenv()
-load_dotenv(env_file)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASE_URL = "https://www.alphavantage.co/query?"
+
+
+def _find_env_file() -> str:
+    """Returns the .env file to load without walking up the directory tree.
+
+    DOTENV_PATH wins, then the .env of the working directory and then the
+    one of the project root.
+    """
+    explicit = os.environ.get("DOTENV_PATH")
+    if explicit:
+        return explicit
+    for directory in (os.getcwd(), PROJECT_ROOT):
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            return path
+    return ""
+
+
+env_file = _find_env_file()
+if env_file:
+    load_dotenv(env_file)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Reads a boolean flag from the environment variables."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default=None):
+    """Reads an integer from the environment variables."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _cache_dir(transport: str, base_url: str, fixtures_dir: str) -> str:
+    """Returns the directory of the persistent caches and stores.
+
+    Responses of the live API are kept in .cache, while every other source
+    (recorded or replayed fixtures, a stub server) gets its own sub-directory,
+    so its data never ends up in the caches used with the live API.
+    """
+    if transport == "live" and base_url == DEFAULT_BASE_URL:
+        return ".cache"
+    source = base_url if transport == "live" else f"{base_url}|{fixtures_dir}"
+    digest = hashlib.sha1(source.encode()).hexdigest()[:10]
+    return os.path.join(".cache", f"{transport}-{digest}")
 
 
 class Settings:
     LOGGING_LEVEL = os.environ.get("LOGGING_LEVEL", "DEBUG")
     ALPHA_VANTAGE_API_KEY = os.environ.get("ALPHA_VANTAGE_API_KEY")
 
+    ALPHA_VANTAGE_BASE_URL = os.environ.get("ALPHA_VANTAGE_BASE_URL", DEFAULT_BASE_URL)
+    ALPHA_VANTAGE_TRANSPORT = os.environ.get("ALPHA_VANTAGE_TRANSPORT", "live").lower()
+    ALPHA_VANTAGE_FIXTURES_DIR = os.environ.get(
+        "ALPHA_VANTAGE_FIXTURES_DIR", os.path.join("tests", "data")
+    )
+    ALPHA_VANTAGE_CALLS_PER_MINUTE = _env_int("ALPHA_VANTAGE_CALLS_PER_MINUTE", 5)
+    ALPHA_VANTAGE_CALLS_PER_DAY = _env_int("ALPHA_VANTAGE_CALLS_PER_DAY")
+    ALPHA_VANTAGE_MAX_THROTTLE_RETRIES = _env_int(
+        "ALPHA_VANTAGE_MAX_THROTTLE_RETRIES", 3
+    )
+
+    CACHE_DIR = os.environ.get(
+        "CACHE_DIR",
+        _cache_dir(
+            ALPHA_VANTAGE_TRANSPORT, ALPHA_VANTAGE_BASE_URL, ALPHA_VANTAGE_FIXTURES_DIR
+        ),
+    )
+
+    HTTP_POOL_CONNECTIONS = _env_int("HTTP_POOL_CONNECTIONS", 4)
+    HTTP_POOL_MAXSIZE = _env_int("HTTP_POOL_MAXSIZE", 16)
+
+    RESPONSE_CACHE_ENABLED = _env_bool("RESPONSE_CACHE_ENABLED", True)
+    RESPONSE_CACHE_PATH = os.environ.get(
+        "RESPONSE_CACHE_PATH", os.path.join(CACHE_DIR, "alpha_vantage.sqlite3")
+    )
+    RESPONSE_CACHE_MAX_ENTRIES = _env_int("RESPONSE_CACHE_MAX_ENTRIES", 10_000)
+    RESPONSE_CACHE_STALE_SECONDS = _env_int("RESPONSE_CACHE_STALE_SECONDS", 7 * 86400)
+    RESPONSE_CACHE_SERVE_STALE = _env_bool("RESPONSE_CACHE_SERVE_STALE", True)
+    MODEL_CACHE_TTL_SECONDS = _env_int("MODEL_CACHE_TTL_SECONDS", 60)
+
+    QUOTE_STORE_ENABLED = _env_bool("QUOTE_STORE_ENABLED", True)
+    QUOTE_STORE_DIR = os.environ.get(
+        "QUOTE_STORE_DIR", os.path.join(CACHE_DIR, "quotes")
+    )
+
+    PREFETCH_ENABLED = _env_bool("PREFETCH_ENABLED", False)
+    PREFETCH_REFRESH_SECONDS = _env_int("PREFETCH_REFRESH_SECONDS", 600)
+
+    SCREENER_PATH = os.environ.get(
+        "SCREENER_PATH", os.path.join(CACHE_DIR, "screener.parquet")
+    )
+    SCREENER_WATCHLIST = os.environ.get(
+        "SCREENER_WATCHLIST", "AAPL,MSFT,AMZN,GOOGL,META,NVDA,TSLA,IBM"
+    )
+
+    SYMBOL_INDEX_PATH = os.environ.get(
+        "SYMBOL_INDEX_PATH", os.path.join(CACHE_DIR, "symbols.json")
+    )
+    SYMBOL_LISTING_PATH = os.environ.get("SYMBOL_LISTING_PATH")
+
+    NEWS_DB_PATH = os.environ.get(
+        "NEWS_DB_PATH", os.path.join(CACHE_DIR, "news.sqlite3")
+    )
+    NEWS_LOOKBACK_DAYS = _env_int("NEWS_LOOKBACK_DAYS", 7)
+    NEWS_PAGE_SIZE = _env_int("NEWS_PAGE_SIZE", 200)
+
+    MOVERS_TTL_SECONDS = _env_int("MOVERS_TTL_SECONDS", 300)
+    MOVERS_PRELOAD = _env_bool("MOVERS_PRELOAD", True)
+
+    FIGURE_CACHE_MAX_BYTES = _env_int("FIGURE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+    METRICS_PORT = _env_int("METRICS_PORT")
+    SHOW_DIAGNOSTICS = _env_bool("SHOW_DIAGNOSTICS", False)
+
     @classmethod
     def show_keys(cls):
         attrs = [k for k in dir(cls) if k.isupper() and not k.startswith("_")]
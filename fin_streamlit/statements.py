@@ -0,0 +1,199 @@
+from enum import Enum
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DATE_FIELD = "fiscalDateEnding"
+CURRENCY_FIELD = "reportedCurrency"
+DATE_FIELDS = ("reportedDate",)
+
+
+def _to_dates(values: List[Optional[str]]) -> pd.DatetimeIndex:
+    """Parses the YYYY-MM-DD dates of the reports, anything else becomes NaT."""
+    return pd.to_datetime(values, format="%Y-%m-%d", errors="coerce")
+
+
+class Period(Enum):
+    """Reporting periods of the financial statements."""
+
+    ANNUAL = "Annual"
+    QUARTERLY = "Quarterly"
+
+
+class FinancialStatement:
+    """Financial statement reports parsed once into a numeric, fiscal-date-indexed table.
+
+    Shared by the balance sheet, income statement, cash flow and earnings,
+    it keeps the derived views (display frame, chart frame, rows) cached so
+    Streamlit reruns don't convert the data again. The models serve it with
+    `st.cache_resource`, so the same object, caches included, is reused.
+
+    Attributes
+    ----------
+    table : pd.DataFrame
+        float64 line items as columns, indexed by an ascending DatetimeIndex of fiscal dates.
+    currency : str, optional
+        The reported currency of the statement.
+    """
+
+    def __init__(self, table: pd.DataFrame, currency: Optional[str] = None) -> None:
+        self.table = table
+        self.currency = currency
+        self._frame: Optional[pd.DataFrame] = None
+        self._chart_frame: Optional[pd.DataFrame] = None
+        self._rows: Dict[str, pd.Series] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(periods={len(self.table)}, "
+            f"items={len(self.table.columns)}, currency={self.currency})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def empty(self) -> bool:
+        """Returns True if the statement holds no reports."""
+        return self.table.empty
+
+    @classmethod
+    def from_reports(
+        cls,
+        reports: Optional[Iterable[dict]],
+        date_fields: Iterable[str] = DATE_FIELDS,
+    ) -> "FinancialStatement":
+        """Parses the annual or quarterly reports of an Alpha Vantage statement payload.
+
+        Text values like "None" become NaN, fields listed in `date_fields`
+        are parsed as dates and all the other fields as float64.
+
+        Args:
+            reports: The list of reports, e.g. the `annualReports` of the payload.
+            date_fields: Fields holding dates rather than amounts.
+
+        Returns:
+            A FinancialStatement, empty if there are no reports.
+        """
+        records = list(reports or [])
+        fields = list(dict.fromkeys(field for report in records for field in report))
+        if not records or DATE_FIELD not in fields:
+            return cls(pd.DataFrame(index=pd.DatetimeIndex([], name=DATE_FIELD)))
+        currency = next(
+            (r[CURRENCY_FIELD] for r in records if r.get(CURRENCY_FIELD)), None
+        )
+        index = pd.DatetimeIndex(
+            _to_dates([r.get(DATE_FIELD) for r in records]), name=DATE_FIELD
+        )
+        dates = [f for f in fields if f in date_fields]
+        amounts = [f for f in fields if f not in dates + [DATE_FIELD, CURRENCY_FIELD]]
+        values = np.array([[r.get(f) for f in amounts] for r in records], dtype=object)
+        values[pd.isna(values) | (values == "None")] = np.nan
+        try:
+            values = values.astype("f8")
+        except ValueError:
+            # other text in the amounts, converted by a single call as well
+            values = pd.to_numeric(values.reshape(-1).astype(str), errors="coerce")
+        table = pd.DataFrame(
+            np.asarray(values, dtype="f8").reshape(len(records), len(amounts)),
+            index=index,
+            columns=amounts,
+        )
+        for field in dates:
+            table[field] = _to_dates([r.get(field) for r in records])
+        if dates:
+            table = table[[f for f in fields if f in table]]
+        table = table[table.index.notna()]
+        if not table.index.is_monotonic_increasing:
+            table = table.sort_index()
+        return cls(table, currency=currency)
+
+    @property
+    def line_items(self) -> List[str]:
+        """Returns the names of the line items of the statement."""
+        return self.table.columns.to_list()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Returns the statement as displayed: line items as rows, newest fiscal date first."""
+        if self._frame is None:
+            frame = self.table.iloc[::-1].T
+            frame.columns = frame.columns.strftime("%Y-%m-%d")
+            frame.columns.name = DATE_FIELD
+            self._frame = frame
+        return self._frame
+
+    @property
+    def chart_frame(self) -> pd.DataFrame:
+        """Returns the display frame without zero values and rows with no data at all."""
+        if self._chart_frame is None:
+            numeric = self.frame.loc[
+                [c for c in self.line_items if self.table[c].dtype.kind == "f"]
+            ].astype("f8")
+            self._chart_frame = numeric.replace(0, np.nan).dropna(how="all")
+        return self._chart_frame
+
+    def row(self, item: str) -> pd.Series:
+        """Returns the values of one line item indexed by fiscal date.
+
+        Args:
+            item: The name of the line item, e.g. `totalAssets`.
+
+        Returns:
+            A Pandas Series of the line item, all NaN if the item is not reported.
+        """
+        if item not in self._rows:
+            if item in self.table:
+                self._rows[item] = self.table[item]
+            else:
+                self._rows[item] = pd.Series(np.nan, index=self.table.index, name=item)
+        return self._rows[item]
+
+
+class StatementSet:
+    """Annual and quarterly statements parsed from a single Alpha Vantage payload.
+
+    Attributes
+    ----------
+    annual : FinancialStatement
+        The statements of the fiscal years.
+    quarterly : FinancialStatement
+        The statements of the fiscal quarters.
+    """
+
+    def __init__(
+        self, annual: FinancialStatement, quarterly: FinancialStatement
+    ) -> None:
+        self.annual = annual
+        self.quarterly = quarterly
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(annual={self.annual}, quarterly={self.quarterly})"
+
+    @classmethod
+    def from_payload(
+        cls,
+        payload: Optional[dict],
+        annual_key: str = "annualReports",
+        quarterly_key: str = "quarterlyReports",
+    ) -> "StatementSet":
+        """Parses both series of reports of a statement payload.
+
+        Args:
+            payload: The decoded response of e.g. `get_balance_sheet`.
+            annual_key: The key of the annual reports in the payload.
+            quarterly_key: The key of the quarterly reports in the payload.
+
+        Returns:
+            A StatementSet, with empty statements for missing reports.
+        """
+        payload = payload or {}
+        return cls(
+            annual=FinancialStatement.from_reports(payload.get(annual_key)),
+            quarterly=FinancialStatement.from_reports(payload.get(quarterly_key)),
+        )
+
+    def get(self, period: Period) -> FinancialStatement:
+        """Returns the statement of the given reporting period."""
+        return self.quarterly if period is Period.QUARTERLY else self.annual
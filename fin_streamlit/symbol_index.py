@@ -0,0 +1,200 @@
+import bisect
+import csv
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from fin_streamlit.log import get_logger
+from fin_streamlit.settings import Settings
+
+logger = get_logger(__name__)
+
+SYMBOL_KEY = "1. symbol"
+NAME_KEY = "2. name"
+TYPE_KEY = "3. type"
+SCORE_KEY = "9. matchScore"
+
+# columns of an Alpha Vantage LISTING_STATUS file -> keys of bestMatches
+LISTING_COLUMNS = {"symbol": SYMBOL_KEY, "name": NAME_KEY, "assetType": TYPE_KEY}
+
+# match scores: exact ticker, ticker prefix, name word prefix
+EXACT_SCORE, TICKER_SCORE, NAME_SCORE = 1.0, 0.8, 0.5
+
+_default_index: Optional["SymbolIndex"] = None
+_default_index_lock = threading.Lock()
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class SymbolIndex:
+    """Local index of tickers and company names for type-ahead search.
+
+    It is filled from the `bestMatches` of past SYMBOL_SEARCH responses and
+    optionally from a LISTING_STATUS csv file, queries are answered with a
+    binary search over the sorted ticker and name-word prefixes.
+
+    Attributes
+    ----------
+    path : str, optional
+        The JSON file the index is persisted in, None to keep it in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._entries: Dict[str, dict] = {}
+        self._keys: List[Tuple[str, str, bool]] = []
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(symbols={len(self._entries)})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                self.add_matches(json.load(f), save=False)
+        except (OSError, ValueError) as e:
+            logger.warning("could not read symbol index %s: %s", self.path, e)
+
+    def save(self) -> None:
+        """Writes the index to its file."""
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            entries = list(self._entries.values())
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def add_matches(self, matches: Iterable[dict], save: bool = True) -> int:
+        """Adds the `bestMatches` of a SYMBOL_SEARCH response to the index.
+
+        Args:
+            matches: Matches with at least the `1. symbol` and `2. name` keys.
+            save: Whether to persist the index if it changed.
+
+        Returns:
+            The number of symbols that were not indexed yet.
+        """
+        added = 0
+        with self._lock:
+            for match in matches:
+                symbol = str(match.get(SYMBOL_KEY) or "").strip().upper()
+                if not symbol:
+                    continue
+                entry = {k: v for k, v in match.items() if k != SCORE_KEY}
+                entry[SYMBOL_KEY] = symbol
+                added += symbol not in self._entries
+                self._entries[symbol] = {**self._entries.get(symbol, {}), **entry}
+                self._dirty = True
+        if added and save:
+            self.save()
+        return added
+
+    def load_listing(self, path: str) -> int:
+        """Adds the symbols of an Alpha Vantage LISTING_STATUS csv file.
+
+        Args:
+            path: The path of the csv file.
+
+        Returns:
+            The number of symbols that were not indexed yet.
+        """
+        with open(path, newline="") as f:
+            matches = [
+                {key: row[column] for column, key in LISTING_COLUMNS.items()}
+                for row in csv.DictReader(f)
+                if row.get("status", "Active") == "Active"
+            ]
+        added = self.add_matches(matches, save=False)
+        logger.debug("indexed %s new symbols from %s", added, path)
+        return added
+
+    def _sorted_keys(self) -> List[Tuple[str, str, bool]]:
+        """Returns (token, symbol, is_ticker) keys sorted by token, rebuilding them if needed."""
+        with self._lock:
+            if self._dirty:
+                keys = set()
+                for symbol, entry in self._entries.items():
+                    keys.add((symbol.lower(), symbol, True))
+                    for token in _tokens(str(entry.get(NAME_KEY, ""))):
+                        keys.add((token, symbol, False))
+                self._keys = sorted(keys)
+                self._dirty = False
+            return self._keys
+
+    def _prefix_matches(self, prefix: str) -> Dict[str, float]:
+        """Returns the symbols whose ticker or a word of whose name start with prefix."""
+        keys = self._sorted_keys()
+        scores: Dict[str, float] = {}
+        position = bisect.bisect_left(keys, (prefix,))
+        while position < len(keys) and keys[position][0].startswith(prefix):
+            token, symbol, is_ticker = keys[position]
+            if is_ticker:
+                score = EXACT_SCORE if token == prefix else TICKER_SCORE
+            else:
+                score = NAME_SCORE
+            scores[symbol] = max(score, scores.get(symbol, 0.0))
+            position += 1
+        return scores
+
+    def search(self, keywords: str, limit: int = 10) -> List[dict]:
+        """Finds the symbols matching every word of the keywords.
+
+        Args:
+            keywords: A ticker or name prefix, e.g. `aap` or `apple in`.
+            limit: The maximum number of matches to return.
+
+        Returns:
+            Matches in the `bestMatches` format, best first, empty on an index miss.
+        """
+        query = keywords.strip().lower()
+        if not query or not self._entries:
+            return []
+        scores = self._prefix_matches(query)
+        words = _tokens(query)
+        if len(words) > 1 or (words and words[0] != query):
+            candidates: Optional[Set[str]] = None
+            word_scores: Dict[str, float] = {}
+            for word in words:
+                matches = self._prefix_matches(word)
+                candidates = (
+                    set(matches) if candidates is None else candidates & set(matches)
+                )
+                for symbol, score in matches.items():
+                    word_scores[symbol] = min(score, word_scores.get(symbol, score))
+            for symbol in candidates or ():
+                scores[symbol] = max(scores.get(symbol, 0.0), word_scores[symbol])
+        ranked = sorted(
+            scores.items(), key=lambda item: (-item[1], len(item[0]), item[0])
+        )
+        return [
+            {**self._entries[symbol], SCORE_KEY: f"{score:.4f}"}
+            for symbol, score in ranked[:limit]
+        ]
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Returns the process-wide SymbolIndex configured in Settings.
+
+    On first use it also indexes SYMBOL_LISTING_PATH, if it is set.
+    """
+    global _default_index  # pylint: disable=global-statement
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SymbolIndex(Settings.SYMBOL_INDEX_PATH)
+            listing = Settings.SYMBOL_LISTING_PATH
+            if listing and os.path.exists(listing):
+                _default_index.load_listing(listing)
+        return _default_index
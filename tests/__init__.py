@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Settings are read when fin_streamlit is imported, keep the persistent caches
+# and stores of the test run out of the working tree and never need a real key
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="fin-streamlit-tests-"))
+os.environ.setdefault("ALPHA_VANTAGE_API_KEY", "test")
@@ -0,0 +1,48 @@
+# pylint: disable=redefined-outer-name
+import json
+import os
+
+import pytest
+
+from fin_streamlit.clients.alpha_vantage import AlphaVantageClient
+from fin_streamlit.clients.cache import InMemoryResponseCache
+from fin_streamlit.clients.rate_limit import RequestScheduler
+from fin_streamlit.clients.singleflight import SingleFlight
+from fin_streamlit.clients.stub_server import start_stub_server
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def load_payload(name: str) -> dict:
+    """Loads one of the recorded responses of tests/data, e.g. `balance_sheet`."""
+    with open(os.path.join(DATA_DIR, f"{name}.json")) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def payload():
+    return load_payload
+
+
+@pytest.fixture(scope="session")
+def stub_server():
+    server = start_stub_server(DATA_DIR)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def make_client(stub_server):
+    """Builds AlphaVantageClients talking to the stub server with their own cache and quota."""
+
+    def make(base_url=None, cache=None, serve_stale=True):
+        client = AlphaVantageClient(
+            cache=cache if cache is not None else InMemoryResponseCache(3600),
+            scheduler=RequestScheduler(calls_per_minute=6000),
+            base_url=base_url or stub_server.base_url,
+            single_flight=SingleFlight(),
+        )
+        client.serve_stale = serve_stale
+        return client
+
+    return make
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from fin_streamlit.clients.alpha_vantage import Endpoints
+from fin_streamlit.clients.async_alpha_vantage import AsyncAlphaVantageClient
+from fin_streamlit.clients.cache import make_cache_key
+
+OVERVIEW_KEY = make_cache_key({"function": "OVERVIEW", "symbol": "IBM"})
+
+
+def _run(coroutine_function, client):
+    async def run():
+        async with AsyncAlphaVantageClient(client, retries=0) as async_client:
+            return await coroutine_function(async_client)
+
+    return asyncio.run(run())
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_endpoints_are_fetched_concurrently(make_client, payload):
+    client = make_client()
+
+    async def fetch(async_client):
+        return await asyncio.gather(
+            async_client.get_company_overview("IBM"),
+            async_client.get_balance_sheet("IBM"),
+            async_client.get_time_series_daily("IBM"),
+        )
+
+    overview, balance_sheet, quotes = _run(fetch, client)
+    assert overview == payload("company_overview")
+    assert balance_sheet == payload("balance_sheet")
+    assert quotes == payload("time_series_daily")
+
+
+def test_responses_are_shared_with_the_wrapped_client(make_client, payload):
+    client = make_client()
+    _run(lambda async_client: async_client.get_company_overview("IBM"), client)
+    assert client._cache.get(OVERVIEW_KEY) == payload("company_overview")
+    assert client.freshness(Endpoints.OVERVIEW, "IBM").stale is False
+
+
+def test_stale_responses_are_served_and_revalidated(make_client, payload):
+    client = make_client()
+    client._cache._set_entry(OVERVIEW_KEY, {"Symbol": "OLD"}, time.time() - 1)
+    overview = _run(
+        lambda async_client: async_client.get_company_overview("IBM"), client
+    )
+    assert overview == {"Symbol": "OLD"}
+    assert client.freshness(Endpoints.OVERVIEW, "IBM").revalidating
+    _wait_for(lambda: client._cache.get(OVERVIEW_KEY) is not None)
+    assert client._cache.get(OVERVIEW_KEY) == payload("company_overview")
+
+
+def test_stale_responses_are_served_when_the_api_is_down(make_client):
+    client = make_client(base_url="http://127.0.0.1:9/query", serve_stale=False)
+    client._cache._set_entry(OVERVIEW_KEY, {"Symbol": "OLD"}, time.time() - 1)
+    overview = _run(
+        lambda async_client: async_client.get_company_overview("IBM"), client
+    )
+    assert overview == {"Symbol": "OLD"}
+    assert client.freshness(Endpoints.OVERVIEW, "IBM").stale
+
+
+def test_fetch_many_reports_every_pair(make_client):
+    client = make_client()
+    report = _run(
+        lambda async_client: async_client.fetch_many(
+            ["IBM", "AAPL"], [Endpoints.OVERVIEW, Endpoints.EARNINGS]
+        ),
+        client,
+    )
+    assert len(list(report)) == 4
+    assert not report.failed
@@ -0,0 +1,53 @@
+import shutil
+
+import pytest
+
+from fin_streamlit.clients.alpha_vantage import Endpoints
+from fin_streamlit.clients.stub_server import start_stub_server
+from tests.conftest import DATA_DIR
+
+
+@pytest.fixture
+def overview_only_server(tmp_path):
+    shutil.copy(f"{DATA_DIR}/company_overview.json", tmp_path)
+    server = start_stub_server(str(tmp_path))
+    yield server
+    server.shutdown()
+
+
+def test_fetch_many_fetches_every_symbol_and_endpoint(make_client, payload):
+    client = make_client()
+    completed = []
+    report = client.fetch_many(
+        ["IBM", "AAPL", "IBM"],
+        [Endpoints.OVERVIEW, Endpoints.BALANCE_SHEET],
+        callback=completed.append,
+    )
+    assert report.summary() == {"total": 4, "succeeded": 4, "failed": 0}
+    assert len(completed) == 4
+    assert report.data("AAPL", Endpoints.BALANCE_SHEET) == payload("balance_sheet")
+
+
+def test_fetch_many_reports_failures_per_pair(make_client, overview_only_server):
+    client = make_client(base_url=overview_only_server.base_url)
+    report = client.fetch_many(["IBM"], [Endpoints.OVERVIEW, Endpoints.EARNINGS])
+    assert [r.endpoint for r in report.succeeded] == [Endpoints.OVERVIEW]
+    (failure,) = report.failed
+    assert failure.endpoint is Endpoints.EARNINGS
+    assert "No fixture recorded for EARNINGS" in failure.error
+    assert report.data("IBM", Endpoints.EARNINGS) is None
+
+
+def test_fetch_many_rejects_endpoints_without_a_symbol(make_client):
+    with pytest.raises(ValueError):
+        make_client().fetch_many(["IBM"], [Endpoints.TOP_GAINERS_LOSERS])
+
+
+def test_fetch_many_serves_cached_responses_without_calling_the_api(
+    make_client, overview_only_server
+):
+    client = make_client(base_url=overview_only_server.base_url)
+    client.fetch_many(["IBM"], [Endpoints.OVERVIEW])
+    overview_only_server.shutdown()
+    report = client.fetch_many(["IBM"], [Endpoints.OVERVIEW])
+    assert not report.failed
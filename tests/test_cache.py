@@ -0,0 +1,85 @@
+import time
+
+import pytest
+
+from fin_streamlit.clients.cache import (
+    InMemoryResponseCache,
+    SQLiteResponseCache,
+    make_cache_key,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryResponseCache(stale_ttl=60)
+    return SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), stale_ttl=60)
+
+
+def test_make_cache_key_ignores_api_key_and_symbol_case():
+    assert make_cache_key(
+        {"function": "OVERVIEW", "symbol": " ibm ", "apikey": "a"}
+    ) == make_cache_key({"apikey": "b", "symbol": "IBM", "function": "OVERVIEW"})
+
+
+def test_make_cache_key_distinguishes_parameters():
+    compact = {
+        "function": "TIME_SERIES_DAILY",
+        "symbol": "IBM",
+        "outputsize": "compact",
+    }
+    full = {**compact, "outputsize": "full"}
+    assert make_cache_key(compact) != make_cache_key(full)
+
+
+def test_get_returns_fresh_entries(cache):
+    cache.set("key", {"a": 1}, ttl=60)
+    assert cache.get("key") == {"a": 1}
+    assert cache.stats.hits == 1
+
+
+def test_get_misses_expired_entries(cache, monkeypatch):
+    cache.set("key", {"a": 1}, ttl=10)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("key") is None
+    assert cache.stats.misses == 1
+
+
+def test_get_entry_serves_stale_entries_within_the_stale_horizon(cache, monkeypatch):
+    cache.set("key", {"a": 1}, ttl=10)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 30)
+    entry = cache.get_entry("key")
+    assert entry.value == {"a": 1}
+    assert not entry.fresh
+    assert cache.stats.stale_hits == 1
+
+
+def test_entries_past_the_stale_horizon_are_evicted(cache, monkeypatch):
+    cache.set("key", {"a": 1}, ttl=10)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 71)
+    assert cache.get_entry("key") is None
+    assert cache.stats.evictions == 1
+
+
+def test_non_positive_ttl_is_not_stored(cache):
+    cache.set("key", {"a": 1}, ttl=0)
+    assert cache.get("key") is None
+
+
+def test_sqlite_cache_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteResponseCache(path).set("key", {"a": 1}, ttl=60)
+    assert SQLiteResponseCache(path).get("key") == {"a": 1}
+
+
+def test_sqlite_cache_evicts_the_oldest_entries_above_max_entries(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, {"key": key}, ttl=60)
+        time.sleep(0.001)
+    assert cache.get("a") is None
+    assert cache.get("c") == {"key": "c"}
+    assert cache.stats.evictions == 1
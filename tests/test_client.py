@@ -0,0 +1,99 @@
+import threading
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from fin_streamlit.clients.alpha_vantage import Endpoints
+from fin_streamlit.clients.cache import Freshness, make_cache_key
+from fin_streamlit.clients.revalidation import StaleWhileRevalidate
+
+OVERVIEW_KEY = make_cache_key({"function": "OVERVIEW", "symbol": "IBM"})
+DOWN_URL = "http://127.0.0.1:9/query"
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _store_stale(client, value):
+    client._cache._set_entry(OVERVIEW_KEY, value, time.time() - 1)
+
+
+def test_responses_are_cached_with_their_freshness(make_client, payload):
+    client = make_client()
+    assert client.freshness(Endpoints.OVERVIEW, "IBM") is None
+    assert client.get_company_overview("IBM") == payload("company_overview")
+    assert client._cache.get(OVERVIEW_KEY) == payload("company_overview")
+    freshness = client.freshness(Endpoints.OVERVIEW, "IBM")
+    assert not freshness.stale and not freshness.revalidating
+
+
+def test_stale_responses_are_served_while_revalidated(make_client, payload):
+    client = make_client()
+    _store_stale(client, {"Symbol": "OLD"})
+    assert client.get_company_overview("IBM") == {"Symbol": "OLD"}
+    freshness = client.freshness(Endpoints.OVERVIEW, "IBM")
+    assert freshness.stale and freshness.revalidating
+    _wait_for(lambda: client._cache.get(OVERVIEW_KEY) == payload("company_overview"))
+    _wait_for(lambda: not client.freshness(Endpoints.OVERVIEW, "IBM").stale)
+    assert client.get_company_overview("IBM") == payload("company_overview")
+
+
+def test_stale_responses_are_refetched_when_serving_stale_is_off(make_client, payload):
+    client = make_client(serve_stale=False)
+    _store_stale(client, {"Symbol": "OLD"})
+    assert client.get_company_overview("IBM") == payload("company_overview")
+    assert not client.freshness(Endpoints.OVERVIEW, "IBM").stale
+
+
+def _down_client(make_client, **kwargs):
+    """Builds a client of an API refusing connections, without transport retries."""
+    client = make_client(base_url=DOWN_URL, **kwargs)
+    client._session.mount("http://", HTTPAdapter())
+    return client
+
+
+def test_stale_responses_are_served_when_the_api_is_down(make_client):
+    client = _down_client(make_client, serve_stale=False)
+    _store_stale(client, {"Symbol": "OLD"})
+    assert client.get_company_overview("IBM") == {"Symbol": "OLD"}
+    freshness = client.freshness(Endpoints.OVERVIEW, "IBM")
+    assert freshness.stale and not freshness.revalidating
+
+
+def test_errors_without_a_cached_response_are_logged(make_client):
+    client = _down_client(make_client)
+    assert client.get_company_overview("IBM") == {}
+    with pytest.raises(requests.ConnectionError):
+        client._request("OVERVIEW", "IBM")
+
+
+def test_one_refresh_runs_per_cache_key():
+    revalidation = StaleWhileRevalidate()
+    release = threading.Event()
+    refreshed = []
+
+    def refresh():
+        release.wait(5)
+        refreshed.append(1)
+
+    assert revalidation.submit("key", refresh)
+    assert not revalidation.submit("key", refresh)
+    assert revalidation.submit("other", lambda: None)
+    release.set()
+    _wait_for(lambda: "running=0" in repr(revalidation))
+    assert refreshed == [1]
+    assert revalidation.submit("key", lambda: None)
+
+
+def test_failed_refreshes_are_released():
+    revalidation = StaleWhileRevalidate()
+    assert revalidation.submit("key", lambda: int("x"))
+    _wait_for(lambda: revalidation.submit("key", lambda: None))
+    revalidation.set_freshness({"function": "OVERVIEW"}, Freshness(0.0))
+    assert revalidation.freshness("OVERVIEW").fetched_at == 0.0
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fin_streamlit.earnings import earnings_reactions, reaction_column
+from fin_streamlit.mvc import models
+from fin_streamlit.mvc.prefetch import Prefetcher
+from fin_streamlit.statements import FinancialStatement, StatementSet
+
+
+def _quotes(start="2023-01-02", periods=30):
+    index = pd.bdate_range(start, periods=periods)
+    return pd.DataFrame({"Close": np.arange(100.0, 100.0 + periods)}, index=index)
+
+
+def _earnings(*reported):
+    return FinancialStatement.from_reports(
+        [
+            {
+                "fiscalDateEnding": f"2022-{month:02d}-28",
+                "reportedDate": date,
+                "reportedEPS": "1.0",
+                "estimatedEPS": "0.9",
+                "surprise": "0.1",
+                "surprisePercentage": "11.1",
+            }
+            for month, date in enumerate(reported, start=1)
+        ],
+        date_fields=("reportedDate",),
+    )
+
+
+def test_reactions_are_measured_from_the_close_before_the_report():
+    data = earnings_reactions(_earnings("2023-01-05"), _quotes())
+    (row,) = data.to_dict("records")
+    # the close of 2023-01-04 is the reference, 1 bar later is the close of the report day
+    assert row["Close before"] == 102.0
+    assert row[reaction_column(1)] == pytest.approx(103.0 / 102.0 - 1)
+    assert row[reaction_column(20)] == pytest.approx(122.0 / 102.0 - 1)
+
+
+def test_reactions_are_nan_where_the_quotes_do_not_cover_the_report():
+    data = earnings_reactions(_earnings("2022-06-01", "2023-02-01"), _quotes())
+    older, newer = data.iloc[1], data.iloc[0]
+    assert np.isnan(older["Close before"])
+    assert not np.isnan(newer[reaction_column(5)])
+    assert np.isnan(newer[reaction_column(20)])
+    assert data.index.is_monotonic_decreasing
+
+
+def test_reactions_of_empty_earnings():
+    assert earnings_reactions(FinancialStatement.from_reports([]), _quotes()).empty
+
+
+def test_earnings_model_parses_the_recorded_payload(make_client, payload):
+    models.earnings.clear()
+    statements = models.earnings(make_client(), "IBM")
+    assert isinstance(statements, StatementSet)
+    assert len(statements.quarterly) == len(payload("earnings")["quarterlyEarnings"])
+    assert statements.quarterly.table["reportedDate"].dtype.kind == "M"
+
+
+def test_prefetch_warms_the_earnings_page(make_client):
+    for model in (models.earnings, models.quotes, models.earnings_reactions):
+        model.clear()
+    client = make_client()
+    Prefetcher().warm(client, "IBM")
+    client.get_earnings = client.get_time_series_daily = None
+    assert not models.earnings_reactions(client, "IBM").empty
@@ -0,0 +1,72 @@
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+
+from fin_streamlit.charts import get_candle_chart
+from fin_streamlit.figure_cache import FigureCache, frame_version
+from fin_streamlit.parsers import parse_time_series
+from tests.conftest import load_payload
+
+
+def _figure(points=10):
+    return go.Figure(go.Scatter(x=list(range(points)), y=list(range(points))))
+
+
+def _size(figure):
+    return len(pio.to_json(figure, validate=False))
+
+
+def test_figure_is_built_once_per_key():
+    cache = FigureCache()
+    built = []
+
+    def build():
+        built.append(1)
+        return _figure()
+
+    first = cache.figure(("IBM", 1, "candle"), build)
+    assert cache.figure(("IBM", 1, "candle"), build) is first
+    cache.figure(("IBM", 2, "candle"), build)
+    assert len(built) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_figures_are_evicted_past_max_bytes():
+    cache = FigureCache(max_bytes=_size(_figure()) * 2)
+    cache.put("a", _figure())
+    cache.put("b", _figure())
+    cache.get("a")
+    cache.put("c", _figure())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_figures_larger_than_max_bytes_are_not_stored():
+    cache = FigureCache(max_bytes=_size(_figure()) - 1)
+    cache.put("a", _figure())
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_replacing_a_figure_updates_the_size():
+    cache = FigureCache()
+    cache.put("a", _figure(1000))
+    cache.put("a", _figure())
+    assert cache.nbytes == _size(_figure())
+
+
+def test_frame_version_changes_with_the_data():
+    data = parse_time_series(load_payload("time_series_daily"))
+    assert frame_version(data) == frame_version(data.copy())
+    changed = data.copy()
+    changed.iloc[-1, 0] += 1
+    assert frame_version(data) != frame_version(changed)
+
+
+def test_plotly_chart_leaves_the_shared_figure_untouched():
+    figure = get_candle_chart(parse_time_series(load_payload("time_series_daily")))
+    before = figure.to_json()
+    st.plotly_chart(figure)
+    st.plotly_chart(figure, theme=None)
+    assert figure.to_json() == before
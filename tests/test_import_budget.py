@@ -0,0 +1,70 @@
+"""Checks that the app starts without importing the modules only some pages need.
+
+The startup imports (everything app.py needs to render the Home page) are
+measured in a fresh interpreter, on top of streamlit itself which every
+page needs anyway.
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+STARTUP_MODULES = (
+    "fin_streamlit.settings",
+    "fin_streamlit.metrics",
+    "fin_streamlit.mvc.views",
+    "fin_streamlit.mvc.controller",
+)
+# modules that must only be imported once a page that needs them is dispatched
+DEFERRED_MODULES = (
+    "pandas",
+    "numpy",
+    "plotly.express",
+    "pyarrow",
+    "requests",
+    "prometheus_client",
+    "fin_streamlit.charts",
+    "fin_streamlit.mvc.models",
+    "fin_streamlit.mvc.prefetch",
+    "fin_streamlit.clients.alpha_vantage",
+)
+BUDGET_MS = 150.0
+
+_PROBE = """
+import json, sys, time
+import streamlit
+before = set(sys.modules)
+started = time.perf_counter()
+for name in {startup!r}:
+    __import__(name)
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "elapsed_ms": elapsed * 1e3,
+    "imported": sorted(set(sys.modules) - before),
+}}))
+"""
+
+
+@pytest.fixture(scope="module")
+def startup():
+    """Measures the startup imports in fresh interpreters, keeping the fastest run."""
+    runs = []
+    for _ in range(3):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(startup=STARTUP_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run["elapsed_ms"])
+
+
+def test_startup_defers_the_heavy_modules(startup):
+    imported = set(startup["imported"])
+    assert [name for name in DEFERRED_MODULES if name in imported] == []
+
+
+def test_startup_imports_fit_the_budget(startup):
+    assert startup["elapsed_ms"] < BUDGET_MS
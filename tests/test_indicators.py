@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from fin_streamlit.indicators import (
+    INDICATORS,
+    IndicatorCache,
+    compute_indicator,
+)
+from fin_streamlit.parsers import parse_time_series
+from tests.conftest import load_payload
+
+
+@pytest.fixture(scope="module")
+def quotes():
+    return parse_time_series(load_payload("time_series_daily"))
+
+
+def _revise_last_bar(data):
+    revised = data.copy()
+    revised.iloc[-1, revised.columns.get_loc("Close")] *= 1.05
+    revised.iloc[-1, revised.columns.get_loc("High")] *= 1.05
+    return revised
+
+
+@pytest.mark.parametrize("name", list(INDICATORS))
+def test_incremental_computation_matches_a_full_one(quotes, name):
+    cache = IndicatorCache()
+    cache.get("IBM", quotes.iloc[:-10], name)
+    cache.get("IBM", quotes.iloc[:-3], name)
+    result = cache.get("IBM", quotes, name)
+    pd.testing.assert_frame_equal(result.frame, compute_indicator(quotes, name))
+
+
+@pytest.mark.parametrize("name", list(INDICATORS))
+def test_a_revised_last_bar_is_recomputed(quotes, name):
+    cache = IndicatorCache()
+    cache.get("IBM", quotes, name)
+    revised = _revise_last_bar(quotes)
+    result = cache.get("IBM", revised, name)
+    pd.testing.assert_frame_equal(result.frame, compute_indicator(revised, name))
+    extended = pd.concat(
+        [revised, quotes.iloc[[-1]].set_axis([quotes.index[-1] + pd.Timedelta(days=1)])]
+    )
+    result = cache.get("IBM", extended, name)
+    pd.testing.assert_frame_equal(result.frame, compute_indicator(extended, name))
+
+
+def test_unchanged_quotes_are_served_from_the_cache(quotes):
+    cache = IndicatorCache()
+    first = cache.get("IBM", quotes, "EMA")
+    assert cache.get("ibm", quotes.copy(), "EMA") is first
+    assert cache.get("IBM", quotes, "EMA", span=10) is not first
+
+
+def test_another_window_of_history_is_recomputed(quotes):
+    cache = IndicatorCache()
+    cache.get("IBM", quotes, "Drawdown")
+    window = quotes.iloc[20:]
+    result = cache.get("IBM", window, "Drawdown")
+    pd.testing.assert_frame_equal(result.frame, compute_indicator(window, "Drawdown"))
+
+
+def test_cache_drops_the_least_recently_used_results(quotes):
+    cache = IndicatorCache(maxsize=2)
+    first = cache.get("A", quotes, "SMA")
+    cache.get("B", quotes, "SMA")
+    cache.get("C", quotes, "SMA")
+    assert cache.get("A", quotes, "SMA") is not first
+    assert "size=2" in repr(cache)
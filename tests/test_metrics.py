@@ -0,0 +1,81 @@
+import socket
+import urllib.request
+
+import pytest
+
+from fin_streamlit import metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_counter_and_summary_keep_values_per_label_set():
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter("calls", "Calls.", ["endpoint"])
+    summary = registry.summary("seconds", "Seconds.", ["endpoint"])
+    counter.inc(endpoint="A")
+    counter.inc(2, endpoint="A")
+    summary.observe(0.5, endpoint="A")
+    summary.observe(1.5, endpoint="A")
+    assert counter.value(endpoint="A") == 3
+    assert counter.value(endpoint="B") == 0
+    assert summary.samples() == {("A",): (2, 2.0)}
+    with pytest.raises(ValueError):
+        counter.inc(other="A")
+    with pytest.raises(ValueError):
+        registry.counter("calls", "Again.")
+    registry.clear()
+    assert not counter.samples()
+
+
+def test_trace_request_records_the_outcome_and_http_calls():
+    with metrics.trace_request("OVERVIEW") as trace:
+        metrics.record_http_response("OVERVIEW", 200, 100, retries=1, elapsed=0.2)
+        metrics.record_throttle("OVERVIEW", "minute")
+        trace.outcome = "fetched"
+    with pytest.raises(RuntimeError):
+        with metrics.trace_request("OVERVIEW"):
+            raise RuntimeError("down")
+    assert metrics.REQUESTS.value(endpoint="OVERVIEW", outcome="fetched") == 1
+    assert metrics.REQUESTS.value(endpoint="OVERVIEW", outcome="error") == 1
+    latest, previous = metrics.recent_requests()[:2]
+    assert latest["outcome"] == "error"
+    assert (previous["status"], previous["bytes"], previous["retries"]) == (200, 100, 1)
+    (summary,) = metrics.endpoint_summary()
+    assert summary["requests"] == 2
+    assert summary["errors"] == 1
+    assert summary["http calls"] == 1
+    assert summary["throttled"] == 1
+
+
+def test_phases_are_attributed_to_the_page():
+    with metrics.page("load_quotes"):
+        with metrics.phase("load"):
+            pass
+    assert set(metrics.last_phases("load_quotes")) == {"load", "total"}
+    assert metrics.PHASE_SECONDS.samples()[("load_quotes", "load")][0] == 1
+
+
+def test_metrics_are_served_to_prometheus():
+    pytest.importorskip("prometheus_client")
+    metrics.REQUESTS.inc(endpoint="OVERVIEW", outcome="cache_hit")
+    metrics.PHASE_SECONDS.observe(0.25, page="load_quotes", phase="load")
+    port = _free_port()
+    assert metrics.start_metrics_server(port, host="127.0.0.1")
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        body = response.read().decode()
+    assert (
+        'alpha_vantage_requests_total{endpoint="OVERVIEW",outcome="cache_hit"} 1.0'
+        in body
+    )
+    assert 'dashboard_phase_seconds_sum{page="load_quotes",phase="load"} 0.25' in body
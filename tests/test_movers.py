@@ -0,0 +1,90 @@
+import threading
+
+from fin_streamlit.movers import MOVER_LISTS, MoversFeed, MoversSnapshot
+from tests.conftest import load_payload
+
+
+class FakeClient:
+    def __init__(self, payload=None):
+        self.payload = payload or load_payload("top_gainers_and_losers")
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_top_gainers_and_losers(self):
+        self.release.wait(5)
+        self.calls += 1
+        return self.payload
+
+    def freshness(self, endpoint):
+        return None
+
+
+def test_snapshot_parses_typed_frames():
+    snapshot = MoversSnapshot.from_payload(load_payload("top_gainers_and_losers"))
+    assert set(snapshot.tables) == set(MOVER_LISTS)
+    gainers = snapshot.tables["top_gainers"]
+    assert gainers["change_percentage"].dtype == "f8"
+    assert gainers["volume"].dtype == "i8"
+    assert MoversSnapshot.from_payload({"Information": "limit"}) is None
+
+
+def _started(client, ttl=300.0):
+    feed = MoversFeed(ttl=ttl)
+    assert feed.start(client)
+    feed._thread.join(5)
+    return feed
+
+
+def test_start_fetches_the_first_snapshot_in_the_background():
+    client = FakeClient()
+    client.release.clear()
+    feed = MoversFeed(ttl=300.0)
+    assert feed.start(client)
+    assert not feed.start(client)
+    assert feed.get(client) is None
+    client.release.set()
+    feed._thread.join(5)
+    assert feed.get(client) is not None
+    assert not feed.start(client)
+    assert client.calls == 1
+
+
+def test_get_does_not_wait_for_the_first_snapshot():
+    client = FakeClient()
+    client.release.clear()
+    feed = MoversFeed(ttl=300.0)
+    assert feed.get(client) is None
+    client.release.set()
+    feed._thread.join(5)
+    assert feed.snapshot is not None
+
+
+def test_fresh_snapshot_is_served_without_calling_the_api():
+    client = FakeClient()
+    feed = _started(client)
+    for _ in range(3):
+        feed.get(client)
+    assert client.calls == 1
+    assert not feed.expired
+
+
+def test_expired_snapshot_is_served_while_it_is_refreshed():
+    client = FakeClient()
+    feed = _started(client, ttl=0.0)
+    first = feed.snapshot
+    client.release.clear()
+    assert feed.get(client) is first
+    client.release.set()
+    feed._thread.join(5)
+    assert client.calls == 2
+    assert feed.snapshot is not first
+
+
+def test_failed_refresh_keeps_the_last_snapshot():
+    client = FakeClient()
+    feed = _started(client)
+    first = feed.snapshot
+    client.payload = {"Information": "limit"}
+    assert not feed.refresh(client)
+    assert feed.snapshot is first
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from fin_streamlit.exc import NewsUnavailable
+from fin_streamlit.news import NewsStore, iter_news, parse_feed
+from tests.conftest import load_payload
+
+SINCE = datetime(2023, 10, 1)
+
+
+class FakeClient:
+    """Answers NEWS_SENTIMENT with the recorded feed, filtered by `time_from`."""
+
+    def __init__(self, payload=None, fail=False):
+        self.payload = (
+            payload if payload is not None else load_payload("market_news_sentiment")
+        )
+        self.fail = fail
+        self.calls = []
+
+    def get_market_news_sentiment(self, symbol, **kwargs):
+        self.calls.append(kwargs)
+        if self.fail:
+            return {}
+        feed = sorted(
+            (
+                i
+                for i in self.payload["feed"]
+                if i["time_published"] >= kwargs["time_from"]
+            ),
+            key=lambda i: i["time_published"],
+        )
+        return {**self.payload, "feed": feed[: kwargs["limit"]]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NewsStore(str(tmp_path / "news.db"))
+
+
+def test_parse_feed_keeps_the_fields_of_the_page():
+    articles = list(parse_feed(load_payload("market_news_sentiment")))
+    assert len(articles) == 50
+    assert articles[0].tickers[0].ticker == "PYPL"
+    assert isinstance(articles[0].tickers[0].score, float)
+
+
+def test_parse_feed_skips_items_without_url():
+    assert not list(parse_feed({"feed": [{"time_published": "20231019T134900"}]}))
+
+
+def test_iter_news_pages_from_the_newest_article():
+    client = FakeClient()
+    pages = list(iter_news(client, "AAPL", SINCE, page_size=20, max_pages=10))
+    assert [len(p) for p in pages][:2] == [20, 20]
+    assert client.calls[1]["time_from"] == max(a.published for a in pages[0])[:13]
+    assert "time_to" not in client.calls[0]
+
+
+def test_iter_news_raises_on_error_payloads():
+    with pytest.raises(NewsUnavailable):
+        list(iter_news(FakeClient(fail=True), "AAPL", SINCE))
+    client = FakeClient()
+    client.get_market_news_sentiment = lambda symbol, **kwargs: {"Note": "limit"}
+    with pytest.raises(NewsUnavailable):
+        list(iter_news(client, "AAPL", SINCE))
+
+
+def test_add_skips_stored_articles(store):
+    articles = list(parse_feed(load_payload("market_news_sentiment")))
+    assert store.add(articles) == 50
+    assert store.add(articles) == 0
+
+
+def test_refresh_stores_the_news_and_moves_the_cursor(store):
+    client = FakeClient()
+    added = store.refresh(client, ["aapl"], lookback=timedelta(days=365 * 10))
+    assert added == {"AAPL": 50}
+    published, refreshed_at = store.cursor("AAPL")
+    assert published == "20231022T234800"
+    assert refreshed_at is not None
+    assert store.refresh(client, ["AAPL"]) == {}
+
+
+def test_refresh_resumes_from_the_cursor(store):
+    client = FakeClient()
+    store.refresh(client, ["AAPL"], lookback=timedelta(days=365 * 10))
+    store.refresh(client, ["AAPL"], max_age=timedelta(0))
+    assert client.calls[-1]["time_from"] == "20231022T2348"
+
+
+def test_refresh_does_not_advance_the_cursor_on_failure(store):
+    assert store.refresh(FakeClient(fail=True), ["AAPL"]) == {"AAPL": 0}
+    assert store.cursor("AAPL") == (None, None)
+    assert store.stale(["AAPL"], timedelta(hours=1)) == ["AAPL"]
+
+
+def test_refresh_keeps_the_pages_stored_before_a_failure(store):
+    class FailingSecondPage(FakeClient):
+        def get_market_news_sentiment(self, symbol, **kwargs):
+            self.fail = bool(self.calls)
+            return super().get_market_news_sentiment(symbol, **kwargs)
+
+    client = FailingSecondPage()
+    added = store.refresh(
+        client, ["AAPL"], lookback=timedelta(days=365 * 10), page_size=20
+    )
+    published, refreshed_at = store.cursor("AAPL")
+    assert added == {"AAPL": 20}
+    assert published is not None and refreshed_at is None
+
+
+def test_feed_and_daily_sentiment(store):
+    store.add(parse_feed(load_payload("market_news_sentiment")))
+    feed = store.feed(["AAPL"], limit=5)
+    assert len(feed) == 5
+    assert feed["published"].is_monotonic_decreasing
+    sentiment = store.daily_sentiment(["AAPL"])
+    assert list(sentiment.columns) == ["AAPL"]
+    assert sentiment.index.is_monotonic_increasing
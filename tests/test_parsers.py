@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from fin_streamlit.clients import utils
+from fin_streamlit.parsers import (
+    QUOTE_DTYPE,
+    find_time_series,
+    parse_time_series,
+    records_to_frame,
+    time_series_records,
+)
+
+
+def test_parse_time_series_builds_a_typed_sorted_frame(payload):
+    daily = payload("time_series_daily")
+    frame = parse_time_series(daily)
+    assert list(frame.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert frame.index.is_monotonic_increasing
+    assert frame.index.name == "Date"
+    assert frame["Close"].dtype == "f8"
+    assert frame["Volume"].dtype == "i8"
+    series = find_time_series(daily)
+    assert len(frame) == len(series)
+    last = max(series)
+    assert frame["Close"].iloc[-1] == float(series[last]["4. close"])
+
+
+@pytest.mark.parametrize("name", ["time_series_weekly", "time_series_monthly"])
+def test_parse_time_series_handles_every_interval(payload, name):
+    frame = parse_time_series(payload(name))
+    assert not frame.empty
+    assert frame.index.is_monotonic_increasing
+
+
+@pytest.mark.parametrize("empty", [None, {}, {"Error Message": "Invalid API call"}])
+def test_parse_time_series_of_an_invalid_payload_is_empty(empty):
+    frame = parse_time_series(empty)
+    assert frame.empty
+    assert list(frame.columns) == ["Open", "High", "Low", "Close", "Volume"]
+
+
+def test_records_round_trip_to_the_parsed_frame(payload):
+    daily = payload("time_series_daily")
+    records = time_series_records(find_time_series(daily))
+    assert records.dtype == QUOTE_DTYPE
+    assert np.all(np.diff(records["Date"].astype("i8")) > 0)
+    assert records_to_frame(records).equals(parse_time_series(daily))
+
+
+def test_json_loads_falls_back_to_json(monkeypatch):
+    monkeypatch.setattr(utils, "orjson", None)
+    assert utils.json_loads(b'{"a": [1, 2.5]}') == {"a": [1, 2.5]}
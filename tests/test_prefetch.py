@@ -0,0 +1,56 @@
+import threading
+
+from fin_streamlit.clients import rate_limit
+from fin_streamlit.clients.rate_limit import Priority
+from fin_streamlit.mvc.prefetch import Prefetcher
+
+
+class RecordingLoader:
+    def __init__(self, name="loader", fail=False):
+        self.__name__ = name
+        self.fail = fail
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, client, symbol):
+        with self._lock:
+            self.calls.append((client, symbol, rate_limit._request_priority.get()))
+        if self.fail:
+            raise RuntimeError("boom")
+
+
+def test_warm_calls_every_loader_with_background_priority():
+    first, second = RecordingLoader("first"), RecordingLoader("second")
+    Prefetcher(loaders=(first, second)).warm("client", "IBM")
+    assert first.calls == [("client", "IBM", Priority.BACKGROUND)]
+    assert second.calls == [("client", "IBM", Priority.BACKGROUND)]
+
+
+def test_warm_carries_on_after_a_failing_loader():
+    failing, after = RecordingLoader("failing", fail=True), RecordingLoader("after")
+    Prefetcher(loaders=(failing, after)).warm("client", "IBM")
+    assert len(after.calls) == 1
+
+
+def test_submit_warms_on_the_background_thread():
+    loader = RecordingLoader()
+    prefetcher = Prefetcher(loaders=(loader,))
+    assert prefetcher.submit("client", "IBM")
+    assert prefetcher.submit("client", "AAPL")
+    prefetcher.join()
+    assert sorted(symbol for _, symbol, _ in loader.calls) == ["AAPL", "IBM"]
+
+
+def test_submit_skips_recently_warmed_symbols():
+    loader = RecordingLoader()
+    prefetcher = Prefetcher(loaders=(loader,), refresh_after=600.0)
+    assert prefetcher.submit("client", "IBM")
+    assert not prefetcher.submit("client", "IBM")
+    prefetcher.join()
+    assert len(loader.calls) == 1
+
+    prefetcher = Prefetcher(loaders=(loader,), refresh_after=0.0)
+    assert prefetcher.submit("client", "IBM")
+    assert prefetcher.submit("client", "IBM")
+    prefetcher.join()
+    assert len(loader.calls) == 3
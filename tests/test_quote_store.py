@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from fin_streamlit.parsers import find_time_series, time_series_records
+from fin_streamlit.quote_store import QuoteStore
+
+
+class FakeClient:
+    """Serves the given daily series and records the output sizes asked for."""
+
+    def __init__(self, series):
+        self.series = series
+        self.full_history_requests = []
+
+    def get_time_series_daily(self, symbol, return_full_history=False, **kwargs):
+        self.full_history_requests.append(return_full_history)
+        return {"Time Series (Daily)": self.series}
+
+
+@pytest.fixture
+def series(payload):
+    return find_time_series(payload("time_series_daily"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return QuoteStore(str(tmp_path))
+
+
+def _older(series, days):
+    """Drops the `days` most recent bars of the series."""
+    return {date: series[date] for date in sorted(series)[:-days]}
+
+
+def test_load_of_an_unknown_symbol_is_empty(store):
+    assert store.load("IBM").size == 0
+    assert store.last_date("IBM") is None
+    assert not store.has_full_history("IBM")
+
+
+def test_write_round_trips_through_the_memory_map(store, series):
+    records = time_series_records(series)
+    store.write("ibm", records, full_history=True)
+    assert np.array_equal(store.load("IBM"), records)
+    assert store.has_full_history("IBM")
+    assert store.last_date("IBM") == records["Date"][-1]
+
+
+def test_append_replaces_the_last_bar_and_adds_newer_ones(store, series):
+    records = time_series_records(series)
+    store.write("IBM", records[:-2], full_history=False)
+    revised = records.copy()
+    revised["Close"][-3] += 1.0
+    assert store.append("IBM", revised[-3:]) == 2
+    stored = store.load("IBM")
+    assert len(stored) == len(records)
+    assert stored["Close"][-3] == revised["Close"][-3]
+    assert store.append("IBM", records[:-5]) == 0
+
+
+def test_refresh_fetches_the_compact_series_once_history_is_stored(store, series):
+    client = FakeClient(_older(series, 3))
+    first = store.refresh(client, "IBM", return_full_history=True)
+    assert len(first) == len(series) - 3
+    client.series = series
+    refreshed = store.refresh(client, "IBM", return_full_history=True)
+    assert client.full_history_requests == [True, False]
+    assert len(refreshed) == len(series)
+    assert store.has_full_history("IBM")
+
+
+def test_refresh_serves_stored_quotes_when_nothing_is_fetched(store, series):
+    store.refresh(FakeClient(series), "IBM")
+    assert len(store.refresh(FakeClient({}), "IBM")) == len(series)
+
+
+def test_refresh_refetches_the_full_history_after_a_gap(store, series):
+    dates = sorted(series)
+    old = {date: series[date] for date in dates[:10]}
+    store.refresh(FakeClient(old), "IBM", return_full_history=True)
+    client = FakeClient({date: series[date] for date in dates[20:]})
+    store.refresh(client, "IBM", return_full_history=True)
+    assert client.full_history_requests == [False, True]
+    assert store.load("IBM")["Date"][0] == np.datetime64(dates[20])
@@ -0,0 +1,70 @@
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from fin_streamlit.charts import MAX_CANDLES
+from tests.conftest import load_payload
+
+HISTORY_DAYS = 3000
+
+
+class LongHistoryClient:
+    """Serves the recorded compact quotes and a long synthetic full history."""
+
+    def __init__(self):
+        self.full_requests = 0
+
+    def get_time_series_daily(self, symbol, return_full_history=False, **kwargs):
+        payload = load_payload("time_series_daily")
+        if not return_full_history:
+            return payload
+        self.full_requests += 1
+        dates = pd.bdate_range(end="2023-10-20", periods=HISTORY_DAYS)
+        close = 100 + np.sin(np.arange(HISTORY_DAYS) / 50) * 10
+        series = {
+            date.strftime("%Y-%m-%d"): {
+                "1. open": f"{c:.4f}",
+                "2. high": f"{c + 1:.4f}",
+                "3. low": f"{c - 1:.4f}",
+                "4. close": f"{c:.4f}",
+                "5. volume": "1000",
+            }
+            for date, c in zip(dates[::-1], close[::-1])
+        }
+        return {"Meta Data": payload["Meta Data"], "Time Series (Daily)": series}
+
+    def freshness(self, endpoint, symbol=None):
+        return None
+
+
+def _quotes_page():
+    # AppTest runs the source of the function as a script, imports included
+    from fin_streamlit.mvc import models
+    from fin_streamlit.mvc.controller import DashboardController
+    from tests.test_quotes_page import LongHistoryClient
+
+    models.quotes.clear()
+    DashboardController("LONGHISTORY", LongHistoryClient()).load_quotes()
+
+
+def _candles(spec: dict) -> int:
+    x = spec["data"][0]["x"]
+    if isinstance(x, dict):
+        return len(base64.b64decode(x["bdata"])) // np.dtype(x["dtype"]).itemsize
+    return len(x)
+
+
+def test_quotes_chart_downsamples_the_full_history():
+    app = AppTest.from_function(_quotes_page, default_timeout=60).run()
+    assert not app.exception
+    assert not app.get("plotly_chart")
+    app.checkbox[0].check().run()
+    assert not app.exception
+    (chart,) = app.get("plotly_chart")
+    candles = _candles(json.loads(chart.proto.spec))
+    assert 0 < candles <= MAX_CANDLES
+    (start, end) = app.slider[0].value
+    assert (end - start).days > 365 * 10
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from fin_streamlit.clients.rate_limit import (
+    Priority,
+    RequestScheduler,
+    Throttle,
+    TokenBucket,
+    detect_throttle,
+    request_priority,
+)
+from fin_streamlit.exc import RateLimitExceeded
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_a_burst_then_refills_continuously():
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=5, period=60, clock=clock)
+    for _ in range(5):
+        assert bucket.delay() == 0
+        bucket.consume()
+    assert bucket.delay() == pytest.approx(12)
+    clock.now = 12
+    assert bucket.delay() == 0
+
+
+def test_token_bucket_drain_waits_a_full_interval():
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=5, period=60, clock=clock)
+    bucket.drain()
+    assert bucket.delay() == pytest.approx(12)
+
+
+@pytest.mark.parametrize(
+    "payload, throttle",
+    [
+        (
+            {
+                "Note": "Thank you! Our standard API call frequency is 5 calls per minute"
+            },
+            Throttle.MINUTE,
+        ),
+        (
+            {"Information": "You have reached the rate limit of 25 requests per day"},
+            Throttle.DAILY,
+        ),
+        (
+            {
+                "Information": "Please consider spreading out your requests more sparingly"
+            },
+            Throttle.MINUTE,
+        ),
+        ({"Information": "The demo API key is for demo purposes only"}, None),
+        ({"Symbol": "IBM"}, None),
+        ([], None),
+    ],
+)
+def test_detect_throttle(payload, throttle):
+    assert detect_throttle(payload) is throttle
+
+
+def test_scheduler_enforces_the_daily_budget():
+    scheduler = RequestScheduler(calls_per_minute=100, calls_per_day=2)
+    scheduler.acquire()
+    scheduler.acquire()
+    assert scheduler.calls_today == 2
+    with pytest.raises(RateLimitExceeded):
+        scheduler.acquire()
+
+
+def test_scheduler_refuses_requests_once_the_daily_budget_is_exhausted():
+    scheduler = RequestScheduler(calls_per_minute=100)
+    scheduler.exhaust_daily_budget()
+    with pytest.raises(RateLimitExceeded):
+        scheduler.acquire()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_interactive_requests_overtake_waiting_background_ones():
+    # one token every 0.5 seconds, emptied so both requests have to queue
+    scheduler = RequestScheduler(calls_per_minute=120)
+    scheduler.penalize()
+    served = []
+
+    def acquire(priority: Priority) -> None:
+        with request_priority(priority):
+            scheduler.acquire()
+        served.append(priority)
+
+    background = threading.Thread(target=acquire, args=(Priority.BACKGROUND,))
+    background.start()
+    _wait_for(lambda: scheduler.queue_length == 1)
+    interactive = threading.Thread(target=acquire, args=(Priority.INTERACTIVE,))
+    interactive.start()
+    background.join(5)
+    interactive.join(5)
+    assert served == [Priority.INTERACTIVE, Priority.BACKGROUND]
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fin_streamlit.mvc import models
+from fin_streamlit.mvc.prefetch import DEFAULT_LOADERS, Prefetcher
+from fin_streamlit.ratios import (
+    RATIOS,
+    RatioCache,
+    align_statements,
+    compute_ratios,
+    statement_version,
+)
+from fin_streamlit.statements import FinancialStatement, Period, StatementSet
+from tests.conftest import load_payload
+
+
+def _statement(**items):
+    years = len(next(iter(items.values())))
+    return FinancialStatement.from_reports(
+        [
+            {
+                "fiscalDateEnding": f"{2018 + year}-12-31",
+                **{name: str(values[year]) for name, values in items.items()},
+            }
+            for year in range(years)
+        ]
+    )
+
+
+@pytest.fixture
+def statements():
+    return {
+        name: StatementSet.from_payload(load_payload(name)).annual
+        for name in ("balance_sheet", "income_statement", "cash_flow")
+    }
+
+
+def test_align_takes_shared_items_from_the_income_statement():
+    balance = _statement(netIncome=[1, 1], totalAssets=[10, 20])
+    income = _statement(netIncome=[2, 4], totalRevenue=[8, 10])
+    frame = align_statements(balance, income, _statement(operatingCashflow=[3, 3]))
+    assert frame["netIncome"].tolist() == [2.0, 4.0]
+    assert frame.index.is_monotonic_increasing
+
+
+def test_ratios_of_small_statements():
+    balance = _statement(
+        totalAssets=[10, 20, 40, 80], totalShareholderEquity=[5, 0, 10, 20]
+    )
+    income = _statement(totalRevenue=[100, 110, 121, 200], netIncome=[1, 2, 3, 4])
+    cash = _statement(operatingCashflow=[5, 5, 5, 5], capitalExpenditures=[1, 2, 3, 4])
+    ratios = compute_ratios(balance, income, cash)
+    assert list(ratios.columns) == list(RATIOS)
+    assert ratios["ROA"].tolist() == [0.1, 0.1, 0.075, 0.05]
+    assert np.isnan(ratios["ROE"].iloc[1])
+    assert ratios["FreeCashFlow"].tolist() == [4.0, 3.0, 2.0, 1.0]
+    assert ratios["RevenueGrowthYoY"].iloc[1:3].tolist() == pytest.approx([0.1, 0.1])
+    assert ratios["RevenueCAGR3Y"].iloc[3] == pytest.approx(2 ** (1 / 3) - 1)
+    assert np.isnan(ratios["RevenueCAGR3Y"].iloc[2])
+
+
+def test_ratios_of_the_recorded_statements(statements):
+    ratios = compute_ratios(**statements)
+    assert (ratios.dtypes == "f8").all()
+    assert ratios["GrossMargin"].dropna().between(0, 1).all()
+
+
+def test_statement_version_changes_with_a_restated_value():
+    before = _statement(totalAssets=[10, 20])
+    assert statement_version(before) == statement_version(
+        _statement(totalAssets=[10, 20])
+    )
+    assert statement_version(before) != statement_version(
+        _statement(totalAssets=[10, 21])
+    )
+
+
+def test_cache_only_recomputes_changed_statements(statements, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        "fin_streamlit.ratios.compute_ratios",
+        lambda *args: calls.append(args) or pd.DataFrame(),
+    )
+    cache = RatioCache(maxsize=1)
+    cache.get("IBM", "Annual", **statements)
+    cache.get("ibm", "Annual", **statements)
+    assert len(calls) == 1
+    cache.get("AAPL", "Annual", **statements)
+    cache.get("IBM", "Annual", **statements)
+    assert len(calls) == 3
+
+
+def test_prefetch_warms_the_annual_ratios(make_client):
+    assert any(loader.__name__ == "annual_ratios" for loader in DEFAULT_LOADERS)
+    models.ratios.clear()
+    client = make_client()
+    Prefetcher().warm(client, "IBM")
+    client.get_balance_sheet = client.get_income_statement = client.get_cash_flow = None
+    assert not models.ratios(client, "IBM", Period.ANNUAL).empty
@@ -0,0 +1,77 @@
+import json
+import os
+
+import requests
+
+from fin_streamlit import settings
+from fin_streamlit.clients.alpha_vantage import AlphaVantageClient
+from fin_streamlit.clients.cache import (
+    InMemoryResponseCache,
+    get_default_cache,
+)
+from fin_streamlit.clients.rate_limit import RequestScheduler
+from fin_streamlit.clients.replay import (
+    FixtureStore,
+    RecordingSession,
+    ReplaySession,
+)
+from fin_streamlit.settings import Settings
+from tests.conftest import DATA_DIR
+
+
+def test_fixture_store_prefers_per_symbol_fixtures(tmp_path, payload):
+    store = FixtureStore(str(tmp_path))
+    params = {"function": "OVERVIEW", "symbol": "ibm"}
+    assert store.load(params) is None
+    path = store.save(params, b'{"Symbol": "IBM"}')
+    assert path == os.path.join(str(tmp_path), "overview", "IBM.json")
+    assert store.load({"function": "OVERVIEW", "symbol": "IBM"}) == b'{"Symbol": "IBM"}'
+    legacy = FixtureStore(DATA_DIR).load({"function": "OVERVIEW", "symbol": "MSFT"})
+    assert json.loads(legacy) == payload("company_overview")
+
+
+def test_replay_session_answers_missing_fixtures_like_an_invalid_call():
+    session = ReplaySession(FixtureStore(DATA_DIR))
+    response = session.get("unused", params={"function": "UNKNOWN", "symbol": "IBM"})
+    response.raise_for_status()
+    assert "Error Message" in response.json()
+
+
+def test_recording_session_records_only_valid_responses(tmp_path, stub_server):
+    store = FixtureStore(str(tmp_path))
+    session = RecordingSession(requests.Session(), store)
+    session.get(stub_server.base_url, params={"function": "EARNINGS", "symbol": "IBM"})
+    session.get(stub_server.base_url, params={"function": "UNKNOWN", "symbol": "IBM"})
+    assert os.listdir(str(tmp_path)) == ["earnings"]
+
+
+def test_client_replays_fixtures_without_an_api_key(monkeypatch, payload):
+    monkeypatch.setattr(Settings, "ALPHA_VANTAGE_TRANSPORT", "replay")
+    monkeypatch.setattr(Settings, "ALPHA_VANTAGE_FIXTURES_DIR", DATA_DIR)
+    monkeypatch.setattr(Settings, "ALPHA_VANTAGE_API_KEY", None)
+    client = AlphaVantageClient(
+        cache=InMemoryResponseCache(),
+        scheduler=RequestScheduler(calls_per_minute=6000),
+        base_url="http://replay.invalid/query",
+    )
+    assert client.get_earnings("IBM") == payload("earnings")
+
+
+def test_other_sources_get_their_own_cache_directory():
+    live = settings._cache_dir("live", settings.DEFAULT_BASE_URL, "tests/data")
+    stub = settings._cache_dir("live", "http://127.0.0.1:8765/query", "tests/data")
+    replay = settings._cache_dir("replay", settings.DEFAULT_BASE_URL, "tests/data")
+    other = settings._cache_dir("replay", settings.DEFAULT_BASE_URL, "fixtures")
+    assert live == ".cache"
+    assert len({live, stub, replay, other}) == 4
+    assert all(os.path.dirname(d) == ".cache" for d in (stub, replay, other))
+
+
+def test_clients_of_another_api_do_not_share_the_persistent_cache(stub_server):
+    client = AlphaVantageClient(
+        scheduler=RequestScheduler(calls_per_minute=6000),
+        base_url=stub_server.base_url,
+    )
+    assert client._cache is not None
+    assert client._cache is not get_default_cache()
+    assert AlphaVantageClient()._cache is get_default_cache()
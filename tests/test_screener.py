@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fin_streamlit.screener import (
+    OVERVIEW_UPDATED_AT,
+    STATEMENT_RATIOS,
+    ScreenerTable,
+    parse_overviews,
+)
+
+
+@pytest.fixture
+def table(tmp_path):
+    return ScreenerTable(str(tmp_path / "screener.parquet"))
+
+
+def _overview(payload, symbol, sector, pe_ratio):
+    return {
+        **payload("company_overview"),
+        "Symbol": symbol,
+        "Sector": sector,
+        "PERatio": pe_ratio,
+    }
+
+
+def test_parse_overviews_types_the_columns(payload):
+    frame = parse_overviews(
+        {"aapl": _overview(payload, "AAPL", "TECHNOLOGY", "None"), "gone": {}}
+    )
+    assert list(frame.index) == ["AAPL"]
+    assert frame["Sector"].dtype == "category"
+    assert frame["MarketCapitalization"].dtype == "f8"
+    assert np.isnan(frame.loc["AAPL", "PERatio"])
+    assert "Description" not in frame
+
+
+def test_refresh_fetches_only_stale_symbols_and_persists_the_table(table, make_client):
+    client = make_client()
+    assert table.refresh(client, ["ibm", "AAPL"]) == (2, 0)
+    assert table.refresh(client, ["IBM", "AAPL", "MSFT"]) == (1, 0)
+    assert sorted(ScreenerTable(table.path).frame.index) == ["AAPL", "IBM", "MSFT"]
+    assert table.stale(["IBM"], OVERVIEW_UPDATED_AT, timedelta(0)) == ["IBM"]
+
+
+def test_refresh_with_statements_adds_the_ratios(table, make_client):
+    assert table.refresh(make_client(), ["IBM"], with_statements=True) == (4, 0)
+    row = table.query(["IBM"]).iloc[0]
+    assert set(STATEMENT_RATIOS) <= set(row.index)
+    assert not np.isnan(row["GrossMargin"])
+
+
+def test_query_filters_and_sorts_on_the_local_table(table, payload):
+    table.update(
+        parse_overviews(
+            {
+                "A": _overview(payload, "A", "TECHNOLOGY", "10"),
+                "B": _overview(payload, "B", "ENERGY", "20"),
+                "C": _overview(payload, "C", "TECHNOLOGY", "30"),
+                "D": _overview(payload, "D", "TECHNOLOGY", "None"),
+            }
+        ).assign(**{OVERVIEW_UPDATED_AT: pd.Timestamp.now()})
+    )
+    result = table.query(sectors=["TECHNOLOGY"], sort_by="PERatio")
+    assert list(result.index) == ["C", "A", "D"]
+    assert OVERVIEW_UPDATED_AT not in result
+    result = table.query(["a", "b", "c"], ranges={"PERatio": (15.0, 30.0)})
+    assert sorted(result.index) == ["B", "C"]
+    assert "PERatio" in table.numeric_columns
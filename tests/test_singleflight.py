@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from fin_streamlit.clients.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"value": 1}
+
+    threads, results, _ = _run_concurrently(flight, "key", fn, callers=5)
+    while flight.shared < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 5
+    assert "in_flight=0" in repr(flight)
+
+
+def test_waiting_callers_get_the_leader_error():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise RuntimeError("down")
+
+    threads, results, errors = _run_concurrently(flight, "key", fn, callers=3)
+    while flight.shared < 2:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert not results
+    assert len(errors) == 3
+
+
+def test_calls_are_not_shared_once_finished_or_with_other_keys():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    assert flight.do("b", lambda: 3) == 3
+    assert flight.shared == 0
+    with pytest.raises(ValueError):
+        flight.do("a", lambda: int("x"))
+    assert flight.do("a", lambda: 4) == 4
+
+
+def test_async_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def main():
+        shared = await asyncio.gather(*(flight.do("key", fn) for _ in range(4)))
+        again = await flight.do("key", fn)
+        return shared, again
+
+    shared, again = asyncio.run(main())
+    assert shared == [1, 1, 1, 1]
+    assert again == 2
+    assert flight.shared == 3
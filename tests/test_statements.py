@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from fin_streamlit.mvc import models
+from fin_streamlit.statements import FinancialStatement, Period, StatementSet
+
+
+def test_from_reports_builds_a_numeric_date_indexed_table(payload):
+    reports = payload("balance_sheet")["annualReports"]
+    statement = FinancialStatement.from_reports(reports)
+    assert len(statement) == len(reports)
+    assert statement.currency == reports[0]["reportedCurrency"]
+    assert statement.table.index.is_monotonic_increasing
+    assert all(dtype == "f8" for dtype in statement.table.dtypes)
+    newest = max(reports, key=lambda r: r["fiscalDateEnding"])
+    assert statement.row("totalAssets").iloc[-1] == float(newest["totalAssets"])
+
+
+def test_from_reports_turns_text_into_nan_and_parses_date_fields():
+    statement = FinancialStatement.from_reports(
+        [
+            {"fiscalDateEnding": "2020-12-31", "reportedDate": "2021-01-20"},
+            {"fiscalDateEnding": "2019-12-31", "eps": "1.5", "other": "-"},
+            {"fiscalDateEnding": "n/a", "eps": "2"},
+        ]
+    )
+    table = statement.table
+    assert list(table.index) == [pd.Timestamp("2019-12-31"), pd.Timestamp("2020-12-31")]
+    assert list(table.columns) == ["reportedDate", "eps", "other"]
+    assert table["reportedDate"].iloc[-1] == pd.Timestamp("2021-01-20")
+    assert table["eps"].iloc[0] == 1.5
+    assert np.isnan(table["eps"].iloc[-1])
+    assert table["other"].isna().all()
+
+
+def test_from_reports_without_reports_is_empty():
+    assert FinancialStatement.from_reports(None).empty
+    assert FinancialStatement.from_reports([{"totalAssets": "1"}]).empty
+
+
+def test_frame_shows_the_newest_fiscal_date_first(payload):
+    statement = FinancialStatement.from_reports(
+        payload("income_statement")["annualReports"]
+    )
+    frame = statement.frame
+    assert list(frame.index) == statement.line_items
+    assert list(frame.columns) == sorted(frame.columns, reverse=True)
+    assert not (statement.chart_frame == 0).any().any()
+
+
+def test_row_of_a_missing_item_is_all_nan(payload):
+    statement = FinancialStatement.from_reports(payload("cash_flow")["annualReports"])
+    row = statement.row("missingItem")
+    assert row.index.equals(statement.table.index)
+    assert row.isna().all()
+
+
+def test_statement_set_parses_both_periods(payload):
+    statements = StatementSet.from_payload(payload("balance_sheet"))
+    assert statements.get(Period.ANNUAL) is statements.annual
+    assert statements.get(Period.QUARTERLY) is statements.quarterly
+    assert len(statements.quarterly) > len(statements.annual)
+    assert StatementSet.from_payload(None).annual.empty
+
+
+def test_statement_models_keep_the_derived_frames_across_reruns(make_client):
+    models.balance_sheet.clear()
+    client = make_client()
+    statement = models.balance_sheet(client, "IBM").annual
+    chart_frame, frame = statement.chart_frame, statement.frame
+    client.get_balance_sheet = None
+    rerun = models.balance_sheet(client, "IBM").annual
+    assert rerun.chart_frame is chart_frame
+    assert rerun.frame is frame
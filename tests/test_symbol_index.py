@@ -0,0 +1,55 @@
+import pytest
+
+from fin_streamlit.mvc import models
+from fin_streamlit.symbol_index import SYMBOL_KEY, SymbolIndex
+
+
+class CountingClient:
+    def __init__(self, matches):
+        self.matches = matches
+        self.calls = []
+
+    def get_search_results(self, keywords, **kwargs):
+        self.calls.append(keywords)
+        return {"bestMatches": self.matches}
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = SymbolIndex()
+    monkeypatch.setattr(models, "get_symbol_index", lambda: index)
+    models._search_matches.clear()
+    yield index
+    models._search_matches.clear()
+
+
+def _symbols(matches):
+    return [match[SYMBOL_KEY] for match in matches]
+
+
+def test_search_ranks_exact_tickers_then_prefixes_then_names(payload):
+    index = SymbolIndex()
+    index.add_matches(payload("search_results")["bestMatches"])
+    assert _symbols(index.search("aapl"))[0] == "AAPL"
+    assert "AAPL34.SAO" in _symbols(index.search("AAP"))
+    assert "AAPL" in _symbols(index.search("apple in"))
+    assert index.search("unknown") == []
+
+
+def test_index_is_persisted(tmp_path, payload):
+    path = str(tmp_path / "symbols.json")
+    index = SymbolIndex(path)
+    added = index.add_matches(payload("search_results")["bestMatches"])
+    assert added == len(SymbolIndex(path)) > 0
+
+
+def test_search_answers_from_the_index_and_memoizes_misses(index, payload):
+    client = CountingClient(payload("search_results")["bestMatches"])
+    assert "AAPL" in set(models.search(client, "apple")[SYMBOL_KEY])
+    assert "AAPL" in set(models.search(client, "aapl")[SYMBOL_KEY])
+    assert client.calls == ["apple"]
+
+    client.matches = []
+    assert models.search(client, "zzzz").empty
+    assert models.search(client, "zzzz").empty
+    assert client.calls == ["apple", "zzzz"]